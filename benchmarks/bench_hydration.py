@@ -0,0 +1,144 @@
+"""
+    Micro-benchmarks of the per-instance cost of creating, hydrating and using Model instances
+
+    Run from the repository root:
+        python -m benchmarks.bench_hydration
+        python -m benchmarks.bench_hydration --records 100000 --relationships 8
+
+    Times, per instance, creating an empty instance (`Model()`), hydrating one from an API payload
+    (`Model.from_json`) and the previous hydration path, which built an empty instance
+    and then replaced its representation. Reading and writing an attribute is timed per instance
+    over the hydrated records.
+"""
+import argparse
+import time
+import warnings
+from typing import Callable, List
+from magellan_models.config import MagellanConfig
+from magellan_models.model_generator.generate_from_spec import generate_from_spec
+
+
+def make_model(relationship_count: int):
+    """Generates a Model with a few attributes and relationship_count "many" relationships"""
+    relationships = {
+        f"owner_{number}s": {"type": "array"} for number in range(relationship_count)
+    }
+    schema = {
+        "type": "object",
+        "properties": {
+            "data": {
+                "type": "object",
+                "properties": {
+                    "attributes": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "title": {"type": "string"},
+                            "count": {"type": "integer"},
+                        },
+                    },
+                    "relationships": {"type": "object", "properties": relationships},
+                },
+            }
+        },
+    }
+    response = {"200": {"content": {"application/json": {"schema": schema}}}}
+    request_body = {"content": {"application/json": {"schema": schema}}}
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "benchmark", "version": "1.0.0"},
+        "paths": {
+            "/records": {
+                "get": {"responses": response},
+                "post": {"requestBody": request_body, "responses": response},
+            },
+            "/records/{id_}": {
+                "get": {"responses": response},
+                "patch": {"requestBody": request_body, "responses": response},
+                "delete": {"responses": {"204": {"description": "deleted"}}},
+            },
+        },
+    }
+    config = MagellanConfig()
+    config.print_on_init = False
+    config.cache_compiled_specs = False
+    models, _, _ = generate_from_spec(spec, config)
+    return models["Record"]
+
+
+def make_payloads(record_count: int, relationship_count: int) -> List[dict]:
+    """Creates record_count API payloads for the benchmark Model"""
+    return [
+        {
+            "data": {
+                "id": str(number),
+                "type": "record",
+                "attributes": {"id": str(number), "title": f"record {number}", "count": number},
+                "relationships": {
+                    f"owner_{relationship}s": {"data": [{"id": "1", "type": "owner"}]}
+                    for relationship in range(relationship_count)
+                },
+            }
+        }
+        for number in range(record_count)
+    ]
+
+
+def time_per_call(function: Callable, arguments: list, repeat: int) -> float:
+    """Returns the best time in nanoseconds per call of function over arguments"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for argument in arguments:
+            function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best / len(arguments) * 1e9
+
+
+def main(argv: List[str] = None) -> dict:
+    """Runs the benchmarks and prints the nanoseconds per instance of each
+
+    Args:
+        argv (List[str], optional): command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        dict: benchmark name => nanoseconds per instance
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--relationships", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    Model = make_model(args.relationships)  # pylint: disable=invalid-name
+    payloads = make_payloads(args.records, args.relationships)
+    convert = Model.configuration().api_response_to_representation
+
+    def previous_from_json(payload):
+        instance = Model()
+        instance.representation = convert(payload)
+        return instance
+
+    results = {
+        "Model()": time_per_call(lambda _: Model(), payloads, args.repeat),
+        "Model.from_json": time_per_call(Model.from_json, payloads, args.repeat),
+        "Model() + representation": time_per_call(previous_from_json, payloads, args.repeat),
+    }
+    instances = [Model.from_json(payload) for payload in payloads]
+
+    def write_title(instance):
+        instance.title = "renamed"
+
+    results["read attribute"] = time_per_call(
+        lambda instance: instance.title, instances, args.repeat
+    )
+    results["write attribute"] = time_per_call(write_title, instances, args.repeat)
+    print(f"{args.records} records, {args.relationships} relationships")
+    for name, nanoseconds in results.items():
+        print(f"{name:<28} {nanoseconds:>10.0f} ns/instance")
+    return results
+
+
+if __name__ == "__main__":
+    main()
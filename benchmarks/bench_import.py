@@ -0,0 +1,80 @@
+"""
+    Benchmark of `import magellan_models` time, guarding the import-time budget
+
+    Run from the repository root:
+        python -m benchmarks.bench_import
+        python -m benchmarks.bench_import --budget 0.15 --repeat 7
+
+    Each import is timed in a fresh interpreter. The run fails if the median import is over
+    --budget seconds, or if any of the heavy dependencies that are only needed on some code paths
+    (requests, jsonschema, yaml) was imported by `import magellan_models`.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List
+from magellan_models.deferred_import import DEFERRED_MODULES
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import magellan_models
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "loaded": [name for name in {DEFERRED_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def time_import() -> dict:
+    """Imports magellan_models in a fresh interpreter
+
+    Returns:
+        dict: the import "seconds" and the deferred modules that were "loaded" anyway
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: List[str] = None) -> dict:
+    """Runs the benchmark and prints the results
+
+    Args:
+        argv (List[str], optional): command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        dict: the median "seconds" and the deferred modules "loaded" at import
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="exit with an error if the median import takes longer than this many seconds",
+    )
+    args = parser.parse_args(argv)
+
+    runs = [time_import() for _ in range(args.repeat)]
+    median = statistics.median(run["seconds"] for run in runs)
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    print(f"import magellan_models: {median * 1000:.1f} ms (median of {args.repeat})")
+    print(f"deferred modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    if loaded:
+        sys.exit(f"{', '.join(loaded)} should not be imported by `import magellan_models`")
+    if args.budget is not None and median > args.budget:
+        sys.exit(f"import took {median:.3f}s, over the {args.budget:.3f}s budget")
+    return {"seconds": median, "loaded": loaded}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+    Benchmark of specification parsing and Model generation time against the number of paths
+
+    Run from the repository root:
+        python -m benchmarks.bench_parser
+        python -m benchmarks.bench_parser --sizes 1000 5000 10000 --check-linear
+
+    Every resource in the synthetic specification has a collection route, a single entity route
+    and a downstream route, so a spec with N paths has N / 3 resources
+    (plus a healthcheck route). Parsing is timed with the compiled spec cache disabled.
+"""
+import argparse
+import sys
+import time
+import warnings
+from typing import List
+from magellan_models.config import MagellanConfig
+from magellan_models.model_generator.generate_from_spec import generate_from_spec
+
+
+def make_spec(path_count: int) -> dict:
+    """Creates a synthetic specification with about path_count paths"""
+    paths = {
+        "/healthcheck": {"get": {"responses": {"200": {"description": "ok"}}}},
+    }
+    schemas = {}
+    for resource_number in range(path_count // 3):
+        resource = f"resource_{resource_number:06d}s"
+        schema_name = f"Resource{resource_number:06d}"
+        schemas[schema_name] = {
+            "type": "object",
+            "properties": {
+                "data": {
+                    "type": "object",
+                    "properties": {
+                        "attributes": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string"},
+                                "title": {"type": "string"},
+                                "count": {"type": "integer"},
+                            },
+                        },
+                        "relationships": {
+                            "type": "object",
+                            "properties": {"owners": {"type": "array"}},
+                        },
+                    },
+                }
+            },
+        }
+        response = {
+            "200": {
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": f"#/components/schemas/{schema_name}"}
+                    }
+                }
+            }
+        }
+        request_body = {
+            "content": {
+                "application/json": {"schema": {"$ref": f"#/components/schemas/{schema_name}"}}
+            }
+        }
+        paths[f"/{resource}"] = {
+            "get": {"responses": response},
+            "post": {"requestBody": request_body, "responses": response},
+        }
+        paths[f"/{resource}/{{id_}}"] = {
+            "get": {"responses": response},
+            "patch": {"requestBody": request_body, "responses": response},
+            "delete": {"responses": {"204": {"description": "deleted"}}},
+        }
+        paths[f"/{resource}/{{id_}}/owners"] = {"get": {"responses": response}}
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "benchmark", "version": "1.0.0"},
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+
+def time_generation(path_count: int, repeat: int = 3) -> float:
+    """Returns the best time in seconds to generate every Model of a path_count spec"""
+    spec = make_spec(path_count)
+    config = MagellanConfig()
+    config.print_on_init = False
+    config.cache_compiled_specs = False
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generate_from_spec(spec, config)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: List[str] = None) -> List[dict]:
+    """Runs the benchmark and prints a table of results
+
+    Args:
+        argv (List[str], optional): command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        List[dict]: paths, seconds and microseconds per path for each size
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 2500, 5000, 10000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--check-linear",
+        action="store_true",
+        help="exit with an error if the time per path of the largest size is over "
+        "twice the time per path of the smallest",
+    )
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    results = []
+    print(f"{'paths':>8} {'seconds':>10} {'us/path':>10}")
+    for size in args.sizes:
+        seconds = time_generation(size, args.repeat)
+        paths = len(make_spec(size)["paths"])
+        results.append(
+            {"paths": paths, "seconds": seconds, "us_per_path": seconds / paths * 1e6}
+        )
+        print(f"{paths:>8} {seconds:>10.3f} {results[-1]['us_per_path']:>10.1f}")
+
+    growth = results[-1]["us_per_path"] / results[0]["us_per_path"]
+    print(f"time per path grew {growth:.2f}x from the smallest to the largest spec")
+    if args.check_linear and growth > 2:
+        sys.exit("generation time is growing faster than linearly")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+    Command line entry point for generating static Model modules ahead of time
+
+    Example:
+        python -m magellan_models.codegen openapi.yaml -o models/
+
+    The generated package can then be imported without parsing the specification:
+        from models import initialize
+        models, funcs, config = initialize(my_config)
+"""
+import argparse
+import importlib
+import keyword
+import os
+import pprint
+from copy import copy
+from typing import List, Tuple
+import inflection
+from magellan_models.config import MagellanConfig
+from magellan_models.initializers.spec_fetcher import fetch_spec
+from magellan_models.initializers.spec_loader import load_spec_content, load_spec_file
+from magellan_models.interface.static_api_model import StaticApiModel
+from magellan_models.model_generator.generate_from_spec import compile_spec
+from magellan_models.model_generator.generate_dynamic_model import generate_model
+from magellan_models.model_generator.spec_cache import get_spec_cache_key
+
+GENERATED_HEADER = (
+    "# Generated by magellan_models.codegen from {spec_name}, do not edit.\n"
+    "# Regenerate with: python -m magellan_models.codegen {spec_name} -o <output directory>\n"
+)
+
+
+def load_spec(spec: str, config: MagellanConfig = None) -> dict:
+    """Loads an OpenAPI JSON or YAML specification from a local path or URL
+
+    Args:
+        spec (str): a local path or URL
+        config (MagellanConfig, optional): configuration with the fetch settings for URLs.
+            Defaults to None.
+
+    Raises:
+        MagellanParserException: Raises if the specification can't be retrieved
+
+    Returns:
+        dict: the specification
+    """
+    if spec.startswith(("http://", "https://")):
+        return load_spec_content(fetch_spec(spec, config or MagellanConfig()))
+    return load_spec_file(spec)
+
+
+def load_config(config_path: str = None) -> MagellanConfig:
+    """Loads a MagellanConfig from a "module:attribute" path
+
+    Args:
+        config_path (str, optional): a MagellanConfig instance, subclass, or factory function
+            as "package.module:attribute". Defaults to None for a default MagellanConfig.
+
+    Returns:
+        MagellanConfig: the configuration to parse the specification with
+    """
+    if not config_path:
+        return MagellanConfig()
+    module_name, _, attribute = config_path.partition(":")
+    config = getattr(importlib.import_module(module_name), attribute)
+    return config if isinstance(config, MagellanConfig) else config()
+
+
+def format_literal(value, indent: int = 4) -> str:
+    """Formats a JSON-like value as a Python literal, one item per line if it doesn't fit on one
+
+    Args:
+        value (any): a dict, list or scalar
+        indent (int, optional): the indentation of the line the literal starts on. Defaults to 4.
+
+    Returns:
+        str: the literal's source
+    """
+    flat = repr(value)
+    if len(flat) + indent <= 88 or not isinstance(value, (dict, list)) or not value:
+        return flat
+    inner = " " * (indent + 4)
+    if isinstance(value, dict):
+        items = [
+            f"{inner}{key!r}: {format_literal(element, indent + 4)},\n"
+            for key, element in value.items()
+        ]
+        return "{\n" + "".join(items) + " " * indent + "}"
+    items = [f"{inner}{format_literal(element, indent + 4)},\n" for element in value]
+    return "[\n" + "".join(items) + " " * indent + "]"
+
+
+def format_attribute_types(attributes: dict) -> str:
+    """Formats an attribute name => type mapping, writing types by name"""
+    if not attributes:
+        return "{}"
+    lines = ["{"]
+    for name, attribute_type in attributes.items():
+        type_source = getattr(attribute_type, "__name__", None) or repr(attribute_type)
+        lines.append(f"        {name!r}: {type_source},")
+    lines.append("    }")
+    return "\n".join(lines)
+
+
+def can_be_defined(name: str, reserved: set) -> bool:
+    """Checks if a property or method can be written out under its own name"""
+    return name.isidentifier() and not keyword.iskeyword(name) and name not in reserved
+
+
+class ModelSourceWriter:
+    """Writes the members of one generated Model class"""
+
+    def __init__(self, class_name: str):
+        self.class_name = class_name
+        self.members = []
+        self.renamed = []
+
+    def add_method(  # pylint: disable=too-many-arguments
+        self, name: str, signature: str, body: str, decorator: str = None, returns: str = None
+    ):
+        """Adds a method, renaming it after the class definition if name isn't an identifier"""
+        python_name = name
+        if not name.isidentifier() or keyword.iskeyword(name):
+            python_name = f"_generated_{len(self.renamed)}"
+            self.renamed.append((python_name, name))
+        lines = []
+        if decorator:
+            lines.append(f"    @{decorator}")
+        annotation = f" -> {returns}" if returns else ""
+        lines.append(f"    def {python_name}({signature}){annotation}:")
+        lines.append(f"        {body}")
+        self.members.append("\n".join(lines))
+
+    def finish(self) -> str:
+        """Returns the source following the class body"""
+        return "".join(
+            f"\nsetattr({self.class_name}, {name!r}, {self.class_name}.__dict__[{python_name!r}])"
+            f"\ndelattr({self.class_name}, {python_name!r})\n"
+            for python_name, name in self.renamed
+        )
+
+
+def generate_model_source(  # pylint: disable=too-many-locals
+    representation: dict, all_model_names: List[str], configuration: MagellanConfig
+) -> str:
+    """Writes the module source of a single Model
+
+    Args:
+        representation (dict): the model representation from get_model_representation
+        all_model_names (List[str]): the class names of every Model in the spec
+        configuration (MagellanConfig): the configuration the spec was parsed with
+
+    Returns:
+        str: the module source
+    """
+    # a runtime Model tells us exactly which functions generate_model would have created
+    name_config = copy(configuration)
+    name_config.disabled_functions = []
+    DynamicModel = generate_model(  # pylint: disable=invalid-name
+        representation, all_model_names, {}, name_config
+    )
+    method_names = DynamicModel.list_methods()
+
+    class_name = representation["class_name"]
+    attributes = representation.get("attributes", {})
+    relationships = representation.get("relationships", {})
+    writer = ModelSourceWriter(class_name)
+
+    generated_names = set(method_names)
+    reserved = set(dir(StaticApiModel)) | generated_names | {"id"}
+    for attribute, attribute_type in attributes.items():
+        if not can_be_defined(attribute, reserved):
+            continue
+        writer.add_method(
+            attribute,
+            "self",
+            f"return self._get_loaded_attribute({attribute!r})",
+            decorator="property",
+            returns=getattr(attribute_type, "__name__", None),
+        )
+
+    for attribute in attributes:
+        writer.add_method(
+            f"find_by_{attribute}",
+            'cls, value, operation="eq", **kwargs',
+            f"return cls._find_by_attribute({attribute!r}, value, operation, **kwargs)",
+            decorator="classmethod",
+        )
+
+    for relationship, relationship_type in relationships.items():
+        writer.add_method(
+            f"{relationship}_json",
+            "self",
+            f'return self.get_instance_relationship_value({relationship!r}).get("data")',
+        )
+        if relationship_type == "many":
+            singular = inflection.singularize(relationship)
+            writer.add_method(
+                f"add_{singular}",
+                "self, added_elem_id, additional_args={}",
+                f"self._add_relationship_id({relationship!r}, {singular!r}, "
+                "added_elem_id, additional_args)",
+            )
+            writer.add_method(
+                f"remove_{singular}",
+                "self, removed_elem_id",
+                f"self._remove_relationship_id({relationship!r}, {singular!r}, removed_elem_id)",
+            )
+            if inflection.camelize(singular) in all_model_names:
+                writer.add_method(
+                    relationship,
+                    "self, refresh=False, **kwargs",
+                    f"return self._get_many_relationship({relationship!r}, refresh, **kwargs)",
+                )
+        else:
+            writer.add_method(
+                f"set_{relationship}_id",
+                "self, new_id, additional_args={}",
+                f"self._set_relationship_id({relationship!r}, new_id, additional_args)",
+            )
+            writer.add_method(
+                f"set_{relationship}",
+                "self, new_entity, meta={}",
+                f"self._set_relationship({relationship!r}, new_entity, meta)",
+            )
+            if inflection.camelize(relationship) in all_model_names:
+                writer.add_method(
+                    relationship,
+                    "self, refresh=False",
+                    f"return self._get_one_relationship({relationship!r}, refresh)",
+                )
+
+    for func_name in DynamicModel.list_downstream_functions():
+        writer.add_method(
+            func_name,
+            "self, **kwargs",
+            f"return self._call_downstream_function({func_name!r}, **kwargs)",
+        )
+
+    class_attributes = [
+        "__slots__ = ()",
+        f"__resource_name__ = {representation['resource_name']!r}",
+        f"__attribute_types__ = {format_attribute_types(attributes)}",
+        f"__relationships__ = {format_literal(relationships)}",
+        f"__post_schema__ = {format_literal(representation.get('post_req_schema', {}))}",
+        f"__patch_schema__ = {format_literal(representation.get('patch_req_schema', {}))}",
+        f"__downstream_routes__ = {format_literal(representation.get('downstream_routes', []))}",
+        f"__method_names__ = {format_literal(method_names)}",
+        "__relationship_function_names__ = "
+        + format_literal(DynamicModel.list_relationship_functions()),
+        "__downstream_function_names__ = "
+        + format_literal(DynamicModel.list_downstream_functions()),
+    ]
+    return (
+        "from magellan_models.interface.static_api_model import StaticApiModel\n\n\n"
+        f"class {class_name}(StaticApiModel):\n"
+        f'    """Magellan Model for /{representation["resource_name"]}"""\n\n'
+        + "".join(f"    {line}\n" for line in class_attributes)
+        + "".join(f"\n{member}\n" for member in writer.members)
+        + writer.finish()
+    )
+
+
+def generate_package_sources(
+    spec: dict, configuration: MagellanConfig, spec_name: str = "spec"
+) -> List[Tuple[str, str]]:
+    """Writes the source of every module in a generated package
+
+    Args:
+        spec (dict): the OpenAPI specification
+        configuration (MagellanConfig): the configuration to parse the spec with
+        spec_name (str, optional): name of the specification, for the file headers.
+            Defaults to "spec".
+
+    Returns:
+        List[Tuple[str, str]]: (file name, source) pairs
+    """
+    model_representations, other_routes = compile_spec(spec, configuration)
+    class_names = [repres["class_name"] for repres in model_representations]
+    header = GENERATED_HEADER.format(spec_name=spec_name)
+
+    files = []
+    imports = []
+    for repres in model_representations:
+        module_name = inflection.underscore(repres["class_name"])
+        files.append(
+            (
+                f"{module_name}.py",
+                header
+                + '"""Generated Magellan Model"""\n'
+                + generate_model_source(repres, class_names, configuration),
+            )
+        )
+        imports.append(f"from .{module_name} import {repres['class_name']}\n")
+
+    init_source = (
+        header
+        + f'"""Magellan Models generated from {spec_name}"""\n'
+        + "from magellan_models.config import MagellanConfig\n"
+        + "from magellan_models.initializers import initialize_with_generated_models\n"
+        + "".join(imports)
+        + "\n"
+        + f"SPEC_HASH = {get_spec_cache_key(spec, configuration)!r}\n\n"
+        + f"MODEL_CLASSES = [{', '.join(class_names)}]\n\n"
+        + f"NON_MODEL_ROUTES = {format_literal(other_routes, indent=0)}\n\n\n"
+        + "def initialize(model_config: MagellanConfig = None):\n"
+        + '    """Binds the generated Models to a configuration, returns (models, funcs, config)"""\n'
+        + "    return initialize_with_generated_models(\n"
+        + "        MODEL_CLASSES, NON_MODEL_ROUTES, model_config\n"
+        + "    )\n"
+    )
+    files.append(("__init__.py", init_source))
+    return files
+
+
+def write_package(
+    spec: dict, output_dir: str, configuration: MagellanConfig, spec_name: str = "spec"
+) -> List[str]:
+    """Generates a Model package for a specification and writes it to output_dir
+
+    Args:
+        spec (dict): the OpenAPI specification
+        output_dir (str): the package directory, created if it doesn't exist
+        configuration (MagellanConfig): the configuration to parse the spec with
+        spec_name (str, optional): name of the specification, for the file headers.
+            Defaults to "spec".
+
+    Returns:
+        List[str]: the paths written
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for file_name, source in generate_package_sources(spec, configuration, spec_name):
+        path = os.path.join(output_dir, file_name)
+        with open(path, "w") as source_file:
+            source_file.write(source)
+        paths.append(path)
+    return paths
+
+
+def main(argv: List[str] = None) -> List[str]:
+    """Runs the codegen command
+
+    Args:
+        argv (List[str], optional): command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        List[str]: the paths written
+    """
+    parser = argparse.ArgumentParser(
+        description="Generate static Magellan Model modules from an OpenAPI specification"
+    )
+    parser.add_argument("spec", help="path or URL to an OpenAPI JSON or YAML file")
+    parser.add_argument(
+        "-o", "--output", required=True, help="directory of the generated package"
+    )
+    parser.add_argument("--id-separator", help="the configuration's id_separator")
+    parser.add_argument(
+        "--config",
+        help='a MagellanConfig instance, subclass or factory to parse with, as "module:attribute"',
+    )
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    config.print_on_init = False
+    if args.id_separator:
+        config.id_separator = args.id_separator
+
+    paths = write_package(
+        load_spec(args.spec, config), args.output, config, os.path.basename(args.spec)
+    )
+    print(f"Generated {len(paths) - 1} Models in {args.output}")
+    return paths
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,10 @@
 # pylint: disable=no-self-use
 
 import json
-from typing import Union, Tuple
+import threading
+from urllib.parse import urlencode
+from typing import Any, Union, Tuple, Iterable
+import inflection
 
 
 class MagellanConfig:  # pylint: disable=too-many-instance-attributes
@@ -28,7 +31,8 @@ class MagellanConfig:  # pylint: disable=too-many-instance-attributes
         self.function_naming_style = "pretty"  # "raw" or "pretty"
 
         self.params_args = [
-            "sort"
+            "sort",
+            "include",
         ]  # a list of whitelisted kwargs to send to the create_params functions
 
         # "warning" or "exception", if neither than no validation (set to "none" or something)
@@ -63,6 +67,84 @@ class MagellanConfig:  # pylint: disable=too-many-instance-attributes
 
         self.disabled_functions = []
 
+        # What happens when an attribute left out of a sparse fieldset (`only` / `fields=`) is read
+        # "load" fetches the full record once and fills in the missing values, "exception" raises
+        self.unloaded_attribute_behavior = "load"
+
+        # Parsed specs (model representations and non-model routes) are cached in memory, keyed by
+        # a hash of the spec and the parsing fields above, so the same spec is only parsed once
+        self.cache_compiled_specs = True
+        # If set, compiled specs are also cached to files in this directory to speed up cold starts
+        self.spec_cache_dir = None
+
+        # When True, generation returns lazy mappings: each Model (and function) is only parsed
+        # and generated the first time its key is accessed
+        self.lazy_generation = False
+        # Resource names ("factions") or class names ("Faction") to generate Models for, None for all
+        self.allowed_resources = None
+        # Resource names or class names to never generate Models for
+        self.denied_resources = []
+
+        # Seconds to wait for the specification when initializing from a URL
+        self.spec_fetch_timeout = 30
+        # If set, specifications fetched from a URL are kept in this directory with their ETag,
+        # revalidated with If-None-Match and used as a fallback when the URL can't be reached
+        self.spec_download_dir = None
+        # Seconds a downloaded specification is used as is before it's revalidated
+        self.spec_download_max_age = 0
+
+        # Set by the initializers: seconds spent in each step ("fetch", "load", "generate")
+        # and the "parser" that loaded the specification ("json", "CSafeLoader" or "SafeLoader")
+        self.initialization_timings = {}
+
+        # Set by generation: the Model and function mappings that were returned,
+        # and each generated Model's parsed representation, used by reload_spec
+        self.generated_models = None
+        self.generated_functions = None
+        self.generated_representations = {}
+        # Held while reload_spec swaps new Models and functions into the generated mappings,
+        # hold it to iterate them without seeing a half applied reload
+        self.reload_lock = threading.RLock()
+
+        # The keys of a response's "meta" object that may hold the total number of results
+        # used by MagellanResponse.count(), see get_total_count_from_meta
+        self.total_count_meta_keys = ["total", "total_count", "count"]
+        # When True count() and exists() only request ids (a sparse fieldset)
+        # to keep their requests small
+        self.probe_with_sparse_fields = True
+
+        # How MagellanResponse reaches the next page:
+        # "links" follows get_next_link_from_resp, "cursor" sends the cursor get_cursor_from_resp
+        # returns with create_cursor_params, "keyset" filters on the last record's sort key
+        self.pagination_mode = "links"
+        # The unique attribute keyset pagination sorts by when the query doesn't sort,
+        # and adds after the query's sort keys so records sharing their values keep an order
+        self.keyset_sort_key = "id"
+
+        # When True MagellanResponse picks page sizes from the time and size of previous pages
+        # ("cursor" and "keyset" pagination only, "links" follows the server's next links as is)
+        self.adaptive_page_size = False
+        # The (minimum, maximum) page sizes adaptive page sizing requests
+        self.page_size_bounds = (10, 1000)
+        # The time adaptive page sizing aims for each page to take
+        self.target_page_seconds = 1.0
+        # The largest body adaptive page sizing lets a page have, None for no limit
+        self.max_page_bytes = 8 * 1024 * 1024
+        # Set by adaptive page sizing: route => the page size maximum found on the server
+        self.page_size_ceilings = {}
+
+        # When set, indexing a MagellanResponse past its loaded entities requests the page
+        # holding the index directly (pages of this size, see create_offset_params)
+        self.random_access_page_size = None
+
+        # The longest URL (with its encoded params) a request is sent with: a query whose
+        # "in" filter would exceed it is split into requests over chunks of the filter's values,
+        # every chunk is loaded (up to the limit) before the first result is returned,
+        # None never splits
+        self.max_url_bytes = 4096
+        # The number of chunks of a split "in" filter requested at the same time
+        self.in_filter_workers = 4
+
     def create_header(self, **kwargs) -> Tuple[dict, dict]:
         """
 
@@ -122,13 +204,48 @@ class MagellanConfig:  # pylint: disable=too-many-instance-attributes
             if caught_arg in kwargs:
                 param_args[caught_arg] = kwargs.pop(caught_arg)
 
+        fields = kwargs.pop("fields", None)
         params = self.create_filters(**kwargs)
+        if fields:
+            for resource_type, field_names in fields.items():
+                params.update(self.create_sparse_fields(resource_type, field_names))
         if limit:
             params["page[size]"] = limit
-        if kwargs.get("sort"):
-            params["sort"] = kwargs.get("sort")
+        for name, value in param_args.items():
+            if value:
+                # JSON:API takes lists of sort keys / include paths comma separated
+                is_list = isinstance(value, (list, tuple))
+                params[name] = ",".join(value) if is_list else value
         return params
 
+    def create_sparse_fields(self, resource_type: str, field_names: Iterable[str]) -> dict:
+        """Creates the params restricting which fields the API returns for a given resource type
+        By default this follows JSON:API sparse fieldsets: `fields[type]=a,b,c`
+
+        https://jsonapi.org/format/#fetching-sparse-fieldsets
+
+        Args:
+            resource_type (str): the type of the resource the fields belong to
+            field_names (Iterable[str]): the attribute (or relationship) names to request
+
+        Returns:
+            dict: params to merge into a GET request's params
+        """
+        return {f"fields[{resource_type}]": ",".join(field_names)}
+
+    def resource_name_to_type(self, resource_name: str) -> str:
+        """Converts a resource name (the route segment) into the type name the API uses for it
+        This is the key used for sparse fieldsets, by default the singularized resource name
+        (matching the types generated by `relationship_id_to_json_entry`)
+
+        Args:
+            resource_name (str): a Model's resource name, ex: "factions"
+
+        Returns:
+            str: the resource type, ex: "faction"
+        """
+        return inflection.singularize(resource_name)
+
     def api_response_to_representation(self, payload: dict) -> dict:
         """Converts the api response into a representation that's easily accessible
 
@@ -204,6 +321,119 @@ class MagellanConfig:  # pylint: disable=too-many-instance-attributes
         """
         return request_resp.json().get("links", {}).get("next", None)
 
+    def get_cursor_from_resp(self, request_resp) -> Union[str, None]:
+        """Helper function for cursor pagination (`pagination_mode = "cursor"`),
+        returns the cursor to request the page after request_resp with
+
+        By default this follows JSON:API's cursor pagination profile: the cursor of the page's
+        last record (`meta.page.cursor`), unless `links.next` says there's no next page
+
+        https://jsonapi.org/profiles/ethanresnick/cursor-pagination/
+
+        Args:
+            request_resp (requests.Response): A response object from a prior request
+
+        Returns:
+            Union[str, None]: the cursor, or None if there isn't a next page
+        """
+        body = request_resp.json()
+        links = body.get("links") or {}
+        if "next" in links and not links["next"]:
+            return None
+        records = self.get_list_from_resp(body)
+        if not records:
+            return None
+        return records[-1].get("meta", {}).get("page", {}).get("cursor")
+
+    def create_cursor_params(self, cursor: str) -> dict:
+        """Creates the params requesting the page after a cursor, added to the first page's params
+
+        Args:
+            cursor (str): a cursor returned by get_cursor_from_resp
+
+        Returns:
+            dict: the params, by default `page[after]=cursor`
+        """
+        return {"page[after]": cursor}
+
+    def create_offset_params(self, offset: int, page_size: int) -> dict:
+        """Creates the params requesting the page of page_size entities starting at offset,
+        used for random access into a MagellanResponse (see `random_access_page_size`)
+
+        By default this uses flask-rest-jsonapi's page number pagination,
+        offset is always a multiple of page_size
+
+        Args:
+            offset (int): the index of the page's first entity
+            page_size (int): the number of entities per page
+
+        Returns:
+            dict: the params, added to the query's params
+        """
+        return {"page[number]": offset // page_size + 1, "page[size]": page_size}
+
+    def request_url_length(self, url: str, params: dict) -> int:
+        """Returns the length of the URL a GET request to url with params is sent to,
+        compared with `max_url_bytes` to split large "in" filters
+
+        Args:
+            url (str): the request's url
+            params (dict): the request's params
+
+        Returns:
+            int: the number of bytes of the encoded URL
+        """
+        if not params:
+            return len(url)
+        return len(url) + 1 + len(urlencode(params, doseq=True))
+
+    def get_keyset_cursor_from_resp(self, request_resp, sort_keys: list) -> Any:
+        """Helper function for keyset pagination (`pagination_mode = "keyset"`),
+        returns the sort key values of the last record of a page
+
+        Args:
+            request_resp (requests.Response): A response object from a prior request
+            sort_keys (list): the (attribute, descending) pairs the query is sorted by
+
+        Returns:
+            Any: the list of values (one per sort key), or None if the page is empty
+        """
+        records = self.get_list_from_resp(request_resp.json())
+        if not records:
+            return None
+        attributes = self.api_response_to_representation(records[-1])
+        for step in self.model_attributes_path:
+            attributes = attributes.get(step, {})
+        return [attributes.get(sort_key) for (sort_key, _) in sort_keys]
+
+    def create_keyset_params(self, params: dict, cursor: list, sort_keys: list) -> dict:
+        """Adds the filter requesting the records after a keyset cursor to a page's params,
+        alongside the query's own filters (which `create_filters` already added to params)
+
+        The records after the cursor are the ones whose first sort key is past the cursor's,
+        or equal to it with the second one past the cursor's, and so on
+
+        Args:
+            params (dict): the params of the page's request
+            cursor (list): the sort key values of the last record received
+            sort_keys (list): the (attribute, descending) pairs the query is sorted by
+
+        Returns:
+            dict: the params
+        """
+        after = []
+        for index, (sort_key, descending) in enumerate(sort_keys):
+            equal = [
+                {"name": name, "op": "eq", "val": value}
+                for ((name, _), value) in zip(sort_keys[:index], cursor)
+            ]
+            operation = "lt" if descending else "gt"
+            past = {"name": sort_key, "op": operation, "val": cursor[index]}
+            after.append({"and": equal + [past]})
+        filters = json.loads(params.get("filter", "[]"))
+        filters.append({"or": after})
+        return {**params, "filter": json.dumps(filters)}
+
     def get_meta_data_from_resp(self, request_resp) -> dict:
         """Helper function for MagellanResponse, returns the metadata for a response
 
@@ -215,3 +445,55 @@ class MagellanConfig:  # pylint: disable=too-many-instance-attributes
         """
         body = request_resp.json()
         return {"meta": body.get("meta", {}), "links": body.get("links", {})}
+
+    def get_total_count_from_meta(self, meta_data: dict) -> Union[int, None]:
+        """Helper function for MagellanResponse.count, returns the total number of results
+        a query has according to the server
+
+        Args:
+            meta_data (dict): the metadata of a response (see get_meta_data_from_resp)
+
+        Returns:
+            Union[int, None]: the total, or None if the server didn't send one
+        """
+        meta = meta_data.get("meta") or {}
+        for key in self.total_count_meta_keys:
+            if isinstance(meta.get(key), int):
+                return meta[key]
+        return None
+
+    def reload_spec(self, new_spec: dict) -> dict:
+        """Regenerates the Models (and functions) whose definition changed in new_spec,
+        updating the mappings this configuration was initialized with in place
+
+        Args:
+            new_spec (dict): the new OpenAPI specification
+
+        Returns:
+            dict: a report of the "added", "changed" and "removed" Models
+        """
+        # imported here as the model generator imports this module
+        from magellan_models.model_generator.spec_reload import (  # pylint: disable=import-outside-toplevel
+            reload_spec,
+        )
+
+        return reload_spec(new_spec, self)
+
+    def watch_spec(self, source, interval: float = 60.0, on_reload=None):
+        """Polls a specification source in a background thread, calling reload_spec when it changes
+
+        Args:
+            source (Union[str, Callable[[], dict]]): a URL, a file path
+                or a function returning the specification
+            interval (float, optional): seconds between checks. Defaults to 60.0.
+            on_reload (Callable[[dict], None], optional): called with each reload's report.
+                Defaults to None.
+
+        Returns:
+            SpecWatcher: the started watcher, call its stop() method to stop polling
+        """
+        from magellan_models.model_generator.spec_reload import (  # pylint: disable=import-outside-toplevel
+            SpecWatcher,
+        )
+
+        return SpecWatcher(self, source, interval=interval, on_reload=on_reload).start()
@@ -0,0 +1,62 @@
+"""
+    Module placeholders that only import the real module when one of its attributes is used,
+    keeping heavy dependencies (requests, jsonschema, yaml) off `import magellan_models`
+"""
+import importlib
+import sys
+from threading import RLock
+
+# module names that must stay unimported after `import magellan_models`, checked by the tests
+# and benchmarks/bench_import.py
+DEFERRED_MODULES = ("requests", "jsonschema", "yaml")
+
+
+class DeferredModule:
+    """Stands in for a module until one of its attributes is accessed
+
+    `requests = DeferredModule("requests")` then `requests.get(...)` imports requests
+    on that first call. Later accesses go straight to the imported module.
+    Its own methods are dunder methods so they can't shadow the module's attributes
+    (ex: `yaml.load`)
+    """
+
+    def __init__(self, name: str):
+        """Creates a placeholder, nothing is imported yet
+
+        Args:
+            name (str): the absolute module name
+        """
+        self.__name = name
+        self.__module = None
+        self.__lock = RLock()
+
+    def __is_loaded__(self) -> bool:
+        """Checks if the module has been imported, by this placeholder or anything else"""
+        return self.__module is not None or self.__name in sys.modules
+
+    def __load__(self):
+        """Imports and returns the module"""
+        if self.__module is None:
+            with self.__lock:
+                if self.__module is None:
+                    self.__module = importlib.import_module(self.__name)
+        return self.__module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self.__load__(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self.__is_loaded__() else "not loaded"
+        return f"<DeferredModule {self.__name} ({state})>"
+
+
+def deferred_import(name: str) -> DeferredModule:
+    """Returns a placeholder importing name on first attribute access
+
+    Args:
+        name (str): the absolute module name, ex: "jsonschema"
+
+    Returns:
+        DeferredModule: the placeholder
+    """
+    return DeferredModule(name)
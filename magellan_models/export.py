@@ -0,0 +1,143 @@
+"""
+    Command line entry point for streaming a query's results to a NDJSON or CSV file
+
+    Example:
+        python -m magellan_models.export openapi.yaml Faction factions.csv --format csv \
+            --api-endpoint https://myAPIurl/api/v1 --where creator_id=123 --columns id,title
+"""
+import argparse
+import sys
+from typing import List
+from magellan_models.config import MagellanConfig
+from magellan_models.initializers.spec_loader import load_spec_file
+from magellan_models.initializers import (
+    initialize_with_endpoint,
+    initialize_with_spec,
+    initialize_with_yaml_file,
+    initialize_with_yaml_url,
+)
+
+
+def load_models(spec: str, config: MagellanConfig) -> dict:
+    """Generates the models for a spec path or URL, picking the initializer from its format
+
+    Args:
+        spec (str): a local path or URL to an OpenAPI JSON or YAML file
+        config (MagellanConfig): the configuration to generate with
+
+    Returns:
+        dict: the generated models
+    """
+    is_yaml = spec.endswith((".yaml", ".yml"))
+    if spec.startswith(("http://", "https://")):
+        initializer = initialize_with_yaml_url if is_yaml else initialize_with_endpoint
+        return initializer(spec, config)[0]
+    if is_yaml:
+        return initialize_with_yaml_file(spec, config)[0]
+    return initialize_with_spec(load_spec_file(spec), config)[0]
+
+
+def parse_assignments(assignments: List[str]) -> dict:
+    """Converts a list of "key=value" strings into a dict
+
+    Args:
+        assignments (List[str]): "key=value" strings
+
+    Returns:
+        dict: key => value
+    """
+    parsed = {}
+    for assignment in assignments:
+        key, _, value = assignment.partition("=")
+        parsed[key] = value
+    return parsed
+
+
+def print_progress(stats: dict) -> None:
+    """Prints export progress to stderr
+
+    Args:
+        stats (dict): the export stats passed by MagellanResponse.export
+    """
+    print(
+        f"pages: {stats['pages']} rows: {stats['rows']} bytes: {stats['bytes']} "
+        f"rows/s: {stats['rows_per_second']:.1f}",
+        file=sys.stderr,
+    )
+
+
+def main(argv: List[str] = None) -> dict:
+    """Runs the export command
+
+    Args:
+        argv (List[str], optional): command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        dict: the export stats
+    """
+    parser = argparse.ArgumentParser(
+        description="Stream the results of a Magellan query to a NDJSON or CSV file"
+    )
+    parser.add_argument("spec", help="path or URL of the OpenAPI specification")
+    parser.add_argument("model", help="name of the model to export, ex: Faction")
+    parser.add_argument("output", help="path of the file to write")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument(
+        "--columns", help="comma separated attributes to export (default: all)"
+    )
+    parser.add_argument("--api-endpoint", help="overrides the config's api_endpoint")
+    parser.add_argument("--jwt", help="token used by the default create_header")
+    parser.add_argument("--id-separator", help="overrides the config's id_separator")
+    parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        metavar="ATTRIBUTE=VALUE",
+        help="filter passed to `where`, can be repeated",
+    )
+    parser.add_argument(
+        "--op",
+        action="append",
+        default=[],
+        metavar="ATTRIBUTE=OPERATION",
+        help="filtering operation for an attribute (default eq), can be repeated",
+    )
+    parser.add_argument("--limit", type=int, help="max number of entities to export")
+    parser.add_argument(
+        "--quiet", action="store_true", help="don't print progress to stderr"
+    )
+    args = parser.parse_args(argv)
+
+    config = MagellanConfig()
+    config.print_on_init = False
+    if args.api_endpoint:
+        config.api_endpoint = args.api_endpoint
+    if args.jwt:
+        config.jwt = args.jwt
+    if args.id_separator:
+        config.id_separator = args.id_separator
+
+    models = load_models(args.spec, config)
+    if args.model not in models:
+        parser.error(f"Unknown model `{args.model}`, choose from {', '.join(models)}")
+
+    where_kwargs = parse_assignments(args.where)
+    if args.op:
+        where_kwargs["filtering_arguments"] = parse_assignments(args.op)
+    response = models[args.model].where(limit=args.limit, **where_kwargs)
+    stats = response.export(
+        args.output,
+        format=args.format,
+        columns=args.columns.split(",") if args.columns else None,
+        progress_callback=None if args.quiet else print_progress,
+    )
+    if not args.quiet:
+        print(
+            f"Exported {stats['rows']} rows to {args.output} in {stats['seconds']:.2f}s",
+            file=sys.stderr,
+        )
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,4 @@
 from .initialize_with_json import initialize_with_spec
 from .initialize_with_endpoint import initialize_with_endpoint
 from .initialize_with_yaml import initialize_with_yaml_file, initialize_with_yaml_url
+from .initialize_with_generated import initialize_with_generated_models
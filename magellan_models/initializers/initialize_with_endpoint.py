@@ -2,10 +2,10 @@
     Module for initializing with a API spec url
 """
 from typing import Tuple
-import requests
 from magellan_models.config import MagellanConfig
 from magellan_models.model_generator.generate_from_spec import generate_from_spec
-from magellan_models.exceptions import MagellanParserException
+from .spec_fetcher import fetch_spec
+from .spec_loader import load_spec_content
 
 
 def initialize_with_endpoint(
@@ -23,10 +23,8 @@ def initialize_with_endpoint(
     if not model_config:
         model_config = MagellanConfig()
 
-    spec_resp = requests.get(api_spec_url)
-    if spec_resp.status_code != 200:
-        raise MagellanParserException(
-            f"Error retrieving the json schema. Error code: {spec_resp.status_code}"
-        )
-
-    return generate_from_spec(spec_resp.json(), configuration=model_config)
+    model_config.initialization_timings = {}
+    specification = load_spec_content(
+        fetch_spec(api_spec_url, model_config), model_config.initialization_timings
+    )
+    return generate_from_spec(specification, configuration=model_config)
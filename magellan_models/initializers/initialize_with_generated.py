@@ -0,0 +1,45 @@
+"""
+    Module for initializing the Models written out ahead of time by magellan_models.codegen
+"""
+from typing import List, Tuple
+from magellan_models.config import MagellanConfig
+from magellan_models.interface.static_api_model import StaticApiModel
+from magellan_models.model_generator.generate_nonrest_functions import (
+    generate_func_for_route,
+)
+from magellan_models.model_generator.generic_functions_generator import (
+    get_generic_function,
+)
+
+
+def initialize_with_generated_models(
+    model_classes: List[StaticApiModel],
+    other_routes: List[dict],
+    model_config: MagellanConfig = None,
+) -> Tuple[dict, dict, MagellanConfig]:
+    """Binds pre-generated Models to a configuration without parsing a specification.
+    Generated packages call this from their `initialize` function
+
+    Args:
+        model_classes (List[StaticApiModel]): the generated Model classes
+        other_routes (List[dict]): the routes that aren't part of a Model
+        model_config (MagellanConfig, optional): A MagellanConfig (or inheriting class) instance.
+            Defaults to None.
+
+    Returns:
+        tuple(dict, dict, MagellanConfig): the same (models, funcs, config) tuple as the other
+            initializers
+    """
+    if not model_config:
+        model_config = MagellanConfig()
+
+    models = {Model.__name__: Model for Model in model_classes}
+    for Model in model_classes:  # pylint: disable=invalid-name
+        Model.bind(model_config, models)
+
+    functional_routes = {}
+    for route in other_routes:
+        func_name, function = generate_func_for_route(route, model_config)
+        functional_routes[func_name] = function
+    functional_routes["_generic_api_function"] = get_generic_function(model_config)
+    return (models, functional_routes, model_config)
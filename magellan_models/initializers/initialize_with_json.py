@@ -15,4 +15,5 @@ def initialize_with_spec(open_api_spec: dict, model_config: MagellanConfig = Non
     """
     if not model_config:
         model_config = MagellanConfig()
+    model_config.initialization_timings = {}
     return generate_from_spec(open_api_spec, configuration=model_config)
@@ -1,11 +1,10 @@
 """
     Yaml based initialization module
 """
-import yaml
-import requests
 from magellan_models.config import MagellanConfig
 from magellan_models.model_generator.generate_from_spec import generate_from_spec
-from magellan_models.exceptions import MagellanParserException
+from .spec_fetcher import fetch_spec
+from .spec_loader import load_spec_content, load_spec_file
 
 
 def initialize_with_yaml_file(path: str, model_config: MagellanConfig = None):
@@ -21,9 +20,9 @@ def initialize_with_yaml_file(path: str, model_config: MagellanConfig = None):
     if not model_config:
         model_config = MagellanConfig()
 
-    with open(path) as yaml_file:
-        specification = yaml.load(yaml_file, Loader=yaml.FullLoader)
-        return generate_from_spec(specification, configuration=model_config)
+    model_config.initialization_timings = {}
+    specification = load_spec_file(path, model_config.initialization_timings)
+    return generate_from_spec(specification, configuration=model_config)
 
 
 def initialize_with_yaml_url(api_spec_url: str, model_config: MagellanConfig = None):
@@ -42,12 +41,8 @@ def initialize_with_yaml_url(api_spec_url: str, model_config: MagellanConfig = N
     if not model_config:
         model_config = MagellanConfig()
 
-    spec_resp = requests.get(api_spec_url)
-    if spec_resp.status_code != 200:
-        raise MagellanParserException(
-            f"Error retrieving the json schema .yaml. Error code: {spec_resp.status_code}"
-        )
-
-    return generate_from_spec(
-        yaml.load(spec_resp.content, Loader=yaml.FullLoader), configuration=model_config
+    model_config.initialization_timings = {}
+    specification = load_spec_content(
+        fetch_spec(api_spec_url, model_config), model_config.initialization_timings
     )
+    return generate_from_spec(specification, configuration=model_config)
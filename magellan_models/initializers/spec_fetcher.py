@@ -0,0 +1,162 @@
+"""
+    Module for downloading specifications, with an on disk copy revalidated by ETag
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from warnings import warn
+from magellan_models.deferred_import import deferred_import
+from magellan_models.config import MagellanConfig
+from magellan_models.exceptions import MagellanParserException, MagellanRuntimeWarning
+
+requests = deferred_import("requests")
+
+
+def get_download_paths(url: str, configuration: MagellanConfig) -> tuple:
+    """Returns the (body, metadata) file paths of a URL's cached copy"""
+    name = "magellan_download_" + hashlib.sha256(url.encode()).hexdigest()
+    base = os.path.join(configuration.spec_download_dir, name)
+    return f"{base}.body", f"{base}.json"
+
+
+def read_cached_spec(url: str, configuration: MagellanConfig) -> tuple:
+    """Reads the cached copy of a URL
+
+    Returns:
+        tuple(bytes, dict): the body and its metadata, or (None, {}) if there's no usable copy
+    """
+    if not configuration.spec_download_dir:
+        return None, {}
+    body_path, meta_path = get_download_paths(url, configuration)
+    try:
+        with open(meta_path) as meta_file:
+            metadata = json.load(meta_file)
+        with open(body_path, "rb") as body_file:
+            return body_file.read(), metadata
+    except (OSError, ValueError):
+        return None, {}
+
+
+def write_atomically(path: str, content: bytes) -> None:
+    """Writes a file through a temporary file, so readers never see a partial file"""
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def write_cached_spec(
+    url: str, body: bytes, metadata: dict, configuration: MagellanConfig
+) -> None:
+    """Stores a URL's body and metadata, warning instead of failing if the disk isn't writable"""
+    if not configuration.spec_download_dir:
+        return
+    body_path, meta_path = get_download_paths(url, configuration)
+    try:
+        os.makedirs(configuration.spec_download_dir, exist_ok=True)
+        if body is not None:
+            write_atomically(body_path, body)
+        write_atomically(meta_path, json.dumps(metadata).encode())
+    except OSError as err:
+        warn(
+            f"Unable to cache the specification downloaded from {url}: {err}",
+            MagellanRuntimeWarning,
+        )
+
+
+def fetch_spec(url: str, configuration: MagellanConfig) -> bytes:
+    """Downloads a specification
+
+    The request uses the configuration's spec_fetch_timeout and requests_args.
+    With a spec_download_dir the body is stored with its ETag / Last-Modified headers,
+    and the next fetch sends them as If-None-Match / If-Modified-Since
+    so an unchanged specification isn't downloaded again (a 304 response).
+    A copy younger than spec_download_max_age seconds is used without any request.
+    If the request fails or the server errors, the cached copy is used with a warning.
+
+    How the specification was retrieved ("network", "not_modified", "cached" or "stale")
+    is recorded in configuration.initialization_timings["fetch_result"]
+
+    Args:
+        url (str): the specification URL
+        configuration (MagellanConfig): the configuration instance
+
+    Raises:
+        MagellanParserException: Raises if the request fails and there's no cached copy
+
+    Returns:
+        bytes: the specification document
+    """
+    timings = configuration.initialization_timings
+    start = time.perf_counter()
+    cached_body, metadata = read_cached_spec(url, configuration)
+
+    if (
+        cached_body is not None
+        and time.time() - metadata.get("fetched_at", 0)
+        < configuration.spec_download_max_age
+    ):
+        timings["fetch"] = time.perf_counter() - start
+        timings["fetch_result"] = "cached"
+        return cached_body
+
+    headers = {}
+    if cached_body is not None:
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+    request_args = {"timeout": configuration.spec_fetch_timeout}
+    request_args.update(configuration.requests_args)
+
+    error = None
+    try:
+        spec_resp = requests.get(url, headers=headers, **request_args)
+    except requests.RequestException as request_err:
+        spec_resp = None
+        error = f"Error retrieving the specification from {url}: {request_err}"
+
+    result = "stale"
+    body = None
+    if spec_resp is not None and spec_resp.status_code == 304 and cached_body is not None:
+        result, body = "not_modified", cached_body
+        metadata["fetched_at"] = time.time()
+        write_cached_spec(url, None, metadata, configuration)
+    elif spec_resp is not None and spec_resp.status_code == 200:
+        result, body = "network", spec_resp.content
+        write_cached_spec(
+            url,
+            body,
+            {
+                "url": url,
+                "etag": spec_resp.headers.get("ETag"),
+                "last_modified": spec_resp.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            },
+            configuration,
+        )
+    elif spec_resp is not None:
+        error = (
+            f"Error retrieving the specification from {url}. "
+            f"Error code: {spec_resp.status_code}"
+        )
+
+    if body is None:
+        if cached_body is None:
+            raise MagellanParserException(error)
+        warn(
+            f"{error}. Using the copy cached at "
+            f"{time.ctime(metadata.get('fetched_at', 0))} instead",
+            MagellanRuntimeWarning,
+        )
+        body = cached_body
+
+    timings["fetch"] = time.perf_counter() - start
+    timings["fetch_result"] = result
+    return body
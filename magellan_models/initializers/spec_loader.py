@@ -0,0 +1,83 @@
+"""
+    Module for loading OpenAPI specifications from YAML or JSON as fast as the platform allows
+"""
+import json
+import time
+from typing import Tuple, Union
+from magellan_models.deferred_import import deferred_import
+
+yaml = deferred_import("yaml")
+
+# The yaml Loader class to use, None for libyaml's CSafeLoader when available
+# (an order of magnitude faster than the pure Python SafeLoader). yaml is only imported
+# the first time a YAML document is parsed
+YAML_LOADER = None
+
+
+def get_yaml_loader():
+    """Returns the yaml Loader class parse_spec uses"""
+    return YAML_LOADER or getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def parse_spec(content: Union[str, bytes]) -> Tuple[dict, str]:
+    """Parses a YAML or JSON specification document
+
+    JSON documents (anything starting with "{") go through the json module,
+    YAML documents through libyaml's CSafeLoader, falling back to the pure Python SafeLoader
+    if PyYAML was built without libyaml
+
+    Args:
+        content (Union[str, bytes]): the document
+
+    Returns:
+        Tuple[dict, str]: the specification and the name of the parser that loaded it
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+    if content.lstrip().startswith("{"):
+        try:
+            return json.loads(content), "json"
+        except ValueError:
+            # JSON-like YAML (flow style, comments etc), let yaml have a go
+            pass
+    loader = get_yaml_loader()
+    return yaml.load(content, Loader=loader), loader.__name__
+
+
+def load_spec_file(path: str, timings: dict = None) -> dict:
+    """Loads a YAML or JSON specification file
+
+    Args:
+        path (str): the file path
+        timings (dict, optional): if given, "load" (seconds) and "parser" are recorded in it.
+            Defaults to None.
+
+    Returns:
+        dict: the specification
+    """
+    start = time.perf_counter()
+    with open(path, "rb") as spec_file:
+        specification, parser = parse_spec(spec_file.read())
+    if timings is not None:
+        timings["load"] = time.perf_counter() - start
+        timings["parser"] = parser
+    return specification
+
+
+def load_spec_content(content: Union[str, bytes], timings: dict = None) -> dict:
+    """Loads a YAML or JSON specification that was already read, ex: a response body
+
+    Args:
+        content (Union[str, bytes]): the document
+        timings (dict, optional): if given, "load" (seconds) and "parser" are recorded in it.
+            Defaults to None.
+
+    Returns:
+        dict: the specification
+    """
+    start = time.perf_counter()
+    specification, parser = parse_spec(content)
+    if timings is not None:
+        timings["load"] = time.perf_counter() - start
+        timings["parser"] = parser
+    return specification
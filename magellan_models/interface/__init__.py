@@ -1,6 +1,10 @@
 """ User facing interface module init file """
 
 from .abstract_api_model import AbstractApiModel
+from .magellan_query import MagellanQuery
 from .magellan_response import MagellanResponse
 from .constant_magellan_response import ConstantMagellanResponse
 from .auto_dict import AutoDict
+from .magellan_mirror import MagellanMirror
+from .local_collection import LocalCollection
+from .static_api_model import StaticApiModel
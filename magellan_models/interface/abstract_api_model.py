@@ -3,16 +3,22 @@
 # Automagic attributes on requests cause pylint warnings so I'm disabling no-member
 # pylint: disable=dangerous-default-value, no-member
 from abc import ABC, abstractmethod
-from typing import Any, Union
+from typing import Any, Callable, Union
 from warnings import warn
-from jsonschema import validate, ValidationError
-import requests
+import inflection
+from magellan_models.deferred_import import deferred_import
 from magellan_models.exceptions import MagellanRuntimeException, MagellanRuntimeWarning
 from magellan_models.config import MagellanConfig
 from magellan_models.interface.magellan_response import MagellanResponse
 from magellan_models.interface.constant_magellan_response import (
     ConstantMagellanResponse,
 )
+from magellan_models.interface.magellan_mirror import MagellanMirror
+from magellan_models.interface.magellan_query import freeze
+from magellan_models.interface.local_collection import LocalCollection
+
+requests = deferred_import("requests")
+jsonschema = deferred_import("jsonschema")
 
 
 class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
@@ -22,6 +28,33 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
 
     """
 
+    # generated Models store their state in __slots__ (see interface.attribute_access)
+    __slots__ = ()
+
+    # set by use_local_collection, answers `where` calls in process when possible
+    __local_collection__ = None
+    # class name => Model for every Model generated from the spec, used by relationship helpers
+    __models__ = {}
+    # the sparse fieldset an instance was loaded with, None when every attribute was loaded
+    _loaded_attributes = None
+    # relationship name => {frozen helper kwargs: resolved value}, None until one is resolved
+    _relationship_cache = None
+    # (key in the representation, is a "many" relationship) for each relationship, set once
+    # per Model so creating an instance doesn't pluralize names or compare relationship types
+    __relationship_template__ = ()
+
+    def __init__(self):
+        """Creates an instance with an empty representation (and an empty entry per relationship)"""
+        self._representation = {
+            "attributes": {},
+            "relationships": {
+                relationship_name: {"data": [] if is_many else {}}
+                for relationship_name, is_many in self.__relationship_template__
+            },
+        }
+        self._loaded_attributes = None
+        self._relationship_cache = None
+
     @staticmethod
     @abstractmethod
     def resource_name() -> str:
@@ -94,7 +127,7 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
         raise MagellanRuntimeException("ID should only be set by the backend")
 
     @classmethod
-    def find(cls, id: str, **kwargs):
+    def find(cls, id: str, fields: list = None, **kwargs):
         """
         Class Method that facilitates GET queries between the API and the client
 
@@ -103,15 +136,32 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
         returns a class instance if the resource returns an object matching the ID,
         or None if the response 404s.
         Raises if any other status code beyond OK or 404 is hit
+
+        Passing a list of `fields` requests a sparse fieldset, only those attributes are loaded
         """
         (header, kwargs) = cls.configuration().create_header(**kwargs)
         api_endpoint = cls.configuration().api_endpoint
+        params = {}
+        if fields:
+            params = cls.configuration().create_sparse_fields(
+                cls.configuration().resource_name_to_type(cls.resource_name()), fields
+            )
         resp = cls.get_request(
-            f"{api_endpoint}/{cls.resource_name()}/{id}", headers=header
+            f"{api_endpoint}/{cls.resource_name()}/{id}", params=params, headers=header
         )
         # get_request throws an exception if the status code isn't OK,
         # so we can assume if we reach this bottom line that the response is fine
-        return cls.from_json(resp.json())
+        return cls.from_json(resp.json(), loaded_attributes=fields or None)
+
+    @classmethod
+    def only(cls, *attributes, **kwargs) -> MagellanResponse:
+        """Shorthand for `where(fields=[...])`, only the listed attributes are requested
+        from the API for each entity returned
+
+        Returns:
+            MagellanResponse: A MagellanResponse object
+        """
+        return cls.where(fields=list(attributes), **kwargs)
 
     @classmethod
     def query(cls, parameters={}, limit=None, **kwargs) -> ConstantMagellanResponse:
@@ -156,13 +206,52 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
                 additionally the "sort" kwarg can be set to define ordering
 
         Returns:
-            entities {MagellanResponse} -- A MagellanResponse object
+            entities {MagellanResponse} -- A lazy MagellanResponse object, the API is only called
+                once results are needed (a registered local collection answers the query
+                instead when it can, see use_local_collection)
         """
         route = f"{cls.configuration().api_endpoint}/{cls.resource_name()}"
         return MagellanResponse(
             url_path=route, Model=cls, config=cls.configuration(), limit=limit, **kwargs
         )
 
+    @classmethod
+    def use_local_collection(cls, collection: LocalCollection) -> None:
+        """Registers a fully loaded collection of this Model.
+        The MagellanResponses of `where` and `find_by_{attribute}` calls are then loaded from it
+        in process whenever their query can be evaluated locally, without any request
+
+        Pass None to go back to querying the API
+
+        Arguments:
+            collection {LocalCollection} -- the collection (see MagellanResponse.to_local_collection
+                and MagellanMirror.to_local_collection)
+        """
+        cls.__local_collection__ = collection
+
+    @classmethod
+    def mirror(
+        cls, path: str, watermark: str = None, refresh: bool = True, **kwargs
+    ) -> MagellanMirror:
+        """Mirrors this resource's collection into a local SQLite database
+        Reads from the returned mirror are served locally, call `refresh()` on it to pull changes
+
+        Arguments:
+            path {str} -- the sqlite database path
+            watermark {str} -- an attribute (ex: "updated_at") used to only fetch the records
+                changed since the last refresh. Without one, refreshes reload everything
+                (default: {None})
+            refresh {bool} -- refresh the mirror before returning it (default: {True})
+            **kwargs {any} -- filters (and header args) passed to `where` on each refresh
+
+        Returns:
+            MagellanMirror -- the mirror
+        """
+        local_mirror = MagellanMirror(path, cls, watermark=watermark, **kwargs)
+        if refresh:
+            local_mirror.refresh()
+        return local_mirror
+
     @classmethod
     def get_request(cls, url: str, params={}, headers={}):
         """Helper method for all GET requests to a resource
@@ -230,6 +319,8 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
                 {"route": resp.url, "error_code": resp.status_code, "body": resp.json()}
             )
         self.representation = self.__class__.from_json(resp.json()).representation
+        self._loaded_attributes = None
+        self.invalidate_relationships()
 
     @classmethod
     def validate_payload(cls, payload: dict, validation_schema: dict) -> None:
@@ -248,8 +339,8 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
             None: None
         """
         try:
-            validate(payload, validation_schema)
-        except ValidationError as validation_err:
+            jsonschema.validate(payload, validation_schema)
+        except jsonschema.ValidationError as validation_err:
             if cls.configuration().validation_output == "warning":
                 warn(validation_err.message, MagellanRuntimeWarning)
             elif cls.configuration().validation_output == "exception":
@@ -293,6 +384,8 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
         )
 
         self.representation = new_instance.representation
+        self._loaded_attributes = None
+        self.invalidate_relationships()
 
     def sync(self, **kwargs):
         """Makes a GET call to the resource/{id} route
@@ -311,6 +404,8 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
             raise MagellanRuntimeException("Can't sync without an assigned ID")
         backend_instance = self.__class__.find(self.id, **kwargs)
         self.representation = backend_instance.representation
+        self._loaded_attributes = None
+        self.invalidate_relationships()
 
     @property
     @abstractmethod
@@ -337,14 +432,258 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
         return self.get_instance_relationships()
 
     @classmethod
-    def from_json(cls, payload):
-        "Creates an instance object via an open api json response"
-        instance = cls()
-        instance.representation = cls.configuration().api_response_to_representation(
-            payload
+    def from_json(cls, payload, loaded_attributes=None):
+        """Creates an instance object via an open api json response
+
+        loaded_attributes is the sparse fieldset the payload was requested with,
+        None (the default) means every attribute was loaded
+        """
+        return cls.from_representation(
+            cls.configuration().api_response_to_representation(payload), loaded_attributes
+        )
+
+    @classmethod
+    def from_representation(cls, representation: dict, loaded_attributes=None):
+        """Creates an instance object that uses representation (not a copy) as its
+        internal representation
+
+        __init__ is skipped: its empty representation would be replaced straight away
+
+        Args:
+            representation (dict): an internal representation, ex: a converted API response
+            loaded_attributes (Iterable[str], optional): the sparse fieldset the representation
+                was requested with. Defaults to None (every attribute was loaded).
+
+        Returns:
+            AbstractApiModel: the instance
+        """
+        instance = object.__new__(cls)
+        instance.representation = representation
+        instance._loaded_attributes = (  # pylint: disable=protected-access
+            None if loaded_attributes is None else set(loaded_attributes)
         )
+        instance._relationship_cache = None  # pylint: disable=protected-access
         return instance
 
+    def loaded_attributes(self) -> Union[set, None]:
+        """Returns the names of the fields loaded from the API for this instance
+
+        Returns:
+            Union[set, None]: the loaded field names, or None if no sparse fieldset was
+            requested and every attribute is available
+        """
+        return self._loaded_attributes
+
+    def attribute_is_loaded(self, attribute_name: str) -> bool:
+        """Checks if an attribute was part of the fields loaded for this instance
+
+        Args:
+            attribute_name (str): The name of the attribute
+
+        Returns:
+            bool: False if a sparse fieldset left the attribute out, True otherwise
+        """
+        loaded = self.loaded_attributes()
+        return loaded is None or attribute_name in loaded
+
+    def load_attributes(self, **kwargs) -> None:
+        """Fetches the full record and fills in every field a sparse fieldset left out.
+        Fields that were loaded (or set locally) are not overwritten
+
+        Raises:
+            MagellanRuntimeException: if the instance has no ID to fetch with
+        """
+        loaded = self.loaded_attributes()
+        if loaded is None:
+            return
+        if not self.id:
+            raise MagellanRuntimeException("Can't load attributes without an assigned ID")
+        full_instance = self.__class__.find(self.id, **kwargs)
+        for attribute_name in self.list_attributes():
+            if attribute_name not in loaded:
+                self.set_instance_attribute(
+                    attribute_name, full_instance.get_instance_attribute(attribute_name)
+                )
+        for relationship_name, value in full_instance.get_instance_relationships().items():
+            if relationship_name not in loaded:
+                self.set_instance_relationship_value(relationship_name, value)
+        self._loaded_attributes = None
+
+    def _add_relationship_id(
+        self, relationship_name, singular_name, added_elem_id, additional_args={}
+    ):
+        """Adds a given UUID to the relationship body of a given instance of a resource"""
+        current_entities = self.get_instance_relationship_value(relationship_name).get(
+            "data", []
+        )
+        current_entities.append(
+            self.configuration().relationship_id_to_json_entry(
+                added_elem_id,
+                relationship_type=singular_name,
+                additional_args=additional_args,
+            )
+        )
+        self.set_instance_relationship_value(
+            relationship_name, {"data": current_entities}
+        )
+
+    def _remove_relationship_id(self, relationship_name, singular_name, removed_elem_id):
+        """Removes a given UUID from the relationships body"""
+        current_entities = self.get_instance_relationship_value(relationship_name)
+        current_entities = current_entities.get("data", current_entities)
+        if current_entities is None:
+            current_entities = []
+        mapped_entity = self.configuration().relationship_id_to_json_entry(
+            removed_elem_id, relationship_type=singular_name
+        )
+        if mapped_entity in current_entities:
+            current_entities.remove(mapped_entity)
+            self.set_instance_relationship_value(
+                relationship_name, {"data": current_entities}
+            )
+
+    @classmethod
+    def _find_by_attribute(cls, attribute_name, value, operation="eq", **kwargs):
+        """Returns the first instance whose attribute matches value, or None
+        (the find_by_{attribute} helpers)"""
+        entity = cls.where(
+            **{
+                attribute_name: value,
+                "filtering_arguments": {attribute_name: operation},
+            },
+            limit=1,
+            **kwargs,
+        )
+        return entity.first()
+
+    def _get_many_relationship(self, relationship_name, refresh=False, **kwargs):
+        """Returns Instance models for each entity currently linked in a relationship"""
+
+        def resolve(**kwargs):
+            filtering_arguments = kwargs.pop("filtering_arguments", {})
+            filtering_arguments["id"] = "in"
+            ids = [
+                relationship["id"]
+                for relationship in self.get_instance_relationship_value(
+                    relationship_name
+                ).get("data")
+            ]
+            relationship_model_name = inflection.camelize(
+                inflection.singularize(relationship_name)
+            )
+            response = self.__models__[relationship_model_name].where(
+                id=ids,
+                filtering_arguments=filtering_arguments,
+                limit=len(ids),
+                **kwargs,
+            )
+            response.evaluate_fully()
+            return response
+
+        # the memoized response stays loaded, callers get copies they can chain on
+        return self.resolve_relationship(relationship_name, resolve, refresh, **kwargs).copy()
+
+    def _get_one_relationship(self, relationship_name, refresh=False):
+        """Returns the Instance model linked in a singular relationship, or None"""
+        def resolve():
+            relation_id = (
+                self.get_instance_relationship_value(relationship_name)
+                .get("data")
+                .get("id", None)
+            )
+            if relation_id is None:
+                return None
+            return self.__models__[inflection.camelize(relationship_name)].find(
+                relation_id
+            )
+
+        return self.resolve_relationship(relationship_name, resolve, refresh)
+
+    def _set_relationship_id(self, relationship_name, new_id, additional_args={}):
+        """Links the entity with the given UUID in a singular relationship"""
+        relationship_entity = self.configuration().relationship_id_to_json_entry(
+            new_id,
+            additional_args=additional_args,
+            relationship_type=relationship_name,
+        )
+        self.set_instance_relationship_value(
+            relationship_name, {"data": relationship_entity}
+        )
+
+    def _set_relationship(self, relationship_name, new_entity, meta={}):
+        """Links an instance in a singular relationship"""
+        relationship_entity = self.configuration().relationship_id_to_json_entry(
+            new_entity.id, meta=meta, relationship_type=relationship_name
+        )
+        self.set_instance_relationship_value(
+            relationship_name, {"data": relationship_entity}
+        )
+
+    def resolve_relationship(
+        self,
+        relationship_name: str,
+        resolve: Callable[..., Any],
+        refresh: bool = False,
+        **kwargs,
+    ) -> Any:
+        """Returns a relationship helper's result, calling resolve(**kwargs) only the first
+        time the helper is called with these kwargs (or when refresh is True).
+        The result is shared by every call, so hand out copies of mutable results
+
+        The memoized results are dropped by set_instance_relationship_value (which the
+        set/add/remove helpers go through), by sync(), patch() and post(),
+        or by invalidate_relationships()
+
+        Args:
+            relationship_name (str): name of the relationship
+            resolve (Callable[..., Any]): fetches the related entities
+            refresh (bool, optional): resolve again even if a result is memoized.
+                Defaults to False.
+
+        Returns:
+            Any: the (memoized) result of resolve
+        """
+        if self._relationship_cache is None:
+            self._relationship_cache = {}
+        results = self._relationship_cache.setdefault(relationship_name, {})
+        key = freeze(kwargs)
+        if refresh or key not in results:
+            results[key] = resolve(**kwargs)
+        return results[key]
+
+    def invalidate_relationships(self, *relationship_names: str) -> None:
+        """Drops the memoized results of the given relationships, or of every relationship
+        when none are given. Call this after changing the representation directly
+
+        Args:
+            *relationship_names (str): names of the relationships
+        """
+        if self._relationship_cache is None:
+            return
+        if not relationship_names:
+            self._relationship_cache = None
+            return
+        for relationship_name in relationship_names:
+            self._relationship_cache.pop(relationship_name, None)
+
+    def handle_unloaded_attribute(self, attribute_name: str) -> None:
+        """Called when reading an attribute a sparse fieldset left out.
+        Depending on the config's `unloaded_attribute_behavior` this either loads
+        the missing attributes or raises
+
+        Args:
+            attribute_name (str): The name of the attribute being read
+
+        Raises:
+            MagellanRuntimeException: if `unloaded_attribute_behavior` is "exception"
+        """
+        if self.configuration().unloaded_attribute_behavior == "exception":
+            raise MagellanRuntimeException(
+                f"Attribute `{attribute_name}` was not loaded, only {sorted(self.loaded_attributes())} were requested. "  # pylint: disable=line-too-long
+                "Call load_attributes() or include it in the fields requested"
+            )
+        self.load_attributes()
+
     def get_instance_attribute(self, attribute_name: str) -> Union[Any, None]:
         """Helper function to get the instance model attribute specified.
         This is helpful because a model might have a custom path to
@@ -377,6 +716,9 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
         for stepping in self.configuration().model_attributes_path:
             attr_object = attr_object.get(stepping, {})
         attr_object[attribute_name] = attribute_value
+        loaded = self.loaded_attributes()
+        if loaded is not None:
+            loaded.add(attribute_name)
 
     def get_instance_relationships(self) -> dict:
         """Gets the relationships object by traversing down the representation path as needed
@@ -410,7 +752,7 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
         self, relationship_name: str, relationship_value: Any
     ) -> None:
         """Sets the instance's relationship object's value such that the relationship_name
-        key yields the relationship_value
+        key yields the relationship_value, dropping the relationship's memoized result
 
         Args:
             relationship_name (str): name of the relationship
@@ -420,3 +762,4 @@ class AbstractApiModel(ABC):  # pylint: disable=too-many-public-methods
         for stepping in self.configuration().model_relationships_path:
             relationships_object = relationships_object.get(stepping, {})
         relationships_object[relationship_name] = relationship_value
+        self.invalidate_relationships(relationship_name)
@@ -0,0 +1,85 @@
+""" AdaptivePageSize definition file """
+
+# HTTP statuses a server may answer a too large page[size] with
+page_size_rejection_codes = (400, 413, 422)
+
+
+class AdaptivePageSize:
+    """Chooses the page size of a MagellanResponse's next request from the previous pages
+
+    Each page's time is scaled towards `target_seconds` (at most halving or doubling
+    the size per page), the size is capped so a page's body stays under `max_page_bytes`,
+    and a `ceiling` is learned when the server rejects a size or silently returns fewer
+    records than requested while having further pages
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        minimum: int,
+        maximum: int,
+        target_seconds: float,
+        max_page_bytes: int = None,
+        ceiling: int = None,
+    ):
+        """Creates an AdaptivePageSize starting from the minimum size
+
+        Args:
+            minimum (int): the smallest page size requested
+            maximum (int): the largest page size requested
+            target_seconds (float): the time a page should take
+            max_page_bytes (int, optional): the largest body a page should have.
+                Defaults to None for no limit.
+            ceiling (int, optional): a maximum the server is known to enforce.
+                Defaults to None.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.max_page_bytes = max_page_bytes
+        self.ceiling = ceiling
+        self.size = self.clamp(minimum)
+
+    def clamp(self, size: float) -> int:
+        """Returns size as an int within the bounds and under the ceiling"""
+        upper = self.maximum if self.ceiling is None else min(self.maximum, self.ceiling)
+        return max(self.minimum, min(int(size), upper))
+
+    def observe(  # pylint: disable=too-many-arguments
+        self, requested: int, received: int, seconds: float, body_bytes: int, has_next: bool
+    ) -> None:
+        """Updates the next page size from a page's measurements
+
+        Args:
+            requested (int): the page size requested
+            received (int): the number of records the page had
+            seconds (float): the time the request took
+            body_bytes (int): the size of the response's body
+            has_next (bool): True if there's a page after this one
+        """
+        if has_next and 0 < received < requested:
+            # the server capped the page without an error
+            self.ceiling = received
+        if received <= 0:
+            self.size = self.clamp(self.size)
+            return
+        scale = self.target_seconds / seconds if seconds > 0 else 2.0
+        size = requested * min(max(scale, 0.5), 2.0)
+        if self.max_page_bytes:
+            size = min(size, self.max_page_bytes * received / max(body_bytes, 1))
+        self.size = self.clamp(size)
+
+    def reject(self, requested: int, status_code: int) -> bool:
+        """Lowers the ceiling after the server rejected a page size
+
+        Args:
+            requested (int): the page size requested
+            status_code (int): the status of the error response
+
+        Returns:
+            bool: True if a smaller page size can be tried
+        """
+        if status_code not in page_size_rejection_codes or requested <= self.minimum:
+            return False
+        self.ceiling = max(self.minimum, requested // 2)
+        self.size = self.clamp(self.ceiling)
+        return True
@@ -0,0 +1,180 @@
+"""
+    Compiled accessors generated Models use to read and write their representation
+"""
+# pylint: disable=protected-access
+from typing import Any, Callable, Dict, Iterable, Tuple
+import inflection
+from magellan_models.config import MagellanConfig
+
+# instance storage of generated Models
+MODEL_SLOTS = ("_representation", "_loaded_attributes", "_relationship_cache")
+
+
+def relationship_template(relationships: Dict[str, str]) -> Tuple[Tuple[str, bool], ...]:
+    """Returns a Model's __relationship_template__: the key in the representation
+    and whether it's a "many" relationship for each relationship
+
+    Args:
+        relationships (Dict[str, str]): relationship name => relationship type
+
+    Returns:
+        Tuple[Tuple[str, bool], ...]: the (key, is a "many" relationship) pairs
+    """
+    return tuple(
+        (
+            inflection.pluralize(relationship) if relationship_type == "many" else relationship,
+            relationship_type == "many",
+        )
+        for relationship, relationship_type in relationships.items()
+    )
+
+
+def compile_path(path: Iterable[str]) -> Callable[[dict], dict]:
+    """Returns a function walking a representation down path, ex: ("data", "attributes").
+    A missing step yields a new empty dict, as in AbstractApiModel.get_instance_attribute
+
+    Args:
+        path (Iterable[str]): the keys to step through
+
+    Returns:
+        Callable[[dict], dict]: representation => the object at the end of path
+    """
+    steps = tuple(path)
+    if not steps:
+        return lambda representation: representation
+    if len(steps) == 1:
+        step = steps[0]
+        return lambda representation: representation.get(step, {})
+
+    def walk(representation: dict) -> dict:
+        for step in steps:
+            representation = representation.get(step, {})
+        return representation
+
+    return walk
+
+
+def config_path_walker(
+    configuration: MagellanConfig, path_field: str
+) -> Callable[[dict], dict]:
+    """Returns a function walking a representation down one of the configuration's paths.
+    The path is compiled once, and again only if the configuration's path is replaced
+
+    Args:
+        configuration (MagellanConfig): the configuration holding the path
+        path_field (str): "model_attributes_path" or "model_relationships_path"
+
+    Returns:
+        Callable[[dict], dict]: representation => the object at the end of the path
+    """
+    compiled = [None, None]
+
+    def walk(representation: dict) -> dict:
+        path = getattr(configuration, path_field)
+        if path is not compiled[0]:
+            compiled[1] = compile_path(path)
+            compiled[0] = path
+        return compiled[1](representation)
+
+    return walk
+
+
+def attribute_property(attribute_name: str, walk_attributes: Callable[[dict], dict]) -> property:
+    """Creates the property reading and writing one attribute of a generated Model
+
+    Reading an attribute a sparse fieldset left out calls handle_unloaded_attribute first,
+    writing one marks it as loaded
+
+    Args:
+        attribute_name (str): the attribute's name
+        walk_attributes (Callable[[dict], dict]): returns the attributes object of a representation
+
+    Returns:
+        property: the property
+    """
+
+    def getter(self):
+        loaded = self._loaded_attributes
+        if loaded is not None and attribute_name not in loaded:
+            self.handle_unloaded_attribute(attribute_name)
+        return walk_attributes(self._representation).get(attribute_name)
+
+    def setter(self, value):
+        walk_attributes(self._representation)[attribute_name] = value
+        loaded = self._loaded_attributes
+        if loaded is not None:
+            loaded.add(attribute_name)
+
+    return property(getter, setter, doc=f"The `{attribute_name}` attribute")
+
+
+def representation_property() -> property:
+    """Creates the property holding a generated Model instance's representation"""
+
+    def getter(self):
+        return self._representation
+
+    def setter(self, value):
+        self._representation = value
+
+    return property(getter, setter)
+
+
+def compile_accessors(
+    configuration: MagellanConfig, attribute_names: Iterable[str]
+) -> Dict[str, Any]:
+    """Returns the members a generated Model uses to access its representation:
+    a property per attribute in attribute_names, `id`, and versions of AbstractApiModel's
+    get/set_instance_attribute and relationship accessors bound to compiled paths
+
+    Args:
+        configuration (MagellanConfig): the configuration of the Model
+        attribute_names (Iterable[str]): the attributes to create properties for
+
+    Returns:
+        Dict[str, Any]: member name => property or function
+    """
+    walk_attributes = config_path_walker(configuration, "model_attributes_path")
+    walk_relationships = config_path_walker(configuration, "model_relationships_path")
+
+    def get_instance_attribute(self, attribute_name: str):
+        return walk_attributes(self._representation).get(attribute_name, None)
+
+    def set_instance_attribute(self, attribute_name: str, attribute_value) -> None:
+        walk_attributes(self._representation)[attribute_name] = attribute_value
+        loaded = self._loaded_attributes
+        if loaded is not None:
+            loaded.add(attribute_name)
+
+    def get_instance_relationships(self) -> dict:
+        return walk_relationships(self._representation)
+
+    def get_instance_relationship_value(self, relationship_name: str):
+        return walk_relationships(self._representation).get(relationship_name, None)
+
+    def set_instance_relationship_value(self, relationship_name: str, relationship_value) -> None:
+        walk_relationships(self._representation)[relationship_name] = relationship_value
+        cache = self._relationship_cache
+        if cache is not None:
+            cache.pop(relationship_name, None)
+
+    def get_id(self):
+        return walk_attributes(self._representation).get("id", None)
+
+    def set_id(self, value):
+        set_instance_attribute(self, "id", value)
+
+    members = {
+        name: attribute_property(name, walk_attributes) for name in attribute_names
+    }
+    members.update(
+        {
+            "id": property(get_id, set_id),
+            "get_instance_attribute": get_instance_attribute,
+            "set_instance_attribute": set_instance_attribute,
+            "get_instance_relationships": get_instance_relationships,
+            "get_instance_relationship_value": get_instance_relationship_value,
+            "set_instance_relationship_value": set_instance_relationship_value,
+        }
+    )
+    return members
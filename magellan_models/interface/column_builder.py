@@ -0,0 +1,71 @@
+""" ColumnBuilder definition file """
+from array import array
+
+# list_attributes() type names that can be stored in a typed array, and their array typecodes
+attribute_type_to_typecode = {"int": "q", "float": "d", "bool": "b"}
+
+# numpy dtypes matching each of the typecodes above
+typecode_to_dtype = {"q": "int64", "d": "float64", "b": "bool"}
+
+
+def get_numpy():
+    """Imports numpy if it's installed
+
+    Returns:
+        module: the numpy module, or None if numpy isn't available
+    """
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+class ColumnBuilder:
+    """Accumulates the values of a single attribute into a column
+
+    Numeric and boolean attributes are stored in an `array.array`,
+    everything else (strings, lists, dicts) is stored in a list.
+    If a typed column hits a value that doesn't fit (None, an int too large for 64 bits,
+    a float in an integer column etc) the column falls back to a list
+    """
+
+    def __init__(self, attribute_type: str):
+        """Creates an empty column
+
+        Args:
+            attribute_type (str): the attribute's type name as returned by `list_attributes()`
+        """
+        self.typecode = attribute_type_to_typecode.get(attribute_type)
+        self.values = array(self.typecode) if self.typecode else []
+
+    def append(self, value) -> None:
+        """Appends a value to the column
+
+        Args:
+            value (any): the attribute value
+        """
+        try:
+            self.values.append(value)
+        except (TypeError, OverflowError):
+            self.typecode = None
+            self.values = self.values.tolist()
+            self.values.append(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def finish(self, use_numpy: bool = True):
+        """Returns the finished column
+
+        Args:
+            use_numpy (bool, optional): Convert typed columns to numpy arrays if numpy is installed.
+                Defaults to True.
+
+        Returns:
+            Union[array, list, numpy.ndarray]: the column values
+        """
+        numpy = get_numpy() if use_numpy else None
+        if numpy is not None and self.typecode:
+            return numpy.array(self.values, dtype=typecode_to_dtype[self.typecode])
+        return self.values
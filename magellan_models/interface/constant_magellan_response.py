@@ -36,25 +36,38 @@ class ConstantMagellanResponse(MagellanResponse):
         self.raw_params = raw_params
         super().__init__(url_path, Model, config, limit, **kwargs)
 
-    def process_next_page_of_results(self):
-        """Processes the next page of results using the internal parameters"""
-        if self.next_url is None or self.iteration_is_complete():
-            # Done iterating, next_url is None when we have no more results to get
-            return
+    def create_first_page_params(self, kwargs: dict) -> dict:
+        """The first page is requested with the raw params passed to `query`"""
+        return self.raw_params
 
-        header_and_args = self.__config__.create_header(**self.kwargs)
-        header = header_and_args[0]
-        if len(self) == 0:  # first call
-            route = self.next_url
-            resp = self.get_request(route, self.raw_params, header)
-            self.iterate_through_response(resp)
-        else:
-            resp = self.get_request(url=self.next_url, headers=header)
-            self.iterate_through_response(resp)
+    def create_probe_params(self, page_size: int, kwargs: dict) -> dict:
+        """Probes (count(), first()...) request the raw params passed to `query`"""
+        return self.raw_params
 
-        self.next_url = self.__config__.get_next_link_from_resp(resp)
-        self.__meta_data__ = self.__config__.get_meta_data_from_resp(resp)
-        return
+    def create_count_response(self) -> ConstantMagellanResponse:
+        """count() streams the same raw params when the server doesn't send a total"""
+        return ConstantMagellanResponse(
+            self.__original_path__,
+            self.raw_params,
+            self.__Model__,
+            self.__config__,
+            self.query.limit,
+            **self.kwargs
+        )
+
+    def create_offset_page_params(self, kwargs: dict, offset: int, page_size: int) -> dict:
+        """Random access adds the offset params to the raw params passed to `query`"""
+        return {**self.raw_params, **self.__config__.create_offset_params(offset, page_size)}
+
+    def local_collection(self) -> None:
+        """The raw params passed to `query` are always sent to the API"""
+        return None
+
+    def keyset_kwargs(self, kwargs: dict) -> dict:
+        """The raw params passed to `query` can't be filtered on a keyset"""
+        raise MagellanRuntimeException(
+            "Keyset pagination isn't supported by `query`, use `where`"
+        )
 
     def where(self, **kwargs):
         raise MagellanRuntimeException("You can't chain on a ConstantMagellanResponse")
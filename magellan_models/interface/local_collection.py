@@ -0,0 +1,309 @@
+""" LocalCollection definition file """
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Iterable, List, Union
+from functools import lru_cache
+import re
+
+from magellan_models.exceptions import MagellanRuntimeException
+
+if TYPE_CHECKING:
+    from magellan_models.interface.abstract_api_model import AbstractApiModel
+
+
+@lru_cache(maxsize=256)
+def like_pattern(pattern: str, case_insensitive: bool = False) -> re.Pattern:
+    """Compiles a SQL LIKE pattern (% and _ wildcards) into a regex
+
+    Args:
+        pattern (str): the LIKE pattern
+        case_insensitive (bool, optional): compile for ILIKE. Defaults to False.
+
+    Returns:
+        re.Pattern: a regex that fullmatches the same strings
+    """
+    regex = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return re.compile(regex, re.IGNORECASE | re.DOTALL if case_insensitive else re.DOTALL)
+
+
+def like(value, pattern, case_insensitive=False) -> bool:
+    """Evaluates `value LIKE pattern` (or ILIKE)"""
+    if value is None or pattern is None:
+        return False
+    return bool(like_pattern(str(pattern), case_insensitive).fullmatch(str(value)))
+
+
+def compare(operation: Callable) -> Callable:
+    """Wraps an ordering comparison so comparing mismatched types (or None) is False instead
+    of raising, similar to how a database treats NULL"""
+
+    def compare_func(value, other):
+        try:
+            return operation(value, other)
+        except TypeError:
+            return False
+
+    return compare_func
+
+
+# The filtering operations `create_filters` supports (flask-rest-jsonapi's operators)
+# mapped to how each one is evaluated in process. value is the instance's attribute value
+# and other is the value passed to `where`
+local_operations = {
+    "eq": lambda value, other: value == other,
+    "ne": lambda value, other: value != other,
+    "in_": lambda value, other: value in other,
+    "notin_": lambda value, other: value not in other,
+    "lt": compare(lambda value, other: value < other),
+    "le": compare(lambda value, other: value <= other),
+    "gt": compare(lambda value, other: value > other),
+    "ge": compare(lambda value, other: value >= other),
+    "between": compare(lambda value, other: other[0] <= value <= other[1]),
+    "like": like,
+    "ilike": lambda value, other: like(value, other, case_insensitive=True),
+    "notlike": lambda value, other: value is not None and not like(value, other),
+    "notilike": lambda value, other: value is not None
+    and not like(value, other, case_insensitive=True),
+    "startswith": lambda value, other: isinstance(value, str)
+    and value.startswith(other),
+    "endswith": lambda value, other: isinstance(value, str) and value.endswith(other),
+    "is_": lambda value, other: value is other,
+    "isnot": lambda value, other: value is not other,
+    "any": lambda value, other: value is not None and other in value,
+    "has": lambda value, other: value is not None and other in value,
+}
+# common aliases
+local_operations["in"] = local_operations["in_"]
+local_operations["notin"] = local_operations["notin_"]
+local_operations["not_in"] = local_operations["notin_"]
+local_operations["neq"] = local_operations["ne"]
+local_operations["lte"] = local_operations["le"]
+local_operations["gte"] = local_operations["ge"]
+# operations comparing the attribute with a collection of values
+collection_operations = ("in", "in_", "notin", "notin_", "not_in")
+
+
+def sort_keys(sort) -> List[str]:
+    """Splits a `sort` kwarg (a comma separated string or a list of keys) into its keys,
+    a key starting with "-" is descending
+
+    Args:
+        sort (Union[str, Iterable[str], None]): the sort kwarg
+
+    Returns:
+        List[str]: the keys
+    """
+    if not sort:
+        return []
+    if isinstance(sort, str):
+        sort = sort.split(",")
+    return [key.strip() for key in sort if key.strip()]
+
+
+def freeze(value):
+    """Converts a value into something hashable so it can be used as an index key
+
+    Args:
+        value (any): an attribute value
+
+    Returns:
+        any: the value with lists converted to tuples and dicts to sorted item tuples
+    """
+    if isinstance(value, list):
+        return tuple(freeze(element) for element in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(element)) for key, element in value.items()))
+    return value
+
+
+class LocalCollection:
+    """A fully loaded collection of Model instances that can answer `where` queries in process
+
+    The filtering operations `create_filters` supports (eq, ne, in, like, ilike, lt, gt...)
+    are evaluated locally, and hash indexes can be built on chosen attributes
+    so equality and `in` lookups don't scan the collection.
+
+    Register a collection with `Model.use_local_collection(collection)` and the
+    MagellanResponses of that Model's `where` and `find_by_{attribute}` calls are loaded
+    from it whenever their query can be answered
+    """
+
+    def __init__(
+        self,
+        Model: AbstractApiModel,
+        instances: Iterable[AbstractApiModel],
+        indexes: Iterable[str] = (),
+    ):
+        """Creates a LocalCollection
+
+        Args:
+            Model (AbstractApiModel): the Model the instances belong to
+            instances (Iterable[AbstractApiModel]): every instance of the collection
+            indexes (Iterable[str], optional): attributes to build hash indexes on.
+                Defaults to ().
+        """
+        self.__Model__ = Model  # pylint: disable=invalid-name
+        self.__instances__ = list(instances)
+        self.__indexes__ = {}
+        for attribute in indexes:
+            self.create_index(attribute)
+
+    def create_index(self, attribute: str) -> None:
+        """Builds a hash index on an attribute, used by eq and in filters
+
+        Args:
+            attribute (str): the attribute name
+        """
+        index = {}
+        for position, instance in enumerate(self.__instances__):
+            key = freeze(instance.get_instance_attribute(attribute))
+            index.setdefault(key, []).append(position)
+        self.__indexes__[attribute] = index
+
+    def indexed_attributes(self) -> List[str]:
+        """Returns the attributes with a hash index"""
+        return list(self.__indexes__.keys())
+
+    def can_answer(self, kwargs: dict) -> bool:
+        """Checks if a set of `where` kwargs can be evaluated locally
+
+        Args:
+            kwargs (dict): the kwargs passed to `where`
+
+        Returns:
+            bool: False if a kwarg isn't an attribute, uses an unsupported operation
+                (or an "in" operation without a list of values), or sorts by a key
+                that isn't an attribute
+        """
+        config = self.__Model__.configuration()
+        attributes = self.__Model__.list_attributes()
+        filtering_arguments = kwargs.get("filtering_arguments", {})
+        for key, value in kwargs.items():
+            if key in ("filtering_arguments", "sort", "fields"):
+                continue
+            if key == config.header_args_separator:
+                continue
+            if key not in attributes:
+                return False
+            operation = filtering_arguments.get(key, "eq")
+            if operation not in local_operations:
+                return False
+            if operation in collection_operations and not isinstance(
+                value, (list, tuple, set, frozenset)
+            ):
+                return False
+        try:
+            keys = sort_keys(kwargs.get("sort"))
+        except (AttributeError, TypeError):
+            return False
+        return all(key.lstrip("-") in attributes for key in keys)
+
+    def where(self, limit: int = None, **kwargs) -> LocalCollection:
+        """Filters the collection in process, see `AbstractApiModel.where` for the arguments.
+        Header args and sparse fieldsets are ignored since no request is made
+
+        Returns:
+            LocalCollection: a collection of the matching instances
+        """
+        config = self.__Model__.configuration()
+        kwargs.pop(config.header_args_separator, None)
+        kwargs.pop("fields", None)
+        keys = sort_keys(kwargs.pop("sort", None))
+        filtering_arguments = kwargs.pop("filtering_arguments", {})
+
+        filters = []
+        candidates = None
+        for attribute, value in kwargs.items():
+            operation = filtering_arguments.get(attribute, "eq")
+            index = self.__indexes__.get(attribute)
+            if candidates is None and index is not None and operation in ("eq", "in", "in_"):
+                lookups = [value] if operation == "eq" else value
+                positions = set()
+                for lookup in lookups:
+                    positions.update(index.get(freeze(lookup), ()))
+                # sorting the positions keeps the collection's order
+                candidates = [self.__instances__[position] for position in sorted(positions)]
+                continue
+            filters.append((attribute, local_operations[operation], value))
+
+        matches = []
+        for instance in self.__instances__ if candidates is None else candidates:
+            if all(
+                predicate(instance.get_instance_attribute(attribute), value)
+                for attribute, predicate, value in filters
+            ):
+                matches.append(instance)
+                # without a sort the first matches are the results, sorting needs them all
+                if limit is not None and not keys and len(matches) >= limit:
+                    break
+
+        for key in reversed(keys):
+            descending = key.startswith("-")
+            key = key.lstrip("-")
+            matches.sort(
+                key=lambda instance, key=key: (
+                    instance.get_instance_attribute(key) is None,
+                    instance.get_instance_attribute(key),
+                ),
+                reverse=descending,
+            )
+        if limit is not None:
+            matches = matches[:limit]
+        return LocalCollection(self.__Model__, matches)
+
+    def limit(self, new_limit: int) -> LocalCollection:
+        """Truncates the collection to new_limit instances
+
+        Returns:
+            LocalCollection: self
+        """
+        self.__instances__ = self.__instances__[:new_limit]
+        self.__indexes__ = {}
+        return self
+
+    def iteration_is_complete(self) -> bool:
+        """A LocalCollection is always fully loaded"""
+        return True
+
+    def evaluate_fully(self) -> None:
+        """A LocalCollection is always fully loaded"""
+
+    def get_meta_data(self) -> dict:
+        """No API call is made, so there's no meta data"""
+        return {}
+
+    def count(self) -> int:
+        """The number of instances, see MagellanResponse.count"""
+        return len(self.__instances__)
+
+    def first(self) -> Union[AbstractApiModel, None]:
+        """Returns the first instance, or None if the collection is empty"""
+        return self.__instances__[0] if self.__instances__ else None
+
+    def exists(self) -> bool:
+        """Checks if the collection has any instance"""
+        return bool(self.__instances__)
+
+    def one(self) -> AbstractApiModel:
+        """Returns the only instance of the collection
+
+        Raises:
+            MagellanRuntimeException: if the collection is empty, or has more than one instance
+        """
+        if len(self.__instances__) != 1:
+            raise MagellanRuntimeException(
+                f"Expected exactly one {self.__Model__.__name__}, "
+                f"found {len(self.__instances__)}"
+            )
+        return self.__instances__[0]
+
+    def __len__(self):
+        return len(self.__instances__)
+
+    def __getitem__(self, index):
+        return self.__instances__[index]
+
+    def __iter__(self):
+        return iter(self.__instances__)
@@ -0,0 +1,418 @@
+""" MagellanMirror definition file """
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Union
+import json
+import sqlite3
+import threading
+from magellan_models.exceptions import MagellanRuntimeException
+from magellan_models.interface.local_collection import LocalCollection
+
+if TYPE_CHECKING:
+    from magellan_models.interface.abstract_api_model import AbstractApiModel
+
+# list_attributes() type names => sqlite column types, anything else is stored as JSON text
+attribute_type_to_column_type = {
+    "str": "TEXT",
+    "int": "INTEGER",
+    "float": "REAL",
+    "bool": "INTEGER",
+}
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a table or column name for use in a sqlite statement
+
+    Args:
+        name (str): the identifier
+
+    Returns:
+        str: the quoted identifier
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+class MagellanMirror:  # pylint: disable=too-many-instance-attributes
+    """A local SQLite copy of a resource's collection
+
+    Each Model gets a table with a column per attribute in `list_attributes()`
+    (plus the instance's full representation), and each relationship gets a link table
+    of (source_id, position, target_id, entry) rows.
+
+    `refresh()` pulls records from the API into the mirror. With a watermark attribute
+    (ex: "updated_at") only records whose watermark is at or past the highest value
+    already mirrored are requested, using the config's filtering machinery.
+    Records deleted on the server can't be detected through a watermark,
+    call `refresh(full=True)` to rebuild the mirror from scratch.
+
+    Reads (`find`, `where`, iteration) are served from the local database
+    """
+
+    meta_table = "_magellan_mirror"
+
+    def __init__(
+        self,
+        path: str,
+        Model: AbstractApiModel,
+        watermark: str = None,
+        watermark_operation: str = "ge",
+        **kwargs,
+    ):
+        """Opens (or creates) the mirror database and the Model's tables
+
+        Args:
+            path (str): the sqlite database path (":memory:" works too)
+            Model (AbstractApiModel): the Model being mirrored
+            watermark (str, optional): attribute used for incremental refreshes.
+                Defaults to None, meaning each refresh reloads everything.
+            watermark_operation (str, optional): filtering operation used to compare
+                the watermark attribute with the last value mirrored. Defaults to "ge".
+            kwargs (dict): arguments passed to `Model.where` for each refresh
+                (filters, filtering_arguments, header args)
+        """
+        self.path = path
+        self.__Model__ = Model  # pylint: disable=invalid-name
+        self.watermark = watermark
+        self.watermark_operation = watermark_operation
+        self.kwargs = kwargs
+        self.table_name = Model.resource_name()
+        self.__lock__ = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+        attribute_types = Model.list_attributes()
+        self.columns = list(attribute_types.keys())
+        if "id" not in self.columns:
+            self.columns.insert(0, "id")
+        self.column_types = {
+            column: attribute_types.get(column, "str") for column in self.columns
+        }
+        # The relationship names come from an empty instance's relationship skeleton
+        self.relationships = list(Model().get_instance_relationships().keys())
+        self.create_tables()
+
+    def link_table_name(self, relationship_name: str) -> str:
+        """Returns the name of the link table for a relationship
+
+        Args:
+            relationship_name (str): the relationship name
+
+        Returns:
+            str: the link table name
+        """
+        return f"{self.table_name}__{relationship_name}"
+
+    def create_tables(self) -> None:
+        """Creates the Model's table, its relationship link tables and the metadata table"""
+        column_definitions = [
+            f"{quote_identifier(column)} "
+            f"{attribute_type_to_column_type.get(self.column_types[column], 'TEXT')}"
+            + (" PRIMARY KEY" if column == "id" else "")
+            for column in self.columns
+        ]
+        column_definitions.append('"_representation" TEXT')
+        with self.__lock__, self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote_identifier(self.table_name)} "
+                f"({', '.join(column_definitions)})"
+            )
+            for relationship_name in self.relationships:
+                link_table = quote_identifier(self.link_table_name(relationship_name))
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {link_table} "
+                    "(source_id TEXT, position INTEGER, target_id TEXT, entry TEXT)"
+                )
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS "
+                    f"{quote_identifier(self.link_table_name(relationship_name) + '_source')} "
+                    f"ON {link_table} (source_id)"
+                )
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.meta_table} "
+                "(key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def get_watermark_value(self):
+        """Returns the highest watermark value mirrored so far
+
+        Returns:
+            any: the watermark value, or None if nothing has been mirrored yet
+        """
+        with self.__lock__:
+            row = self.connection.execute(
+                f"SELECT value FROM {self.meta_table} WHERE key = ?",
+                (f"watermark:{self.table_name}",),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def refresh(self, full: bool = False) -> int:
+        """Pulls records from the API into the mirror
+
+        Args:
+            full (bool, optional): reload the whole collection, then drop the mirrored records
+                the server didn't return. Defaults to False.
+
+        Returns:
+            int: the number of records written
+        """
+        kwargs = dict(self.kwargs)
+        watermark_value = None if full else self.get_watermark_value()
+        if self.watermark and watermark_value is not None:
+            filtering_arguments = dict(kwargs.pop("filtering_arguments", {}))
+            filtering_arguments[self.watermark] = self.watermark_operation
+            kwargs[self.watermark] = watermark_value
+            kwargs["filtering_arguments"] = filtering_arguments
+        else:
+            # without a watermark every refresh is a full reload
+            full = True
+
+        written = 0
+        # a full refresh keeps the records it writes and deletes the others at the end
+        written_ids = set() if full else None
+        response = self.__Model__.where(**kwargs)
+        # pages are requested outside the lock and each one is written in its own transaction,
+        # so reads aren't blocked and no write transaction is held during the network scan
+        for page in response.iter_pages(retain=False):
+            with self.__lock__, self.connection:
+                for instance in page:
+                    self.upsert(instance)
+                    if written_ids is not None:
+                        written_ids.add(instance.id)
+                    if self.watermark:
+                        value = instance.get_instance_attribute(self.watermark)
+                        if value is not None and (
+                            watermark_value is None or value > watermark_value
+                        ):
+                            watermark_value = value
+            written += len(page)
+        with self.__lock__, self.connection:
+            if full:
+                self.delete_records(keep_ids=written_ids)
+            # only stored once every page is written, an interrupted refresh starts over
+            if self.watermark and watermark_value is not None:
+                self.connection.execute(
+                    f"INSERT OR REPLACE INTO {self.meta_table} (key, value) VALUES (?, ?)",
+                    (f"watermark:{self.table_name}", json.dumps(watermark_value)),
+                )
+        return written
+
+    def clear(self) -> None:
+        """Deletes every mirrored record and the stored watermark"""
+        with self.__lock__, self.connection:
+            self.delete_records()
+
+    def delete_records(self, keep_ids: set = None) -> None:
+        """Deletes the mirrored records (except those in keep_ids) and the stored watermark
+        without committing, so it can be part of a larger transaction
+
+        Args:
+            keep_ids (set, optional): ids of the records to keep. Defaults to None (delete all).
+        """
+        table = quote_identifier(self.table_name)
+        link_tables = [
+            quote_identifier(self.link_table_name(relationship_name))
+            for relationship_name in self.relationships
+        ]
+        with self.__lock__:
+            if keep_ids is None:
+                self.connection.execute(f"DELETE FROM {table}")
+                for link_table in link_tables:
+                    self.connection.execute(f"DELETE FROM {link_table}")
+            else:
+                stale_ids = [
+                    (record_id,)
+                    for (record_id,) in self.connection.execute(f"SELECT id FROM {table}")
+                    if record_id not in keep_ids
+                ]
+                self.connection.executemany(f"DELETE FROM {table} WHERE id = ?", stale_ids)
+                for link_table in link_tables:
+                    self.connection.executemany(
+                        f"DELETE FROM {link_table} WHERE source_id = ?", stale_ids
+                    )
+            self.connection.execute(
+                f"DELETE FROM {self.meta_table} WHERE key = ?",
+                (f"watermark:{self.table_name}",),
+            )
+
+    def to_column_value(self, column: str, value):
+        """Converts an attribute value into the value stored in its column
+
+        Args:
+            column (str): the column (attribute) name
+            value (any): the attribute value
+
+        Returns:
+            any: a sqlite compatible value
+        """
+        if value is None:
+            return None
+        if self.column_types[column] in attribute_type_to_column_type:
+            return value
+        return json.dumps(value)
+
+    def upsert(self, instance: AbstractApiModel) -> None:
+        """Inserts or replaces a single record and its relationship links.
+        This doesn't commit, `refresh` commits once every record of a page has been written
+
+        Args:
+            instance (AbstractApiModel): the instance to write
+        """
+        values = [
+            self.to_column_value(column, instance.get_instance_attribute(column))
+            for column in self.columns
+        ]
+        values.append(json.dumps(instance.representation))
+        placeholders = ", ".join("?" for _ in values)
+        column_names = ", ".join(
+            [quote_identifier(column) for column in self.columns] + ['"_representation"']
+        )
+        with self.__lock__:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {quote_identifier(self.table_name)} "
+                f"({column_names}) VALUES ({placeholders})",
+                values,
+            )
+            for relationship_name in self.relationships:
+                link_table = quote_identifier(self.link_table_name(relationship_name))
+                self.connection.execute(
+                    f"DELETE FROM {link_table} WHERE source_id = ?", (instance.id,)
+                )
+                related = instance.get_instance_relationship_value(relationship_name)
+                entries = related.get("data") if isinstance(related, dict) else related
+                if not entries:
+                    continue
+                if not isinstance(entries, list):
+                    entries = [entries]
+                self.connection.executemany(
+                    f"INSERT INTO {link_table} (source_id, position, target_id, entry) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            instance.id,
+                            position,
+                            entry.get("id") if isinstance(entry, dict) else entry,
+                            json.dumps(entry),
+                        )
+                        for position, entry in enumerate(entries)
+                    ],
+                )
+
+    def row_to_instance(self, row: tuple) -> AbstractApiModel:
+        """Creates a Model instance from the stored representation of a row
+
+        Args:
+            row (tuple): a row whose first value is the stored representation
+
+        Returns:
+            AbstractApiModel: the Model instance
+        """
+        return self.__Model__.from_representation(json.loads(row[0]))
+
+    def find(self, id: str) -> Union[AbstractApiModel, None]:  # pylint: disable=redefined-builtin
+        """Looks up a mirrored record by ID
+
+        Args:
+            id (str): the record ID
+
+        Returns:
+            Union[AbstractApiModel, None]: the instance, or None if it isn't mirrored
+        """
+        with self.__lock__:
+            row = self.connection.execute(
+                f'SELECT "_representation" FROM {quote_identifier(self.table_name)} '
+                "WHERE id = ?",
+                (id,),
+            ).fetchone()
+        return self.row_to_instance(row) if row else None
+
+    def where(self, limit: int = None, **kwargs) -> List[AbstractApiModel]:
+        """Queries the mirrored records with equality filters
+        (a list value matches any of its elements)
+
+        Args:
+            limit (int, optional): max number of records to return. Defaults to None.
+            kwargs (dict): attribute name => value
+
+        Raises:
+            MagellanRuntimeException: if an attribute isn't a mirrored column
+
+        Returns:
+            List[AbstractApiModel]: the matching instances
+        """
+        conditions = []
+        parameters = []
+        for attribute, value in kwargs.items():
+            if attribute not in self.columns:
+                raise MagellanRuntimeException(
+                    f"`{attribute}` isn't an attribute mirrored for {self.table_name}"
+                )
+            if isinstance(value, (list, tuple, set)):
+                value = list(value)
+                conditions.append(
+                    f"{quote_identifier(attribute)} IN ({', '.join('?' for _ in value)})"
+                )
+                parameters.extend(
+                    self.to_column_value(attribute, element) for element in value
+                )
+            else:
+                conditions.append(f"{quote_identifier(attribute)} = ?")
+                parameters.append(self.to_column_value(attribute, value))
+        statement = f'SELECT "_representation" FROM {quote_identifier(self.table_name)}'
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        if limit is not None:
+            statement += " LIMIT ?"
+            parameters.append(limit)
+        with self.__lock__:
+            rows = self.connection.execute(statement, parameters).fetchall()
+        return [self.row_to_instance(row) for row in rows]
+
+    def all(self) -> List[AbstractApiModel]:
+        """Returns every mirrored record
+
+        Returns:
+            List[AbstractApiModel]: the instances
+        """
+        return self.where()
+
+    def to_local_collection(self, indexes=()) -> LocalCollection:
+        """Loads every mirrored record into a LocalCollection
+        that can answer `where` queries in process
+
+        Args:
+            indexes (Iterable[str], optional): attributes to build hash indexes on.
+                Defaults to ().
+
+        Returns:
+            LocalCollection: the collection
+        """
+        return LocalCollection(self.__Model__, self.all(), indexes)
+
+    def related_ids(self, id: str, relationship_name: str) -> list:  # pylint: disable=redefined-builtin
+        """Returns the IDs linked to a record through a relationship, in their original order
+
+        Args:
+            id (str): the record ID
+            relationship_name (str): the relationship name
+
+        Returns:
+            list: the related IDs
+        """
+        with self.__lock__:
+            rows = self.connection.execute(
+                f"SELECT target_id FROM {quote_identifier(self.link_table_name(relationship_name))} "  # pylint: disable=line-too-long
+                "WHERE source_id = ? ORDER BY position",
+                (id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def __len__(self):
+        with self.__lock__:
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM {quote_identifier(self.table_name)}"
+            ).fetchone()[0]
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        self.connection.close()
@@ -0,0 +1,149 @@
+""" MagellanQuery definition file """
+from __future__ import annotations
+from copy import deepcopy
+from typing import TYPE_CHECKING, Any, Iterable
+import hashlib
+import json
+
+if TYPE_CHECKING:
+    from magellan_models.interface.abstract_api_model import AbstractApiModel
+
+
+def freeze(value: Any) -> Any:
+    """Converts a kwargs value into a hashable equivalent: dicts become sorted tuples of items,
+    lists and tuples become tuples and sets become frozensets (recursively)
+
+    Args:
+        value (Any): the value
+
+    Returns:
+        Any: a hashable value comparing equal for equal inputs
+    """
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(sorted(((key, freeze(item)) for key, item in value.items()), key=repr)),
+        )
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(freeze(item) for item in value))
+    return value
+
+
+class MagellanQuery:
+    """An immutable description of a `where` query: the Model, its route, the limit
+    and the kwargs (filters, filtering_arguments, sort, fields, include...)
+
+    Chaining methods return a new MagellanQuery. Queries are hashable and compare equal
+    when they'd send the same request, so they can be used as cache keys
+    """
+
+    __slots__ = ("__model", "__url_path", "__limit", "__kwargs", "__frozen")
+
+    def __init__(
+        self, model: AbstractApiModel, url_path: str, limit: int = None, kwargs: dict = None
+    ):
+        """Creates a MagellanQuery
+
+        Args:
+            model (AbstractApiModel): the Model being queried
+            url_path (str): the route of the first page
+            limit (int, optional): max number of entities, None for every entity.
+                Defaults to None.
+            kwargs (dict, optional): the `where` kwargs, copied. Defaults to None.
+        """
+        kwargs = deepcopy(kwargs or {})
+        object.__setattr__(self, "_MagellanQuery__model", model)
+        object.__setattr__(self, "_MagellanQuery__url_path", url_path)
+        object.__setattr__(self, "_MagellanQuery__limit", limit)
+        object.__setattr__(self, "_MagellanQuery__kwargs", kwargs)
+        object.__setattr__(self, "_MagellanQuery__frozen", freeze(kwargs))
+
+    @property
+    def model(self) -> AbstractApiModel:
+        """The Model being queried"""
+        return self.__model
+
+    @property
+    def url_path(self) -> str:
+        """The route of the first page"""
+        return self.__url_path
+
+    @property
+    def limit(self) -> int:
+        """The max number of entities, None for every entity"""
+        return self.__limit
+
+    @property
+    def kwargs(self) -> dict:
+        """A copy of the `where` kwargs"""
+        return deepcopy(self.__kwargs)
+
+    def where(self, **kwargs) -> MagellanQuery:
+        """Returns a query with kwargs added. `filtering_arguments` are merged into the current
+        ones instead of replacing them, a `limit` kwarg sets the limit
+
+        Returns:
+            MagellanQuery: the new query
+        """
+        limit = kwargs.pop("limit", self.__limit)
+        new_kwargs = self.kwargs
+        if "filtering_arguments" in kwargs:
+            filtering_arguments = new_kwargs.get("filtering_arguments", {})
+            filtering_arguments.update(kwargs.pop("filtering_arguments"))
+            new_kwargs["filtering_arguments"] = filtering_arguments
+        new_kwargs.update(kwargs)
+        return MagellanQuery(self.__model, self.__url_path, limit, new_kwargs)
+
+    def with_limit(self, limit: int) -> MagellanQuery:
+        """Returns the same query with a different limit
+
+        Args:
+            limit (int): max number of entities, None for every entity
+
+        Returns:
+            MagellanQuery: the new query
+        """
+        return MagellanQuery(self.__model, self.__url_path, limit, self.__kwargs)
+
+    def same_request(self, other: MagellanQuery) -> bool:
+        """Checks if other only differs from this query by its limit"""
+        return self.with_limit(None) == other.with_limit(None)
+
+    def fingerprint(self, ignored_kwargs: Iterable[str] = ()) -> str:
+        """Returns a sha256 hash of the route, limit and kwargs that is stable across processes
+        (unlike `hash`), to recognize a query in a saved checkpoint
+
+        Args:
+            ignored_kwargs (Iterable[str], optional): kwargs left out, ex: header args.
+                Defaults to ().
+
+        Returns:
+            str: the hex digest
+        """
+        kwargs = {
+            key: value for key, value in self.__kwargs.items() if key not in ignored_kwargs
+        }
+        serialized = json.dumps(
+            [self.__url_path, self.__limit, kwargs], sort_keys=True, default=repr
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MagellanQuery is immutable, use where() or with_limit()")
+
+    def __key(self) -> tuple:
+        return (self.__model, self.__url_path, self.__limit, self.__frozen)
+
+    def __eq__(self, other):
+        if not isinstance(other, MagellanQuery):
+            return NotImplemented
+        return self.__key() == other._MagellanQuery__key()  # pylint: disable=protected-access
+
+    def __hash__(self):
+        return hash(self.__key())
+
+    def __repr__(self):
+        model_name = getattr(self.__model, "__name__", self.__model)
+        return f"MagellanQuery({model_name}, limit={self.__limit}, kwargs={self.__kwargs})"
@@ -1,10 +1,22 @@
 """ MagellanResponse definition file """
 from __future__ import annotations
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Any, List, Iterable, Iterator, Callable, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_right
+import copy
+import csv
+import json
 import re
-import requests
+import time
+from magellan_models.deferred_import import deferred_import
 from magellan_models.config import MagellanConfig
 from magellan_models.exceptions import MagellanRuntimeException
+from magellan_models.interface.adaptive_page_size import AdaptivePageSize
+from magellan_models.interface.column_builder import ColumnBuilder
+from magellan_models.interface.local_collection import LocalCollection
+from magellan_models.interface.magellan_query import MagellanQuery
+
+requests = deferred_import("requests")
 
 if TYPE_CHECKING:
     # see handling cyclical dependencies:
@@ -17,6 +29,10 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
 
     This is returned when a user calls `where` or 'query' (See ConstantMagellanResponse for query)
 
+    Responses are lazy: nothing is requested until the results are needed
+    (iterating, indexing, `len`, `get_meta_data`...). Chaining `where`, `only`, `include`
+    and `limit` only updates the response's immutable `query`
+
     """
 
     def __init__(
@@ -29,8 +45,8 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
     ):
         """Initializer method for the MagellanResponse class
 
-        Creates a MagellanResponse object, assigns basic information to it
-        and evaluates the first page, adding results to the internal current_entities element
+        Creates a MagellanResponse object and assigns basic information to it,
+        the first page is only requested once results are needed
 
         Args:
             url_path (str): Base route for accessing a request
@@ -44,21 +60,82 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
             kwargs (dict): A dict of arguments,
                 passed to the config's `create_params` function and create_header function
         """
-        self.next_url = url_path
         self.__config__ = config
-        self.__limit__ = limit  # if the limit is None it is limitless
-        self.kwargs = kwargs
-        # Everything here should be private (in theory)
-        self.__iter_index__ = 0
-        self.__current_entities__ = []  # store a list of models
         self.__Model__ = Model  # pylint: disable=invalid-name
-        self.__meta_data__ = {}  # config sets this up on each page call
+        if "fields" in kwargs:
+            kwargs["fields"] = self.normalize_fields(kwargs["fields"])
+        # if the limit is None it is limitless
+        self.query = MagellanQuery(Model, url_path, limit, kwargs)
+        self.__window__ = None  # max number of pages kept in memory, None keeps every page
+        self.__window_refetch__ = True
+        # the attribute whose "in" filter values the results are ordered like, see ordered_by_filter
+        self.__filter_order__ = None
         self.__original_path__ = (
             url_path  # saved for when resetting due to chained where
         )
+        self.reset_results()
+
+    @property
+    def kwargs(self) -> dict:
+        """A copy of the query's kwargs, passed to the config's create_header and create_params"""
+        return self.query.kwargs
+
+    def reset_results(self) -> None:
+        """Forgets every result, the next access requests the query's first page again"""
+        self.next_url = self.__original_path__
+        # Everything here should be private (in theory)
+        self.__iter_index__ = 0
+        self.__current_entities__ = []  # store a list of models
+        # number of entities dropped from the front of current_entities by release_entities
+        self.__released_count__ = 0
+        # entities received beyond the limit, used first if the limit is raised
+        self.__overflow__ = []
+        self.__pages_requested__ = 0
+        self.__meta_data__ = {}  # config sets this up on each page call
+        self.__total_count__ = None  # the server's total, cached by count()
+        self.__cursor__ = None  # the next page's cursor in "cursor" and "keyset" pagination
+        self.__checkpoint__ = None  # the state at the last page boundary of iter_pages
+        self.__page_sizer__ = self.create_page_sizer()
+        self.__requested_page_size__ = None  # the adaptive size of the request being built
+        self.__offset_pages__ = {}  # page number => entities, requested by random access
+        # the position of the first entity of each page requested, and the page's request:
+        # every page with a refetching window, otherwise only the pages the window keeps
+        self.__page_starts__ = []
+        self.__page_requests__ = []
+        self.__refetched_page__ = None  # (page index, entities) of the last evicted page read
+        # the split of the query's large "in" filter, decided once by in_filter_chunks:
+        # None until then, False if the query is requested as is
+        self.__in_filter_split__ = None
+
+    def ensure_started(self) -> None:
+        """Requests the first page if nothing has been requested yet"""
+        if self.__pages_requested__ == 0 and not self.iteration_is_complete():
+            self.process_next_page_of_results()
+
+    def loaded_count(self) -> int:
+        """Returns the number of entities received so far, without requesting anything"""
+        return self.__released_count__ + len(self.__current_entities__)
 
-        # Process a page to start off the resposne lifecycle thingy
-        self.process_next_page_of_results()
+    def copy(self) -> MagellanResponse:
+        """Returns an independent response to the same query, holding the entities
+        and pagination state this one has so far: chaining `where`, `limit`... on it
+        or loading more pages leaves this response as it is
+
+        Returns:
+            MagellanResponse: the copy
+        """
+        # not copy.copy, which would go through __getattr__ before __dict__ is set
+        duplicate = object.__new__(type(self))
+        duplicate.__dict__.update(self.__dict__)
+        duplicate.__current_entities__ = list(self.__current_entities__)
+        duplicate.__overflow__ = list(self.__overflow__)
+        duplicate.__meta_data__ = dict(self.__meta_data__)
+        duplicate.__page_sizer__ = copy.copy(self.__page_sizer__)
+        duplicate.__offset_pages__ = dict(self.__offset_pages__)
+        duplicate.__page_starts__ = list(self.__page_starts__)
+        duplicate.__page_requests__ = list(self.__page_requests__)
+        duplicate.__checkpoint__ = None
+        return duplicate
 
     def iteration_is_complete(self) -> bool:
         """Checks if iteration through the API response pages is complete
@@ -67,7 +144,9 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
             bool: True if this MagellanResponse is done requesting data from the API,
                 False otherwise
         """
-        return len(self) == self.__limit__ or not self.next_url
+        return self.loaded_count() == self.query.limit or (
+            not self.next_url and not self.__overflow__
+        )
 
     def evaluate_fully(self) -> None:
         """
@@ -79,36 +158,847 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
         while not self.iteration_is_complete():
             self.process_next_page_of_results()
 
+    def iter_pages(
+        self, retain: bool = True, prefetch: bool = False
+    ) -> Iterator[List[AbstractApiModel]]:
+        """Yields the results one page at a time, requesting each page as the previous one
+        is consumed. The entities already loaded are yielded first as a single page
+
+        Args:
+            retain (bool, optional): Keep the yielded entities stored in this response.
+                With False every page is released once it has been yielded, keeping memory
+                constant no matter how many pages are iterated. Defaults to True.
+            prefetch (bool, optional): Request the next page in a background thread
+                while the current page is being consumed. Defaults to False.
+
+        Yields:
+            List[AbstractApiModel]: the instances of each page
+        """
+        page = self.__current_entities__[:]
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            while True:
+                if not retain:
+                    self.release_entities()
+                stored = self.loaded_count()
+                # taken before the next page is requested so checkpoint() skips no entity
+                self.__checkpoint__ = self.pagination_state()
+                pending = None
+                if executor and not self.iteration_is_complete():
+                    pending = executor.submit(self.process_next_page_of_results)
+                if page:
+                    yield page
+                if pending is None:
+                    if self.iteration_is_complete():
+                        return
+                    self.process_next_page_of_results()
+                else:
+                    pending.result()
+                # positions are absolute as a window may evict pages in the meantime
+                page = self.__current_entities__[max(stored - self.__released_count__, 0):]
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+            self.__checkpoint__ = None
+
+    def window(self, pages: Union[int, None], refetch: bool = True) -> MagellanResponse:
+        """Keeps at most `pages` pages of entities in memory, older pages are evicted
+        as new ones are requested (random access pages included)
+
+        Args:
+            pages (Union[int, None]): the number of pages to keep, None keeps every page
+            refetch (bool, optional): Request an evicted page again when one of its indexes
+                is accessed, instead of raising a MagellanRuntimeException. Defaults to True.
+
+        Raises:
+            MagellanRuntimeException: if pages is smaller than 1
+
+        Returns:
+            MagellanResponse: self
+        """
+        if pages is not None and pages < 1:
+            raise MagellanRuntimeException("A window has to keep at least one page")
+        self.__window__ = pages
+        self.__window_refetch__ = refetch
+        self.evict_pages()
+        self.forget_page_requests()
+        return self
+
+    def evict_pages(self) -> None:
+        """Releases the entities of the pages older than the window"""
+        window = self.__window__
+        if window is None:
+            return
+        while len(self.__offset_pages__) > window:
+            del self.__offset_pages__[next(iter(self.__offset_pages__))]
+        if len(self.__page_starts__) < window:
+            return
+        keep_from = min(self.__page_starts__[-window], self.loaded_count())
+        if keep_from > self.__released_count__:
+            del self.__current_entities__[: keep_from - self.__released_count__]
+            self.__released_count__ = keep_from
+
+    def forget_page_requests(self) -> None:
+        """Drops the start and request of the pages that can't be requested again,
+        keeping the ones of the pages a window keeps (which eviction needs)"""
+        if self.__window__ and self.__window_refetch__:
+            return
+        keep = self.__window__ or 1
+        if len(self.__page_starts__) > keep:
+            del self.__page_starts__[:-keep]
+            del self.__page_requests__[:-keep]
+            self.__refetched_page__ = None
+
+    def refetch_page(self, index: int) -> AbstractApiModel:
+        """Returns the entity at an evicted index, requesting its page again.
+        The last page requested this way is kept until another one is
+
+        Args:
+            index (int): a released index
+
+        Raises:
+            MagellanRuntimeException: if the page holding index can't be requested again
+                or doesn't have the entity anymore
+
+        Returns:
+            AbstractApiModel: the entity
+        """
+        number = bisect_right(self.__page_starts__, index) - 1
+        if number < 0:
+            raise MagellanRuntimeException(
+                f"Index {index} was released from this MagellanResponse"
+            )
+        if self.__refetched_page__ is None or self.__refetched_page__[0] != number:
+            (url, parameters) = self.__page_requests__[number]
+            (header, _) = self.__config__.create_header(**self.kwargs)
+            resp = self.get_request(url, parameters, header)
+            loaded_attributes = self.loaded_attributes()
+            entities = [
+                self.__Model__.from_json(payload, loaded_attributes)
+                for payload in self.__config__.get_list_from_resp(resp.json())
+            ]
+            self.__refetched_page__ = (number, entities)
+        entities = self.__refetched_page__[1]
+        offset = index - self.__page_starts__[number]
+        if offset >= len(entities):
+            raise MagellanRuntimeException(
+                f"Index {index} isn't returned by its page anymore"
+            )
+        return entities[offset]
+
+    def release_entities(self) -> None:
+        """Drops every entity currently stored in this response to free up memory.
+        Iteration continues from where it left off, but released indexes can't be accessed
+        """
+        self.__released_count__ += len(self.__current_entities__)
+        self.__current_entities__ = []
+
+    def column_builders(self, attributes: Iterable[str] = None) -> dict:
+        """Creates an empty ColumnBuilder for each attribute, typed via `list_attributes()`
+
+        Args:
+            attributes (Iterable[str], optional): attribute names.
+                Defaults to every attribute in `list_attributes()`.
+
+        Returns:
+            dict: attribute name => ColumnBuilder
+        """
+        attribute_types = self.__Model__.list_attributes()
+        if attributes is None:
+            attributes = attribute_types.keys()
+        return {
+            attribute: ColumnBuilder(attribute_types.get(attribute))
+            for attribute in attributes
+        }
+
+    def column_attributes(self, attributes: Iterable[str] = None) -> List[str]:
+        """Returns the attributes to build columns (or export) for
+
+        Args:
+            attributes (Iterable[str], optional): attribute names. Defaults to every attribute
+                in `list_attributes()` the results are loaded with (see `only`).
+
+        Returns:
+            List[str]: the attribute names
+        """
+        if attributes is not None:
+            return list(attributes)
+        loaded = self.loaded_attributes()
+        return [
+            attribute
+            for attribute in self.__Model__.list_attributes()
+            if loaded is None or attribute in loaded
+        ]
+
+    def unloaded_columns(self, attributes: Iterable[str]) -> List[str]:
+        """Returns the attributes the results' sparse fieldset leaves out,
+        which are read through the config's `unloaded_attribute_behavior`"""
+        loaded = self.loaded_attributes()
+        if loaded is None:
+            return []
+        return [attribute for attribute in attributes if attribute not in loaded]
+
+    @staticmethod
+    def load_columns(instance: AbstractApiModel, unloaded: List[str]) -> None:
+        """Applies the config's `unloaded_attribute_behavior` to the unloaded attributes
+        of an instance before its columns are read"""
+        for attribute in unloaded:
+            if not instance.attribute_is_loaded(attribute):
+                instance.handle_unloaded_attribute(attribute)
+
+    def column_chunks(
+        self,
+        attributes: Iterable[str],
+        chunk_size: Union[int, None],
+        per_page: bool,
+        use_numpy: bool,
+    ) -> Iterator[dict]:
+        """Streams the results into per-attribute columns, see `iter_columns`
+
+        Args:
+            attributes (Iterable[str]): the attributes to build columns for, None for the default
+            chunk_size (Union[int, None]): the max number of rows in each chunk
+            per_page (bool): end a chunk with each page of results. Without it or a chunk_size
+                every result goes in a single chunk, yielded even if there are no results
+            use_numpy (bool): Use numpy arrays for typed columns if numpy is installed
+
+        Yields:
+            dict: attribute name => column of values
+        """
+        attributes = self.column_attributes(attributes)
+        unloaded = self.unloaded_columns(attributes)
+        builders = self.column_builders(attributes)
+        rows = 0
+        for page in self.iter_pages():
+            for instance in page:
+                self.load_columns(instance, unloaded)
+                for attribute, builder in builders.items():
+                    builder.append(instance.get_instance_attribute(attribute))
+                rows += 1
+                if chunk_size and rows == chunk_size:
+                    yield {key: col.finish(use_numpy) for key, col in builders.items()}
+                    builders = self.column_builders(attributes)
+                    rows = 0
+            if per_page and not chunk_size and rows:
+                yield {key: col.finish(use_numpy) for key, col in builders.items()}
+                builders = self.column_builders(attributes)
+                rows = 0
+        if rows or not (per_page or chunk_size):
+            yield {key: col.finish(use_numpy) for key, col in builders.items()}
+
+    def iter_columns(
+        self,
+        attributes: Iterable[str] = None,
+        chunk_size: int = None,
+        use_numpy: bool = True,
+    ) -> Iterator[dict]:
+        """Streams the results into per-attribute columns, yielding a chunk of columns at a time
+
+        Column types come from the Model's `list_attributes()`:
+        int, float and bool attributes are stored in `array.array`s (or numpy arrays if numpy
+        is installed and use_numpy is True), every other attribute is stored in a list.
+        Attributes a sparse fieldset (`only`) left out are read through the config's
+        `unloaded_attribute_behavior`
+
+        Args:
+            attributes (Iterable[str], optional): the attributes to build columns for.
+                Defaults to every attribute in `list_attributes()` that was loaded.
+            chunk_size (int, optional): the max number of rows in each chunk yielded.
+                Defaults to None, yielding one chunk per page of results.
+            use_numpy (bool, optional): Use numpy arrays for typed columns if numpy is installed.
+                Defaults to True.
+
+        Yields:
+            dict: attribute name => column of values
+        """
+        return self.column_chunks(attributes, chunk_size, True, use_numpy)
+
+    def to_columns(self, attributes: Iterable[str] = None, use_numpy: bool = True) -> dict:
+        """Evaluates every page of results into per-attribute columns
+        See `iter_columns` for the column types used
+
+        Args:
+            attributes (Iterable[str], optional): the attributes to build columns for.
+                Defaults to every attribute in `list_attributes()` that was loaded.
+            use_numpy (bool, optional): Use numpy arrays for typed columns if numpy is installed.
+                Defaults to True.
+
+        Returns:
+            dict: attribute name => column of values
+        """
+        return next(self.column_chunks(attributes, None, False, use_numpy))
+
+    def export(  # pylint: disable=too-many-locals
+        self,
+        path: str,
+        format: str = "ndjson",  # pylint: disable=redefined-builtin
+        columns: Iterable[str] = None,
+        progress_callback: Callable[[dict], None] = None,
+        prefetch: bool = True,
+    ) -> dict:
+        """Streams every page of results into a file as the pages arrive.
+        Pages are released once written, so memory use stays constant regardless of
+        how many entities are exported
+
+        Args:
+            path (str): the file path to write to
+            format (str, optional): "ndjson" (one JSON object per line) or "csv".
+                Defaults to "ndjson".
+            columns (Iterable[str], optional): the attributes to export.
+                For ndjson this defaults to each instance's full representation,
+                for csv to every attribute in `list_attributes()` that was loaded
+            progress_callback (Callable[[dict], None], optional): called with the export stats
+                after every page is written. Defaults to None.
+            prefetch (bool, optional): request the next page while the current one is written.
+                Defaults to True.
+
+        Raises:
+            MagellanRuntimeException: if the format isn't supported
+
+        Returns:
+            dict: export stats: "rows", "pages", "bytes", "seconds" and "rows_per_second"
+        """
+        if format not in ("ndjson", "csv"):
+            raise MagellanRuntimeException(
+                f"Unsupported export format `{format}`, use 'ndjson' or 'csv'"
+            )
+        if format == "csv" or columns is not None:
+            columns = self.column_attributes(columns)
+        unloaded = self.unloaded_columns(columns or [])
+
+        stats = {"rows": 0, "pages": 0, "bytes": 0, "seconds": 0.0, "rows_per_second": 0.0}
+        start = time.perf_counter()
+        with open(path, "w", newline="", encoding="utf-8") as export_file:
+            csv_writer = None
+            if format == "csv":
+                csv_writer = csv.writer(export_file)
+                csv_writer.writerow(columns)
+            for page in self.iter_pages(retain=False, prefetch=prefetch):
+                for instance in page:
+                    self.load_columns(instance, unloaded)
+                    if csv_writer:
+                        csv_writer.writerow(
+                            [
+                                self.export_value(instance.get_instance_attribute(column))
+                                for column in columns
+                            ]
+                        )
+                    elif columns is None:
+                        export_file.write(json.dumps(instance.representation) + "\n")
+                    else:
+                        row = {
+                            column: instance.get_instance_attribute(column)
+                            for column in columns
+                        }
+                        export_file.write(json.dumps(row) + "\n")
+                stats["rows"] += len(page)
+                stats["pages"] += 1
+                stats["bytes"] = export_file.tell()
+                stats["seconds"] = time.perf_counter() - start
+                stats["rows_per_second"] = (
+                    stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+                )
+                if progress_callback:
+                    progress_callback(dict(stats))
+        return stats
+
+    @staticmethod
+    def export_value(value):
+        """Converts an attribute value into a CSV cell, lists and dicts are dumped as JSON
+
+        Args:
+            value (any): an attribute value
+
+        Returns:
+            any: the CSV cell value
+        """
+        if value is None:
+            return ""
+        if isinstance(value, (list, dict)):
+            return json.dumps(value)
+        return value
+
+    def to_local_collection(self, indexes: Iterable[str] = ()) -> LocalCollection:
+        """Evaluates every page of results and returns them as a LocalCollection
+        that can answer further `where` queries in process
+
+        Args:
+            indexes (Iterable[str], optional): attributes to build hash indexes on.
+                Defaults to ().
+
+        Raises:
+            MagellanRuntimeException: if entities were released while streaming
+
+        Returns:
+            LocalCollection: the fully loaded collection
+        """
+        if self.__released_count__:
+            raise MagellanRuntimeException(
+                "Can't build a local collection after entities were released"
+            )
+        self.evaluate_fully()
+        return LocalCollection(self.__Model__, self.__current_entities__, indexes)
+
     def process_next_page_of_results(self) -> List[AbstractApiModel]:
         """Calls the next_url route, parses entities,
         adds them to current_entities,
         sets the next_url route to hit (DOESN'T ACTUALLY REQUEST IT)
         and updates the meta_data
 
+        Entities kept from a previous page because they were over the limit are used
+        before requesting anything
+
         Returns:
             List[AbstractApiModel]: All AbstractApiModel instances generated.
                 if iteration is complete or something went wrong, this returns an empty list
         """
-        if not self.next_url or self.iteration_is_complete():
+        if self.iteration_is_complete():
             # Done iterating, next_url is None when we have no more results to get
             return []
-        
-        result_list = [] # store elements from iterate_through_response 
+        if self.__overflow__:
+            overflow, self.__overflow__ = self.__overflow__, []
+            return self.store_entities(overflow)
+        local_collection = self.local_collection()
+        if local_collection is not None:
+            return self.process_local_results(local_collection)
+        chunked = self.in_filter_chunks()
+        if chunked is not None:
+            return self.process_chunked_results(*chunked)
+
         (header, kwargs) = self.__config__.create_header(**self.kwargs)
-        if len(self) == 0:  # first call
-            parameters = self.__config__.create_params(self.__limit__, **kwargs)
-            route = self.next_url
-            resp = self.get_request(route, parameters, header)
-            result_list = self.iterate_through_response(resp)
-        else:
-            resp = self.get_request(url=self.next_url, headers=header)
-            result_list = self.iterate_through_response(resp)
+        (resp, requested, seconds) = self.request_page(header, kwargs)
+        self.__pages_requested__ += 1
+        result_list = self.iterate_through_response(resp)
+        self.evict_pages()
 
-        self.next_url = self.__config__.get_next_link_from_resp(resp)
+        self.advance_pagination(resp)
         self.__meta_data__ = self.__config__.get_meta_data_from_resp(resp)
+        if requested is not None:
+            self.__page_sizer__.observe(
+                requested,
+                len(result_list) + len(self.__overflow__),
+                seconds,
+                len(resp.content),
+                self.next_url is not None,
+            )
+            self.record_page_size_ceiling()
         return result_list
 
-    def iterate_through_response(self, resp: requests.Response) -> List[AbstractApiModel]:
+    def in_filter_chunks(self) -> Union[Tuple[str, List[list]], None]:
+        """Returns how the query's largest "in" filter is split, see split_in_filter.
+        The split is decided once per query (until the results are reset)
+
+        Returns:
+            Union[Tuple[str, List[list]], None]: the filtered attribute and the chunks,
+                or None if the query is requested as is
+        """
+        if self.__in_filter_split__ is None:
+            self.__in_filter_split__ = self.split_in_filter() or False
+        return self.__in_filter_split__ or None
+
+    def split_in_filter(self) -> Union[Tuple[str, List[list]], None]:
+        """Splits the values of the query's largest "in" filter into chunks
+        whose requests stay under the config's `max_url_bytes` (measured with the config's
+        `request_url_length`). Duplicate values are dropped
+
+        Returns:
+            Union[Tuple[str, List[list]], None]: the filtered attribute and the chunks,
+                or None if the query is requested as is: it has no "in" filter, fits
+                in a single request and its results aren't ordered by `ordered_by_filter`
+        """
+        config = self.__config__
+        if config.max_url_bytes is None and self.__filter_order__ is None:
+            return None
+        (_, kwargs) = config.create_header(**self.kwargs)
+        filtering_arguments = kwargs.get("filtering_arguments", {})
+        in_filters = {
+            attribute: list(dict.fromkeys(value))
+            for attribute, value in kwargs.items()
+            if filtering_arguments.get(attribute) == "in"
+            and isinstance(value, (list, tuple, set))
+        }
+        if not in_filters:
+            return None
+        attribute = max(in_filters, key=lambda name: len(in_filters[name]))
+        values = in_filters[attribute]
+
+        def fits(chunk: list) -> bool:
+            if config.max_url_bytes is None:
+                return True
+            parameters = config.create_params(self.query.limit, **{**kwargs, attribute: chunk})
+            return (
+                config.request_url_length(self.__original_path__, parameters)
+                <= config.max_url_bytes
+            )
+
+        if self.__filter_order__ is None and (len(values) <= 1 or fits(values)):
+            return None
+        chunks = []
+        start = 0
+        while start < len(values):
+            # the longest chunk from start that fits, a single value always makes a chunk
+            (low, high) = (start + 1, len(values))
+            while low < high:
+                middle = (low + high + 1) // 2
+                if fits(values[start:middle]):
+                    low = middle
+                else:
+                    high = middle - 1
+            chunks.append(values[start:low])
+            start = low
+        return attribute, chunks
+
+    def process_chunked_results(self, attribute: str, chunks: List[list]) -> List[AbstractApiModel]:
+        """Requests every page of each chunk of a split "in" filter, up to the config's
+        `in_filter_workers` chunks at the same time, and stores the merged results
+        as this response's only page. This is eager: nothing is returned before every chunk
+        is loaded, each chunk stops once it reaches the query's limit
+
+        Args:
+            attribute (str): the filtered attribute
+            chunks (List[list]): the chunks of the filter's values
+
+        Returns:
+            List[AbstractApiModel]: the entities stored
+        """
+        responses = [
+            MagellanResponse(
+                self.__original_path__,
+                self.__Model__,
+                self.__config__,
+                self.query.limit,
+                **{**self.kwargs, attribute: chunk}
+            )
+            for chunk in chunks
+        ]
+        workers = max(min(self.__config__.in_filter_workers, len(responses)), 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(MagellanResponse.evaluate_fully, responses))
+        self.__pages_requested__ += 1
+        self.__meta_data__ = responses[0].__meta_data__ if responses else {}
+        self.next_url = None
+        self.__cursor__ = None
+        return self.store_entities(
+            self.merge_chunked_results(
+                [response.__current_entities__ for response in responses]
+            )
+        )
+
+    def merge_chunked_results(
+        self, pages: List[List[AbstractApiModel]]
+    ) -> List[AbstractApiModel]:
+        """Merges the results of the chunks of a split "in" filter: an entity returned by
+        several chunks is kept once, and with `ordered_by_filter` the entities are sorted
+        like the filter's values (entities matching none of them go last)
+
+        Args:
+            pages (List[List[AbstractApiModel]]): the results of each chunk
+
+        Returns:
+            List[AbstractApiModel]: the merged results
+        """
+        merged = []
+        seen = set()
+        for page in pages:
+            for entity in page:
+                entity_id = entity.id
+                if entity_id is not None:
+                    if entity_id in seen:
+                        continue
+                    seen.add(entity_id)
+                merged.append(entity)
+        attribute = self.__filter_order__
+        values = self.kwargs.get(attribute) if attribute is not None else None
+        if isinstance(values, (list, tuple)):
+            positions = {}
+            for position, value in enumerate(values):
+                positions.setdefault(value, position)
+            merged.sort(
+                key=lambda entity: positions.get(
+                    entity.get_instance_attribute(attribute), len(positions)
+                )
+            )
+        return merged
+
+    def ordered_by_filter(self, attribute: str = "id") -> MagellanResponse:
+        """Orders the results like the values of the query's "in" filter on attribute,
+        requesting every result (in chunks if the filter is large) when they're first needed
+
+        Args:
+            attribute (str, optional): the filtered attribute. Defaults to "id".
+
+        Raises:
+            MagellanRuntimeException: if the query has no "in" filter on attribute
+
+        Returns:
+            MagellanResponse: self
+        """
+        kwargs = self.kwargs
+        if kwargs.get("filtering_arguments", {}).get(attribute) != "in" or not isinstance(
+            kwargs.get(attribute), (list, tuple)
+        ):
+            raise MagellanRuntimeException(
+                f"The query has no \"in\" filter on {attribute} to order the results by"
+            )
+        if self.__filter_order__ != attribute:
+            self.__filter_order__ = attribute
+            self.reset_results()
+        return self
+
+    def local_collection(self) -> Union[LocalCollection, None]:
+        """Returns the LocalCollection registered on the Model (see
+        `AbstractApiModel.use_local_collection`) if it can answer the query, None otherwise"""
+        collection = self.__Model__.__local_collection__
+        if collection is None:
+            return None
+        (_, kwargs) = self.__config__.create_header(**self.kwargs)
+        return collection if collection.can_answer(kwargs) else None
+
+    def process_local_results(self, collection: LocalCollection) -> List[AbstractApiModel]:
+        """Stores the results of the query evaluated by a LocalCollection
+        as this response's only page, no request is made
+
+        Args:
+            collection (LocalCollection): a collection that can answer the query
+
+        Returns:
+            List[AbstractApiModel]: the entities stored
+        """
+        (_, kwargs) = self.__config__.create_header(**self.kwargs)
+        entities = list(collection.where(limit=self.query.limit, **kwargs))
+        self.__pages_requested__ += 1
+        self.__meta_data__ = {}
+        self.next_url = None
+        self.__cursor__ = None
+        if self.__filter_order__ is not None:
+            entities = self.merge_chunked_results([entities])
+        return self.store_entities(entities)
+
+    def is_loaded_in_one_step(self) -> bool:
+        """Checks if the first step loads every result: the query is answered by a
+        LocalCollection, or split into chunks (or ordered by its "in" filter)"""
+        return self.local_collection() is not None or self.in_filter_chunks() is not None
+
+    def load_results_in_one_step(self) -> None:
+        """Loads every result of a query answered locally or split into chunks, whose probes
+        would make a request the query doesn't (or one with the URL the split avoids).
+        Used before counting or probing"""
+        if self.__pages_requested__ == 0 and self.is_loaded_in_one_step():
+            self.ensure_started()
+
+    def request_page(self, header: dict, kwargs: dict) -> Tuple["requests.Response", int, float]:
+        """Requests the next page. With adaptive page sizing, a page size the server rejects
+        is halved and requested again
+
+        Args:
+            header (dict): the request header
+            kwargs (dict): the query's kwargs, once the header args are removed
+
+        Returns:
+            Tuple[requests.Response, int, float]: the response, the adaptive page size requested
+                (None if the size wasn't chosen by the adaptive page sizing)
+                and the time the request took
+        """
+        while True:
+            (url, parameters) = self.next_page_request(kwargs)
+            (requested, self.__requested_page_size__) = (self.__requested_page_size__, None)
+            started = time.perf_counter()
+            try:
+                resp = self.get_request(url, parameters, header)
+            except MagellanRuntimeException as error:
+                details = error.args[0] if error.args else {}
+                status_code = details.get("error_code") if isinstance(details, dict) else None
+                if requested is None or not self.__page_sizer__.reject(requested, status_code):
+                    raise
+                self.record_page_size_ceiling()
+                continue
+            self.__page_starts__.append(self.loaded_count())
+            self.__page_requests__.append((url, parameters))
+            self.forget_page_requests()
+            return resp, requested, time.perf_counter() - started
+
+    def create_page_sizer(self) -> Union[AdaptivePageSize, None]:
+        """Creates the AdaptivePageSize of this response if the config's `adaptive_page_size`
+        is set, starting from the page size ceiling previously learned for its route
+
+        With "links" pagination the next links are followed as the server built them,
+        so only the first page's size could be chosen: the server's page size is kept instead
+        """
+        config = self.__config__
+        if not config.adaptive_page_size or config.pagination_mode == "links":
+            return None
+        (minimum, maximum) = config.page_size_bounds
+        return AdaptivePageSize(
+            minimum,
+            maximum,
+            config.target_page_seconds,
+            config.max_page_bytes,
+            config.page_size_ceilings.get(self.__original_path__),
+        )
+
+    def record_page_size_ceiling(self) -> None:
+        """Shares the page size ceiling learned from the server with later responses"""
+        if self.__page_sizer__.ceiling is not None:
+            self.__config__.page_size_ceilings[self.__original_path__] = (
+                self.__page_sizer__.ceiling
+            )
+
+    def page_size(self) -> Union[int, None]:
+        """Returns the page size of the next request built from params: the limit,
+        or with adaptive page sizing the current adaptive size (capped by what's left
+        to reach the limit)"""
+        limit = self.query.limit
+        if self.__page_sizer__ is None:
+            return limit
+        size = self.__page_sizer__.size
+        if limit is not None:
+            size = max(min(size, limit - self.loaded_count()), 1)
+        self.__requested_page_size__ = size
+        return size
+
+    def next_page_request(self, kwargs: dict) -> Tuple[str, dict]:
+        """Returns the url and params of the next page's request,
+        depending on the config's `pagination_mode`
+
+        Args:
+            kwargs (dict): the query's kwargs, once the header args are removed
+
+        Returns:
+            Tuple[str, dict]: the url and the params
+        """
+        mode = self.__config__.pagination_mode
+        if mode == "links" and self.__pages_requested__:
+            # the following pages use next_url as is
+            return self.next_url, {}
+        if mode == "keyset":
+            kwargs = self.keyset_kwargs(kwargs)
+        parameters = self.create_first_page_params(kwargs)
+        if mode == "cursor" and self.__cursor__ is not None:
+            parameters = {
+                **parameters,
+                **self.__config__.create_cursor_params(self.__cursor__),
+            }
+        if mode == "keyset" and self.__cursor__ is not None:
+            parameters = self.__config__.create_keyset_params(
+                parameters, self.__cursor__, self.keyset_sort()
+            )
+        return self.__original_path__, parameters
+
+    def advance_pagination(self, resp: "requests.Response") -> None:
+        """Reads where the next page is from resp, next_url is None once there isn't any
+
+        Args:
+            resp (requests.Response): the response of the last page
+
+        Raises:
+            MagellanRuntimeException: if the config's `pagination_mode` isn't supported
+        """
+        mode = self.__config__.pagination_mode
+        if mode == "links":
+            self.next_url = self.__config__.get_next_link_from_resp(resp)
+            return
+        if mode == "cursor":
+            self.__cursor__ = self.__config__.get_cursor_from_resp(resp)
+        elif mode == "keyset":
+            self.__cursor__ = self.__config__.get_keyset_cursor_from_resp(
+                resp, self.keyset_sort()
+            )
+        else:
+            raise MagellanRuntimeException(f"Unsupported pagination_mode: {mode}")
+        self.next_url = self.__original_path__ if self.__cursor__ is not None else None
+
+    def keyset_sort(self) -> List[Tuple[str, bool]]:
+        """Returns the attributes keyset pagination sorts by and whether each is descending:
+        the query's sort keys followed by the config's unique `keyset_sort_key`
+        (unless the query already sorts by it), which breaks ties between records
+        sharing the other keys' values
+
+        Returns:
+            List[Tuple[str, bool]]: the (attribute, descending) pairs
+        """
+        sort = self.kwargs.get("sort") or []
+        if isinstance(sort, str):
+            sort = sort.split(",")
+        keys = [key.strip() for key in sort if key.strip()]
+        sort_keys = [(key.lstrip("-"), key.startswith("-")) for key in keys]
+        tiebreaker = self.__config__.keyset_sort_key
+        if tiebreaker not in [name for (name, _) in sort_keys]:
+            # same direction as the first key, so "-name" pages as "-name,-id"
+            sort_keys.append((tiebreaker, bool(sort_keys) and sort_keys[0][1]))
+        return sort_keys
+
+    def keyset_kwargs(self, kwargs: dict) -> dict:
+        """Sets the sort keyset pagination requests pages with
+
+        Args:
+            kwargs (dict): the query's kwargs, once the header args are removed
+
+        Returns:
+            dict: the kwargs of the next page
+        """
+        sort = [f"-{name}" if descending else name for (name, descending) in self.keyset_sort()]
+        return {**kwargs, "sort": sort}
+
+    def checkpoint(self) -> dict:
+        """Returns where this response is in its pagination, as a JSON serializable dict
+        that `resume` takes to continue from there, in this process or another one
+
+        Inside `iter_pages` this is the state after the last page yielded,
+        even if the next page was already prefetched
+
+        Returns:
+            dict: the checkpoint
+        """
+        if self.__checkpoint__ is not None:
+            return dict(self.__checkpoint__)
+        return self.pagination_state()
+
+    def pagination_state(self) -> dict:
+        """Returns the current checkpoint, see `checkpoint`"""
+        return {
+            "query": self.query.fingerprint((self.__config__.header_args_separator,)),
+            "next_url": self.next_url,
+            "cursor": self.__cursor__,
+            "position": self.loaded_count(),
+            "pages_requested": self.__pages_requested__,
+        }
+
+    def resume(self, checkpoint: dict) -> MagellanResponse:
+        """Continues from a checkpoint taken on a response to the same query
+        (header args may differ). The entities before the checkpoint are treated as released
+
+        Args:
+            checkpoint (dict): a dict returned by `checkpoint`
+
+        Raises:
+            MagellanRuntimeException: if the checkpoint was taken for a different query
+
+        Returns:
+            MagellanResponse: self
+        """
+        if checkpoint.get("query") != self.query.fingerprint(
+            (self.__config__.header_args_separator,)
+        ):
+            raise MagellanRuntimeException("The checkpoint was taken for a different query")
+        self.reset_results()
+        self.next_url = checkpoint["next_url"]
+        self.__cursor__ = checkpoint["cursor"]
+        self.__released_count__ = checkpoint["position"]
+        self.__pages_requested__ = checkpoint["pages_requested"]
+        return self
+
+    def create_first_page_params(self, kwargs: dict) -> dict:
+        """Creates the params of the first page's request, the following pages use next_url as is
+
+        Args:
+            kwargs (dict): the query's kwargs, once the header args are removed
+
+        Returns:
+            dict: the request params
+        """
+        return self.__config__.create_params(self.page_size(), **kwargs)
+
+    def iterate_through_response(self, resp: "requests.Response") -> List[AbstractApiModel]:
         """Iterates through a Requests Response element, appending values to current_entities
 
         Args:
@@ -116,19 +1006,67 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
         Returns:
             resp_list List[AbstractApiModel]: the AbstractApiModels created and stored in this invocation
         """
-        elems = []
-        for payload in self.__config__.get_list_from_resp(resp.json()):
-            if (
-                self.__limit__ is None
-                or len(self.__current_entities__) < self.__limit__
-            ):
-                new_inst = self.__Model__.from_json(payload)
-                self.__current_entities__.append(new_inst)
-                elems.append(new_inst)
-            else:
-                # Hit the limit!
-                break
-        return elems
+        loaded_attributes = self.loaded_attributes()
+        return self.store_entities(
+            [
+                self.__Model__.from_json(payload, loaded_attributes)
+                for payload in self.__config__.get_list_from_resp(resp.json())
+            ]
+        )
+
+    def store_entities(self, entities: List[AbstractApiModel]) -> List[AbstractApiModel]:
+        """Appends entities to current_entities up to the limit,
+        keeping the rest in case the limit is raised
+
+        Args:
+            entities (List[AbstractApiModel]): the entities of a page
+
+        Returns:
+            List[AbstractApiModel]: the entities stored
+        """
+        limit = self.query.limit
+        room = len(entities) if limit is None else max(limit - self.loaded_count(), 0)
+        stored = entities[:room]
+        self.__current_entities__.extend(stored)
+        # Hit the limit!
+        self.__overflow__ = entities[room:] + self.__overflow__
+        return stored
+
+    def normalize_fields(self, fields) -> dict:
+        """Converts the `fields` kwarg into a mapping of resource type => field names
+
+        A list (or any other iterable) of names is assumed to be for this response's Model,
+        a dict is assumed to already be keyed by resource type
+
+        Args:
+            fields (Union[dict, Iterable[str]]): the fields passed to `where` or `only`
+
+        Returns:
+            dict: resource type => list of field names
+        """
+        if isinstance(fields, dict):
+            return {
+                resource_type: list(field_names)
+                for resource_type, field_names in fields.items()
+            }
+        resource_type = self.__config__.resource_name_to_type(
+            self.__Model__.resource_name()
+        )
+        return {resource_type: list(fields)}
+
+    def loaded_attributes(self):
+        """Returns the sparse fieldset requested for this response's Model
+
+        Returns:
+            Union[list, None]: the field names requested, or None if every field is requested
+        """
+        fields = self.kwargs.get("fields")
+        if not fields:
+            return None
+        resource_type = self.__config__.resource_name_to_type(
+            self.__Model__.resource_name()
+        )
+        return fields.get(resource_type)
 
     def get_request(
         self, url: str, params={}, headers={}
@@ -155,37 +1093,130 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
         return resp
 
     def __len__(self):
-        """Return the lenght of the MagellanResponse
+        """Return the lenght of the MagellanResponse, requesting the first page if needed
         This value is NOT the final length untless completed_iteration == True
 
         Returns:
             int: the number of elements currently stored in the MagellanResponse
         """
-        return len(self.__current_entities__)
+        self.ensure_started()
+        return self.loaded_count()
 
     def __getitem__(self, index):
-        """A getter function to get an item at an index
+        """A getter function to get an item at an index, or a list of items for a slice
+
+        Negative indexes count from the end, using `count()` to find it.
+        If the config's `random_access_page_size` is set, an index past the loaded entities is
+        read from the page holding it (requested with `create_offset_params`) and the pages
+        in between stay unloaded, otherwise the pages are requested in order until it's reached
 
         Args:
-            index (int): an index
+            index (Union[int, slice]): an index or a slice
 
         Raises:
             IndexError: The item was not found because the MagellanResponse doesn't reach that index
 
         Returns:
-            [AbstractApiModel]: The Magellan object at that index
+            [AbstractApiModel]: The Magellan object at that index (a list of them for a slice)
         """
-        try:
-            return self.__current_entities__[index]
-        except IndexError as ind_err:
-            # we don't have that entity but it MIGHT exist in a later page.
-            # We need to iterate through to find it
-            if self.iteration_is_complete():
-                raise IndexError from ind_err
+        if isinstance(index, slice):
+            return self.get_slice(index)
+        if index < 0:
+            index += self.count()
+            if index < 0:
+                raise IndexError("MagellanResponse index out of range")
+        if self.query.limit is not None and index >= self.query.limit:
+            raise IndexError("MagellanResponse index out of range")
+        if self.__released_count__ <= index < self.loaded_count():
+            return self.__current_entities__[index - self.__released_count__]
+        if index < self.__released_count__ and self.__window__ and self.__window_refetch__:
+            return self.refetch_page(index)
+        # a query answered locally or split into chunks is loaded at once
+        if self.__config__.random_access_page_size and not self.is_loaded_in_one_step():
+            return self.get_from_offset_page(index)
+        if index < self.__released_count__:
+            raise MagellanRuntimeException(
+                f"Index {index} was released from this MagellanResponse"
+            )
+        # we don't have that entity but it MIGHT exist in a later page.
+        # We need to iterate through to find it
+        self.ensure_started()
+        while self.loaded_count() <= index and not self.iteration_is_complete():
+            self.process_next_page_of_results()
+        if index >= self.loaded_count():
+            raise IndexError("MagellanResponse index out of range")
+        return self.__current_entities__[index - self.__released_count__]
+
+    def get_slice(self, index: slice) -> List[AbstractApiModel]:
+        """Returns the entities of a slice, only requesting `count()` if the slice
+        is relative to the end
+
+        Args:
+            index (slice): the slice
+
+        Returns:
+            List[AbstractApiModel]: the entities
+        """
+        (start, stop, step) = (index.start or 0, index.stop, index.step or 1)
+        if stop is None or start < 0 or stop < 0 or step < 0:
+            total = self.count()
+        else:
+            total = stop if self.query.limit is None else min(stop, self.query.limit)
+        entities = []
+        for position in range(*index.indices(total)):
+            try:
+                entities.append(self[position])
+            except IndexError:
+                break
+        return entities
+
+    def get_from_offset_page(self, index: int) -> AbstractApiModel:
+        """Returns the entity at index from the offset page holding it,
+        requesting that page if it wasn't yet. Offset pages aren't part of the results
+        iteration goes through
+
+        Args:
+            index (int): a non negative index
+
+        Raises:
+            IndexError: if the page doesn't reach index
+
+        Returns:
+            AbstractApiModel: the entity
+        """
+        page_size = self.__config__.random_access_page_size
+        number = index // page_size
+        page = self.__offset_pages__.get(number)
+        if page is None:
+            (header, kwargs) = self.__config__.create_header(**self.kwargs)
+            parameters = self.create_offset_page_params(kwargs, number * page_size, page_size)
+            resp = self.get_request(self.__original_path__, parameters, header)
+            loaded_attributes = self.loaded_attributes()
+            page = [
+                self.__Model__.from_json(payload, loaded_attributes)
+                for payload in self.__config__.get_list_from_resp(resp.json())
+            ]
+            self.__offset_pages__[number] = page
+            self.evict_pages()
+        if index - number * page_size >= len(page):
+            raise IndexError("MagellanResponse index out of range")
+        return page[index - number * page_size]
+
+    def create_offset_page_params(self, kwargs: dict, offset: int, page_size: int) -> dict:
+        """Creates the params of the page starting at offset
 
-            while len(self) < index + 1 and not self.iteration_is_complete():
-                self.process_next_page_of_results()
-            return self.__getitem__(index)
+        Args:
+            kwargs (dict): the query's kwargs, once the header args are removed
+            offset (int): the index of the page's first entity
+            page_size (int): the number of entities per page
+
+        Returns:
+            dict: the request params
+        """
+        return {
+            **self.__config__.create_params(None, **kwargs),
+            **self.__config__.create_offset_params(offset, page_size),
+        }
 
     def __setitem__(self, index, item):
         """If for some reason you want to set the value of an item at an index...
@@ -195,7 +1226,10 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
             item ([AbstractApiModel]): the value you want to set at that index
         """
         # https://stackoverflow.com/questions/43627405/understanding-getitem-method
-        self.__current_entities__[index] = item
+        self.ensure_started()
+        self.__current_entities__[
+            index - self.__released_count__ if index >= 0 else index
+        ] = item
 
     def __iter__(self):
         """A custom iter function that returns self
@@ -203,7 +1237,10 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
         Returns:
             MagellanResponse: A MagellanResponse instance (itself)
         """
-        self.__iter_index__ = 0
+        # released entities can't be iterated again, iteration starts after them
+        # unless a window requests evicted pages again
+        refetch = self.__window__ and self.__window_refetch__
+        self.__iter_index__ = 0 if refetch else self.__released_count__
         return self
 
     def __next__(self) -> AbstractApiModel:
@@ -212,7 +1249,11 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
         Returns:
             AbstractApiModel: [description]
         """
-        if self.iteration_is_complete() and self.__iter_index__ >= len(self):
+        self.ensure_started()
+        while self.__iter_index__ >= self.loaded_count() and not self.iteration_is_complete():
+            # pages can be empty, ex: the last page of keyset pagination
+            self.process_next_page_of_results()
+        if self.__iter_index__ >= self.loaded_count():
             # No more pages to get and the iteration has reached the end
             raise StopIteration
 
@@ -282,53 +1323,222 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
         Returns:
             [dict]: the meta data from the last API call
         """
+        self.ensure_started()
         return self.__meta_data__
 
+    def count(self) -> int:
+        """Returns the number of results this response yields (at most its limit)
+        without loading every page
+
+        A fully loaded response is counted locally. Otherwise the total is read from the meta
+        of the first page if it was already requested, or of a single-entity page requested
+        for the occasion, using the config's `get_total_count_from_meta`.
+        If the server doesn't send a total, the results are streamed (only their ids if the
+        config's `probe_with_sparse_fields` is set) and counted without being stored
+
+        Returns:
+            int: the number of results
+        """
+        self.load_results_in_one_step()
+        if self.__pages_requested__ and self.iteration_is_complete():
+            return self.loaded_count()
+        if self.__total_count__ is None:
+            if self.__pages_requested__:
+                meta_data = self.__meta_data__
+            else:
+                meta_data = self.__config__.get_meta_data_from_resp(self.probe(1, sparse=True))
+            self.__total_count__ = self.__config__.get_total_count_from_meta(meta_data)
+        if self.__total_count__ is None:
+            return sum(
+                len(page) for page in self.create_count_response().iter_pages(retain=False)
+            )
+        if self.query.limit is None:
+            return self.__total_count__
+        return min(self.__total_count__, self.query.limit)
+
+    def first(self) -> Union[AbstractApiModel, None]:
+        """Returns the first result, or None if there isn't any
+
+        Uses the loaded results if there are any, otherwise requests a single-entity page
+        that isn't stored in this response (iterating it still starts from its first page)
+
+        Returns:
+            Union[AbstractApiModel, None]: the first result
+        """
+        self.load_results_in_one_step()
+        if self.__current_entities__ and not self.__released_count__:
+            return self.__current_entities__[0]
+        entities = self.probe_entities(1)
+        return entities[0] if entities else None
+
+    def exists(self) -> bool:
+        """Checks if the query has any result, requesting at most a single id
+
+        Returns:
+            bool: True if there's at least one result
+        """
+        self.load_results_in_one_step()
+        if self.loaded_count():
+            return True
+        if self.known_to_be_empty():
+            return False
+        return bool(self.__config__.get_list_from_resp(self.probe(1, sparse=True).json()))
+
+    def one(self) -> AbstractApiModel:
+        """Returns the only result of the query, requesting a page of at most two entities
+
+        Raises:
+            MagellanRuntimeException: if the query has no result, or more than one
+
+        Returns:
+            AbstractApiModel: the result
+        """
+        self.load_results_in_one_step()
+        complete = self.__pages_requested__ and self.iteration_is_complete()
+        if complete and not self.__released_count__:
+            entities = self.__current_entities__
+            found = len(entities)
+        else:
+            entities = self.probe_entities(2)
+            found = len(entities)
+        if found != 1:
+            raise MagellanRuntimeException(
+                f"Expected exactly one {self.__Model__.__name__}, found {found}"
+            )
+        return entities[0]
+
+    def known_to_be_empty(self) -> bool:
+        """Checks if every page was requested without any result, or the limit is 0"""
+        if self.query.limit == 0:
+            return True
+        return bool(self.__pages_requested__) and self.iteration_is_complete() and (
+            not self.loaded_count()
+        )
+
+    def probe(self, page_size: int, sparse: bool = False) -> "requests.Response":
+        """Requests a small first page of the query, outside of this response's pagination.
+        Used by count(), first(), exists() and one() so they never load further pages
+
+        Args:
+            page_size (int): the number of entities to request
+            sparse (bool, optional): only request ids and no includes (see `probe_kwargs`).
+                Defaults to False.
+
+        Returns:
+            requests.Response: the response
+        """
+        (header, kwargs) = self.__config__.create_header(**self.kwargs)
+        if sparse:
+            kwargs = self.probe_kwargs(kwargs)
+        return self.get_request(
+            self.__original_path__, self.create_probe_params(page_size, kwargs), header
+        )
+
+    def probe_entities(self, page_size: int) -> List[AbstractApiModel]:
+        """Returns the entities of a probe page, see `probe`
+
+        Args:
+            page_size (int): the number of entities to request, capped by the limit
+
+        Returns:
+            List[AbstractApiModel]: the entities, they aren't stored in this response
+        """
+        if self.known_to_be_empty():
+            return []
+        if self.query.limit is not None:
+            page_size = min(page_size, self.query.limit)
+        resp = self.probe(page_size)
+        loaded_attributes = self.loaded_attributes()
+        return [
+            self.__Model__.from_json(payload, loaded_attributes)
+            for payload in self.__config__.get_list_from_resp(resp.json())
+        ][:page_size]
+
+    def probe_kwargs(self, kwargs: dict) -> dict:
+        """Returns kwargs restricted to what counting or checking existence needs:
+        no includes, and only ids if the config's `probe_with_sparse_fields` is set"""
+        kwargs = dict(kwargs)
+        kwargs.pop("include", None)
+        if self.__config__.probe_with_sparse_fields:
+            kwargs["fields"] = self.normalize_fields(["id"])
+        return kwargs
+
+    def create_probe_params(self, page_size: int, kwargs: dict) -> dict:
+        """Creates the params of a probe request: the query's first page with page_size entities
+
+        Args:
+            page_size (int): the number of entities to request
+            kwargs (dict): the query's kwargs, once the header args are removed
+
+        Returns:
+            dict: the request params
+        """
+        return self.__config__.create_params(page_size, **kwargs)
+
+    def create_count_response(self) -> MagellanResponse:
+        """Creates the response count() streams when the server doesn't send a total"""
+        return MagellanResponse(
+            self.__original_path__,
+            self.__Model__,
+            self.__config__,
+            self.query.limit,
+            **self.probe_kwargs(self.kwargs)
+        )
+
     def where(self, **kwargs) -> MagellanResponse:
         """Chain multiple Where clauses with this helper function
 
-        This call IS DESTRUCTIVE and resets the internal store of Magellan Models
-        stored in the MagellanResponse
-        this prevents pollution inside the internal data structures
+        Nothing is requested until the results are needed, so chaining several calls
+        costs a single request. Changing anything but the limit resets the internal store
+        of Magellan Models stored in the MagellanResponse
+        this prevents pollution inside the internal data structures.
+        `filtering_arguments` are merged into the current ones instead of replacing them
 
-        if you want to just update the limit, just call limit() instead
-        which truncates elements instead of resetting everything
+        A `limit` kwarg on its own works like `limit()`
 
         Returns:
             MagellanResponse: returns self with modified kwargs and/or limit
         """
+        if "fields" in kwargs.keys():
+            kwargs["fields"] = self.normalize_fields(kwargs["fields"])
+        new_query = self.query.where(**kwargs)
+        if new_query.same_request(self.query):
+            return self.limit(new_query.limit)
+        self.query = new_query
+        self.reset_results()
+        return self
 
-        # Check if filtering_arguments are provided
-        # update them first to prevent overwriting
-        if "limit" in kwargs.keys():
-            self.__limit__ = kwargs.pop("limit", None)
+    def only(self, *attributes) -> MagellanResponse:
+        """Restricts the attributes requested for each entity to a sparse fieldset
 
-        if "filtering_arguments" in kwargs.keys():
-            # update the filtering_arguments to augment them instead of replacement
-            new_filtering_args = kwargs.pop("filtering_arguments")
-            original_filtering_args = self.kwargs.get("filtering_arguments", {})
-            original_filtering_args.update(new_filtering_args)
-            self.kwargs["filtering_arguments"] = original_filtering_args
+        Instances created by this response know which attributes were loaded,
+        reading any other attribute is handled by the config's `unloaded_attribute_behavior`
 
-        self.kwargs.update(kwargs)
+        Like `where`, this call resets the internal store of Magellan Models
 
-        # We've updated our internal kwargs, this means we need to reset our state
-        self.__iter_index__ = 0
-        self.__current_entities__ = []
-        self.next_url = self.__original_path__
+        Returns:
+            MagellanResponse: returns self with the sparse fieldset applied
+        """
+        return self.where(fields=list(attributes))
 
-        # time to get new results and return self
-        self.process_next_page_of_results()
-        return self
+    def include(self, *relationships) -> MagellanResponse:
+        """Asks the API to include related resources (JSON:API `include`) in the responses
+
+        Like `where`, this call resets the internal store of Magellan Models
+
+        Returns:
+            MagellanResponse: returns self with the includes applied
+        """
+        return self.where(include=list(relationships))
 
     def limit(self, new_limit) -> MagellanResponse:
         """Modifies this request's internal limit value
 
         This call will truncate the internal representation
-        if the new limit is smaller than the previous one
-
-        If the new limit is larger than the previous one, this call is destructive
-        (otherwise it'll potentially get stuck thinking it's done iterating when it's not)
+        if the new limit is smaller than the previous one.
+        If it's larger, iteration continues from where it stopped (the entities received beyond
+        the previous limit, then next_url) instead of requesting everything again.
+        Entities released by `iter_pages(retain=False)` can't be brought back by a larger limit
 
         Args:
             new_limit (int): The new limit to set for this MagellanResponse
@@ -336,15 +1546,14 @@ class MagellanResponse:  # pylint: disable=too-many-instance-attributes
         Returns:
             MagellanResponse: The original MagellanResponse post modifications
         """
-
-        self.__limit__ = new_limit
-        if self.__limit__ < len(self):
-            # truncate current_entities
-            self.__current_entities__ = self.__current_entities__[0 : self.__limit__]
-        else:
-            # new limit is larger than the original, destructive op
-            self.__iter_index__ = 0
-            self.__current_entities__ = []
-            self.next_url = self.__original_path__
-            self.process_next_page_of_results()
+        self.query = self.query.with_limit(new_limit)
+        if self.__pages_requested__ == 0:
+            # the limit is part of the measured URLs
+            self.__in_filter_split__ = None
+        if new_limit is not None and new_limit < self.loaded_count():
+            # truncate current_entities, keeping the extra entities for a later larger limit
+            kept = max(new_limit - self.__released_count__, 0)
+            self.__overflow__ = self.__current_entities__[kept:] + self.__overflow__
+            self.__current_entities__ = self.__current_entities__[0:kept]
+            self.__released_count__ = min(self.__released_count__, new_limit)
         return self
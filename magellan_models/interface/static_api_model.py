@@ -0,0 +1,171 @@
+""" StaticApiModel class definition file """
+# pylint: disable=dangerous-default-value
+import re
+from typing import Any, Dict, List
+from magellan_models.config import MagellanConfig
+from magellan_models.exceptions import MagellanRuntimeException
+from magellan_models.interface.abstract_api_model import AbstractApiModel
+from magellan_models.interface.attribute_access import (
+    MODEL_SLOTS,
+    compile_accessors,
+    relationship_template,
+    representation_property,
+)
+from magellan_models.model_generator.generate_nonrest_functions import (
+    generate_func_for_route,
+)
+
+
+def disabled_function(*args, **kwargs):
+    """Function that raises a MagellanRuntimeException
+
+    Replaces every function in the magellan config's disabled_functions iterable
+    """
+    raise MagellanRuntimeException("This function has been disabled!")
+
+
+class StaticApiModel(AbstractApiModel):
+    """Base class of the Models written out by `magellan_models.codegen`
+
+    The generated subclasses declare what `generate_model` would have captured in closures
+    (attribute types, relationships, schemas and routes) as class attributes
+    and define a real property or method for each attribute and helper function.
+    `bind` links them to a MagellanConfig and to each other at initialization.
+    """
+
+    __slots__ = MODEL_SLOTS
+
+    __resource_name__ = None
+    __attribute_types__ = {}
+    __relationships__ = {}
+    __post_schema__ = {}
+    __patch_schema__ = {}
+    __downstream_routes__ = []
+    __method_names__ = []
+    __relationship_function_names__ = []
+    __downstream_function_names__ = []
+
+    # set by bind
+    __configuration__ = None
+    __downstream_functions__ = {}
+    __disabled_originals__ = {}
+
+    @classmethod
+    def bind(cls, configuration: MagellanConfig, models: Dict[str, Any]) -> None:
+        """Links the Model to a configuration and to the other Models of its spec
+
+        Args:
+            configuration (MagellanConfig): the configuration instance used by the Model
+            models (Dict[str, Any]): class name => Model for every Model generated from the spec
+        """
+        for func_name, original in cls.__disabled_originals__.items():
+            if original is None:
+                delattr(cls, func_name)
+            else:
+                setattr(cls, func_name, original)
+        cls.__disabled_originals__ = {}
+
+        cls.__configuration__ = configuration
+        cls.__models__ = models
+
+        # replaces the generated read only properties with compiled read / write ones
+        reserved = set(dir(StaticApiModel)) | set(cls.__method_names__)
+        for name, member in compile_accessors(
+            configuration,
+            [name for name in cls.__attribute_types__ if name not in reserved],
+        ).items():
+            setattr(cls, name, member)
+
+        downstream_functions = {}
+        id_sep = re.compile(configuration.id_separator)
+        for func_name, route in zip(
+            cls.__downstream_function_names__, cls.__downstream_routes__
+        ):
+            separator = re.search(id_sep, route["route"]).group(0)
+            parsed_id_key = re.match("{(.*)}", separator).group(1)
+            downstream_functions[func_name] = (
+                parsed_id_key,
+                generate_func_for_route(route, configuration)[1],
+            )
+        cls.__downstream_functions__ = downstream_functions
+
+        for func_name in configuration.disabled_functions:
+            cls.__disabled_originals__[func_name] = cls.__dict__.get(func_name)
+            setattr(cls, func_name, disabled_function)
+
+    @classmethod
+    def configuration(cls) -> MagellanConfig:  # pylint: disable=arguments-differ
+        if cls.__configuration__ is None:
+            raise MagellanRuntimeException(
+                f"{cls.__name__} hasn't been initialized, call the generated package's initialize()"
+            )
+        return cls.__configuration__
+
+    @classmethod
+    def resource_name(cls) -> str:  # pylint: disable=arguments-differ
+        return cls.__resource_name__
+
+    @classmethod
+    def get_post_schema(cls) -> dict:  # pylint: disable=arguments-differ
+        return cls.__post_schema__
+
+    @classmethod
+    def get_patch_schema(cls) -> dict:  # pylint: disable=arguments-differ
+        return cls.__patch_schema__
+
+    @classmethod
+    def list_attributes(cls) -> dict:  # pylint: disable=arguments-differ
+        return {
+            name: getattr(attribute_type, "__name__", attribute_type)
+            for name, attribute_type in cls.__attribute_types__.items()
+        }
+
+    @classmethod
+    def list_methods(cls) -> List[str]:
+        """Returns the names of the functions generated for this Model"""
+        disabled = [
+            func_name
+            for func_name in cls.configuration().disabled_functions
+            if func_name not in cls.__method_names__
+        ]
+        return list(cls.__method_names__) + disabled
+
+    @classmethod
+    def list_relationship_functions(cls) -> List[str]:
+        """Returns the names of the relationship helper functions"""
+        return cls.__relationship_function_names__
+
+    @classmethod
+    def list_downstream_functions(cls) -> List[str]:
+        """Returns the names of the downstream route functions"""
+        return cls.__downstream_function_names__
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__relationship_template__ = relationship_template(cls.__relationships__)
+
+    representation = representation_property()
+
+    @property
+    def id(self):
+        return self.get_instance_attribute("id")
+
+    def __getattr__(self, name):
+        # only reached when normal lookup fails: bind installs a property per attribute
+        if name in self.__attribute_types__:
+            return self._get_loaded_attribute(name)
+        raise AttributeError(f"No such attribute: {name}")
+
+    def _get_loaded_attribute(self, attribute_name: str) -> Any:
+        """Returns an attribute's value, loading it first if a sparse fieldset left it out"""
+        if not self.attribute_is_loaded(attribute_name):
+            self.handle_unloaded_attribute(attribute_name)
+        return self.get_instance_attribute(attribute_name)
+
+    def _call_downstream_function(self, func_name: str, **kwargs):
+        id_label, function = self.__downstream_functions__[func_name]
+        return function(**{id_label: self.id}, **kwargs)
+
+
+# kept as an alias of representation for code written against the previous storage
+setattr(StaticApiModel, "__representation", StaticApiModel.representation)
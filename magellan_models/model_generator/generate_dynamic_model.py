@@ -6,6 +6,12 @@ from copy import deepcopy
 from typing import Callable
 import inflection
 from magellan_models.interface.abstract_api_model import AbstractApiModel
+from magellan_models.interface.attribute_access import (
+    MODEL_SLOTS,
+    compile_accessors,
+    relationship_template,
+    representation_property,
+)
 from magellan_models.config import MagellanConfig
 from magellan_models.exceptions import MagellanRuntimeException
 from magellan_models.model_generator.generate_nonrest_functions import (
@@ -76,46 +82,20 @@ def generate_model(  # pylint: disable=dangerous-default-value,too-many-statemen
         return patch_schema
 
     def list_functions_func():
-        return list(mapping.keys())
-
-    def init_function(self):
-        relationship_body = {}
-        for relationship in relationships:
-            relationship_name = (
-                inflection.pluralize(relationship)
-                if relationships[relationship] == "many"
-                else relationship
-            )
-            relationship_value = [] if relationships[relationship] == "many" else {}
-            relationship_body[relationship_name] = {"data": relationship_value}
-        self.__dict__["__representation"] = {
-            "attributes": {},
-            "relationships": relationship_body,
-        }
+        return [name for name in mapping if name not in accessor_names]
 
     def resource_name_func():
         "returns the resource name we have passed in"
         return resource_name_val
 
-    def representation(self):
-        return self.__representation  # pylint: disable=protected-access
-
     def process_get_attributes(self, method_name):
+        # only reached when normal lookup fails: attributes are properties
         if method_name in attributes:
+            if not self.attribute_is_loaded(method_name):
+                self.handle_unloaded_attribute(method_name)
             return self.get_instance_attribute(method_name)
         raise AttributeError(f"No such attribute: {method_name}")
 
-    def process_set_attributes(self, attrib_name, attrib_value):
-        if attrib_name == "__representation":
-            # todo: find a better way to handle this
-            self.__dict__["__representation"] = attrib_value
-        elif attrib_name in attributes:
-            self.set_instance_attribute(attrib_name, attrib_value)
-        elif attrib_name == "representation":
-            setattr(self, "__representation", attrib_value)
-        else:
-            raise AttributeError(f"No Such attribute: {attrib_name}")
-
     mapping = {}
 
     ### Attributes logic ###
@@ -123,17 +103,7 @@ def generate_model(  # pylint: disable=dangerous-default-value,too-many-statemen
         find_by_func_name = f"find_by_{attribute}"
 
         def find_by_func(cls, value, operation="eq", bound_attrib=attribute, **kwargs):
-            entity = cls.where(
-                **{
-                    bound_attrib: value,
-                    "filtering_arguments": {bound_attrib: operation},
-                },
-                limit=1,
-                **kwargs,
-            )
-            if len(entity) == 1:
-                return entity[0]
-            return None
+            return cls._find_by_attribute(bound_attrib, value, operation, **kwargs)
 
         mapping[find_by_func_name] = classmethod(find_by_func)
     ### end attributes logic###
@@ -163,18 +133,8 @@ def generate_model(  # pylint: disable=dangerous-default-value,too-many-statemen
                 singular_name=singular_name,
             ):
                 """Adds a given UUID to the relationship body of a given instance of a resource"""
-                current_entities = self.get_instance_relationship_value(
-                    relationship_name
-                ).get("data", [])
-                current_entities.append(
-                    configuration.relationship_id_to_json_entry(
-                        added_elem_id,
-                        relationship_type=singular_name,
-                        additional_args=additional_args,
-                    )
-                )
-                self.set_instance_relationship_value(
-                    relationship_name, {"data": current_entities}
+                self._add_relationship_id(
+                    relationship_name, singular_name, added_elem_id, additional_args
                 )
 
             remove_name = f"remove_{singular_name}"
@@ -186,20 +146,9 @@ def generate_model(  # pylint: disable=dangerous-default-value,too-many-statemen
                 singular_name=singular_name,
             ):
                 """Removes a given UUID from the relationships body"""
-                current_entities = self.get_instance_relationship_value(
-                    relationship_name
-                )
-                current_entities = current_entities.get("data", current_entities)
-                if current_entities is None:
-                    current_entities = []
-                mapped_entity = configuration.relationship_id_to_json_entry(
-                    removed_elem_id, relationship_type=singular_name
+                self._remove_relationship_id(
+                    relationship_name, singular_name, removed_elem_id
                 )
-                if mapped_entity in current_entities:
-                    current_entities.remove(mapped_entity)
-                    self.set_instance_relationship_value(
-                        relationship_name, {"data": current_entities}
-                    )
 
             if (
                 inflection.camelize(inflection.singularize(relationship_name))
@@ -208,29 +157,15 @@ def generate_model(  # pylint: disable=dangerous-default-value,too-many-statemen
 
                 helper_get_name = f"{relationship_name}"
 
-                def helper_get(self, _relationship_name=relationship_name, **kwargs):
+                def helper_get(
+                    self, _relationship_name=relationship_name, refresh=False, **kwargs
+                ):
                     """
                     Helper method that returns Instance models for each {{relationship}}
-                    currently linked to this instance
+                    currently linked to this instance, memoized per kwargs until the
+                    relationship changes (refresh=True queries again)
                     """
-                    filtering_arguments = kwargs.pop("filtering_arguments", {})
-                    filtering_arguments["id"] = "in"
-                    ids = [
-                        relationship["id"]
-                        for relationship in self.get_instance_relationship_value(
-                            _relationship_name
-                        ).get("data")
-                    ]
-                    relationship_model_name = inflection.camelize(
-                        inflection.singularize(_relationship_name)
-                    )
-                    entities = model_mapping[relationship_model_name].where(
-                        id=ids,
-                        filtering_arguments=filtering_arguments,
-                        limit=len(ids),
-                        **kwargs,
-                    )
-                    return entities
+                    return self._get_many_relationship(_relationship_name, refresh, **kwargs)
 
                 mapping[helper_get_name] = helper_get
                 relationship_function_names.append(helper_get_name)
@@ -247,42 +182,21 @@ def generate_model(  # pylint: disable=dangerous-default-value,too-many-statemen
             def set_id_func(
                 self, new_id, additional_args={}, relationship_name=relationship_name
             ):
-                relationship_entity = configuration.relationship_id_to_json_entry(
-                    new_id,
-                    additional_args=additional_args,
-                    relationship_type=relationship_name,
-                )
-                self.set_instance_relationship_value(
-                    relationship_name, {"data": relationship_entity}
-                )
+                self._set_relationship_id(relationship_name, new_id, additional_args)
 
             set_name = f"set_{relationship_name}"
 
             def set_func(
                 self, new_entity, meta={}, relationship_name=relationship_name
             ):
-                relationship_entity = configuration.relationship_id_to_json_entry(
-                    new_entity.id, meta=meta, relationship_type=relationship_name
-                )
-                self.set_instance_relationship_value(
-                    relationship_name, {"data": relationship_entity}
-                )
+                self._set_relationship(relationship_name, new_entity, meta)
 
             if inflection.camelize(relationship_name) in all_model_names:
                 # helper get
                 get_name = f"{relationship_name}"
 
-                def get_func(self, relationship_name=relationship_name):
-                    relation_id = (
-                        self.get_instance_relationship_value(relationship_name)
-                        .get("data")
-                        .get("id", None)
-                    )
-                    if relation_id is None:
-                        return None
-                    return model_mapping[inflection.camelize(relationship_name)].find(
-                        relation_id
-                    )
+                def get_func(self, refresh=False, relationship_name=relationship_name):
+                    return self._get_one_relationship(relationship_name, refresh)
 
                 mapping[get_name] = get_func
                 relationship_function_names.append(get_name)
@@ -338,18 +252,36 @@ def generate_model(  # pylint: disable=dangerous-default-value,too-many-statemen
     mapping["resource_name"] = staticmethod(resource_name_func)
     # getter function for the passed in configuration
     mapping["configuration"] = classmethod(lambda cls: configuration)
+    # the relationship helpers find related Models here
+    mapping["__models__"] = model_mapping
     mapping["__getattr__"] = process_get_attributes
-    mapping["__setattr__"] = process_set_attributes
     mapping["list_attributes"] = staticmethod(list_attributes_function)
-    mapping["representation"] = property(representation)
-    mapping["__init__"] = init_function
+    mapping["representation"] = representation_property()
+    mapping["__relationship_template__"] = relationship_template(relationships)
     mapping["list_methods"] = staticmethod(list_functions_func)
-    mapping["id"] = property(lambda self: self.get_instance_attribute("id"))
     mapping["get_post_schema"] = staticmethod(post_schema_wrapper_func)
     mapping["get_patch_schema"] = staticmethod(patch_schema_wrapper_func)
     mapping["list_downstream_functions"] = staticmethod(list_downstream_wrapper)
     mapping["list_relationship_functions"] = staticmethod(list_relationships_wrapper)
 
+    # a property per attribute (unless a function already has its name) and accessors bound to
+    # compiled representation paths, so reads and writes don't go through __getattr__
+    reserved = set(mapping) | set(dir(AbstractApiModel))
+    accessors = compile_accessors(
+        configuration, [attribute for attribute in attributes if attribute not in reserved]
+    )
+    mapping.update(accessors)
+    # kept as an alias of representation for code written against the previous storage
+    mapping["__representation"] = mapping["representation"]
+    mapping["__slots__"] = MODEL_SLOTS
+    # list_methods keeps listing generated functions (and id) only
+    accessor_names = (set(accessors) - {"id"}) | {
+        "__representation",
+        "__slots__",
+        "__models__",
+        "__relationship_template__",
+    }
+
     ### Handle disabling functions
     for func_name in configuration.disabled_functions:
         mapping[func_name] = exception_function
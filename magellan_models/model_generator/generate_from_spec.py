@@ -1,6 +1,7 @@
 """
     Main entry point for Parser and model generator
 """
+import time
 from typing import Tuple
 import inflection
 from magellan_models.config import MagellanConfig
@@ -10,8 +11,182 @@ from .openapi_parser import (
 )
 from .model_parser import get_model_representation
 from .generate_dynamic_model import generate_model
-from .generate_nonrest_functions import generate_func_for_route
+from .generate_nonrest_functions import (
+    generate_func_for_route,
+    get_function_name_and_params_from_path,
+)
 from .generic_functions_generator import get_generic_function
+from .spec_cache import get_spec_cache_key, load_compiled_spec, store_compiled_spec
+from .lazy_mapping import LazyMapping
+from .spec_index import SpecIndex
+
+
+def resource_is_allowed(resource_name: str, configuration: MagellanConfig) -> bool:
+    """Checks a resource against the configuration's allowed_resources and denied_resources,
+    which can list either resource names ("factions") or class names ("Faction")
+
+    Arguments:
+        resource_name {str} -- the resource name
+        configuration {MagellanConfig} -- Configuration instance containing user settings
+    Output:
+        bool -- True if a Model should be generated for the resource
+    """
+    names = (resource_name, inflection.camelize(inflection.singularize(resource_name)))
+    allowed = configuration.allowed_resources
+    if allowed is not None and not any(name in allowed for name in names):
+        return False
+    return not any(name in configuration.denied_resources for name in names)
+
+
+def parse_resource_names(
+    spec: dict, configuration: MagellanConfig, spec_index: SpecIndex
+) -> Tuple[list, list]:
+    """Returns the allowed resource names of a spec, and the routes which aren't part of a Model
+
+    Arguments:
+        spec {Dict} -- Dict representation of the open api specification json
+        configuration {MagellanConfig} -- Configuration instance containing user settings
+        spec_index {SpecIndex} -- the spec's path index
+    """
+    resource_mapping = get_resource_mapping(spec, spec_index)
+    resource_names, other_routes = parse_resource_names_and_other_routes_from_mapping(
+        resource_mapping, configuration.id_separator
+    )
+    resource_names = [
+        resource_name
+        for resource_name in resource_names
+        if resource_is_allowed(resource_name, configuration)
+    ]
+    return resource_names, other_routes
+
+
+def compile_spec(spec: dict, configuration: MagellanConfig) -> Tuple[list, list]:
+    """Parses a specification into model representations and non-model routes,
+    or returns them from the compiled spec cache if this spec was parsed before
+
+    Arguments:
+        spec {Dict} -- Dict representation of the open api specification json
+        configuration {MagellanConfig} -- Configuration instance containing user settings
+    Output:
+        tuple(list, list)
+            First list: the model representation dict of every resource
+            Second list: the routes which aren't part of a Model
+    """
+    cache_key = None
+    if configuration.cache_compiled_specs:
+        cache_key = get_spec_cache_key(spec, configuration)
+        compiled = load_compiled_spec(cache_key, configuration)
+        if compiled is not None:
+            return compiled
+
+    spec_index = SpecIndex(spec)
+    resource_names, other_routes = parse_resource_names(spec, configuration, spec_index)
+    model_representations = [
+        get_model_representation(spec, resource_name, configuration, spec_index)
+        for resource_name in resource_names
+    ]
+    if cache_key is not None:
+        store_compiled_spec(cache_key, model_representations, other_routes, configuration)
+    return model_representations, other_routes
+
+
+def generate_and_record_model(
+    representation: dict,
+    all_model_names: list,
+    model_mapping: dict,
+    configuration: MagellanConfig,
+):
+    """Calls generate_model, remembering the representation the Model was generated from
+    in configuration.generated_representations so reload_spec can tell what changed
+
+    Arguments:
+        representation {dict} -- the Model's representation
+        all_model_names {list} -- class names of every Model in the spec
+        model_mapping {dict} -- the mapping the Models are stored in
+        configuration {MagellanConfig} -- Configuration instance containing user settings
+    """
+    configuration.generated_representations[representation["class_name"]] = representation
+    return generate_model(representation, all_model_names, model_mapping, configuration)
+
+
+def generate_functions(other_routes: list, configuration: MagellanConfig, lazy: bool):
+    """Generates the non-model functions
+
+    Arguments:
+        other_routes {list} -- the routes which aren't part of a Model
+        configuration {MagellanConfig} -- Configuration instance containing user settings
+        lazy {bool} -- return a LazyMapping which generates each function on first access
+    Output:
+        Union[dict, LazyMapping] -- function name => function
+    """
+    if not lazy:
+        functional_routes = {}
+        for route in other_routes:
+            func_name, function = generate_func_for_route(route, configuration)
+            functional_routes[func_name] = function
+        functional_routes["_generic_api_function"] = get_generic_function(configuration)
+        return functional_routes
+
+    functional_routes = LazyMapping()
+    for route in other_routes:
+        func_name = get_function_name_and_params_from_path(
+            route, configuration.function_naming_style
+        )[0]
+        functional_routes.add_factory(
+            func_name,
+            lambda route=route: generate_func_for_route(route, configuration)[1],
+        )
+    functional_routes.add_factory(
+        "_generic_api_function", lambda: get_generic_function(configuration)
+    )
+    return functional_routes
+
+
+def generate_lazily_from_spec(
+    spec: dict, configuration: MagellanConfig
+) -> Tuple[LazyMapping, LazyMapping]:
+    """Returns Model and function mappings which only parse and generate an entry
+    the first time it's accessed. Relationship helpers look related Models up in the same
+    mapping, so they're generated when a helper first needs them
+
+    Arguments:
+        spec {Dict} -- Dict representation of the open api specification json
+        configuration {MagellanConfig} -- Configuration instance containing user settings
+    Output:
+        tuple(LazyMapping, LazyMapping) -- the Models and the functions
+    """
+    compiled = None
+    if configuration.cache_compiled_specs:
+        compiled = load_compiled_spec(get_spec_cache_key(spec, configuration), configuration)
+
+    representation_factories = {}
+    if compiled is not None:
+        model_representations, other_routes = compiled
+        for repres in model_representations:
+            representation_factories[repres["class_name"]] = lambda repres=repres: repres
+    else:
+        spec_index = SpecIndex(spec)
+        resource_names, other_routes = parse_resource_names(
+            spec, configuration, spec_index
+        )
+        for resource_name in resource_names:
+            class_name = inflection.camelize(inflection.singularize(resource_name))
+            representation_factories[
+                class_name
+            ] = lambda resource_name=resource_name: get_model_representation(
+                spec, resource_name, configuration, spec_index
+            )
+
+    model_names = list(representation_factories.keys())
+    model_definitions = LazyMapping()
+    for class_name, get_representation in representation_factories.items():
+        model_definitions.add_factory(
+            class_name,
+            lambda get_representation=get_representation: generate_and_record_model(
+                get_representation(), model_names, model_definitions, configuration
+            ),
+        )
+    return model_definitions, generate_functions(other_routes, configuration, lazy=True)
 
 
 def generate_from_spec(
@@ -32,31 +207,40 @@ def generate_from_spec(
             Second dict: str => function, a mapping of non-Model functions that are accessible.
             MagellanConfig: configuration instance linked to all Models and Functions generated
     """
-    resource_mapping = get_resource_mapping(spec)
-    resource_names, other_routes = parse_resource_names_and_other_routes_from_mapping(
-        resource_mapping, configuration.id_separator
-    )
-    model_representations = []
-    model_names = []
-    for resource_name in resource_names:
-        model_names.append(inflection.camelize(inflection.singularize(resource_name)))
-        model_representations.append(
-            get_model_representation(spec, resource_name, configuration)
-        )
-    model_definitions = {}
-    for repres in model_representations:
-        model_definitions[repres["class_name"]] = generate_model(
-            repres, model_names, model_definitions, configuration
+    start = time.perf_counter()
+    configuration.generated_representations = {}
+    if configuration.lazy_generation:
+        model_definitions, functional_routes = generate_lazily_from_spec(
+            spec, configuration
         )
+    else:
+        model_representations, other_routes = compile_spec(spec, configuration)
+        model_names = [
+            inflection.camelize(inflection.singularize(repres["resource_name"]))
+            for repres in model_representations
+        ]
+        model_definitions = {}
+        for repres in model_representations:
+            model_definitions[repres["class_name"]] = generate_and_record_model(
+                repres, model_names, model_definitions, configuration
+            )
+        functional_routes = generate_functions(other_routes, configuration, lazy=False)
 
-    functional_routes = {}
-    for route in other_routes:
-        func_name, function = generate_func_for_route(route, configuration)
-        functional_routes[func_name] = function
-    functional_routes["_generic_api_function"] = get_generic_function(configuration)
+    configuration.generated_models = model_definitions
+    configuration.generated_functions = functional_routes
+    configuration.initialization_timings["generate"] = time.perf_counter() - start
 
     if configuration.print_on_init:
-        print("Completed Model and Function Generation")
+        print(
+            "Completed Model and Function Generation in "
+            + ", ".join(
+                f"{step} {seconds:.3f}s"
+                for step, seconds in configuration.initialization_timings.items()
+                if isinstance(seconds, float)
+            )
+        )
+        if configuration.lazy_generation:
+            print("Models and Functions will be generated the first time they're accessed")
         print("The following Models were generated:")
         for key in model_definitions:
             print(key)
@@ -2,14 +2,16 @@
 import re
 from warnings import warn
 from typing import Tuple, Callable, List
-import requests
-from jsonschema import validate, ValidationError
+from magellan_models.deferred_import import deferred_import
 from magellan_models.exceptions import (
     MagellanParserException,
     MagellanRuntimeWarning,
     MagellanRuntimeException,
 )
 
+requests = deferred_import("requests")
+jsonschema = deferred_import("jsonschema")
+
 
 def get_function_name_and_params_from_path(
     path: dict, naming_method: str
@@ -85,8 +87,8 @@ def generate_func_for_route(route: dict, configuration) -> Tuple[str, Callable]:
 
         # Validation block
         try:
-            validate(request_body, request_schema)
-        except ValidationError as validation_err:
+            jsonschema.validate(request_body, request_schema)
+        except jsonschema.ValidationError as validation_err:
             if configuration.validation_output == "warning":
                 warn(validation_err.message, MagellanRuntimeWarning)
             elif configuration.validation_output == "exception":
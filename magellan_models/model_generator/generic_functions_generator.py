@@ -1,5 +1,7 @@
 """ Module to generate the generic API call function """
-import requests
+from magellan_models.deferred_import import deferred_import
+
+requests = deferred_import("requests")
 
 
 def get_generic_function(configuration):
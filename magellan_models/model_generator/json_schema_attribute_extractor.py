@@ -1,10 +1,9 @@
 """ JSON Schema attribute extraction module """
 from typing import Iterable
-import re
 from warnings import warn
 import inflection
 from magellan_models.exceptions import MagellanParserException, MagellanParserWarning
-from magellan_models.model_generator.helper_funcs import get_reference_value_from_spec
+from magellan_models.model_generator.spec_index import SpecIndex
 
 attribute_string_to_type = {
     "string": str,
@@ -51,7 +50,10 @@ def extract_attributes(
 
 
 def get_response_body_example(
-    openapi_schema: dict, resource_name: str, id_separator: str
+    openapi_schema: dict,
+    resource_name: str,
+    id_separator: str,
+    spec_index: SpecIndex = None,
 ):
     """Traverses the openapi schema object for the GET /{resource_name}/{identifier separator} path
     And returns that path's response body object
@@ -64,19 +66,20 @@ def get_response_body_example(
         id_separator {str} -- ID Separator (often just a config value passed down).
             This should be a regex
         that we can use to match paths with
+        spec_index {SpecIndex} -- an index of openapi_schema to reuse, built if None
     Returns:
         response_body {dict} -- JSON Schema object pulled from OpenAPI schema
     """
-    paths = openapi_schema.get("paths", {})
+    if spec_index is None:
+        spec_index = SpecIndex(openapi_schema)
+    paths = spec_index.paths
 
     singular_get_path = {}  # empty to start
-    resource_path_regex = re.compile("/".join(["", resource_name, id_separator]))
-    for path in paths.keys():
-        # Match completely, downstream routes ignored
-        if resource_path_regex.fullmatch(path):
-            singular_get_path = paths.get(path, {}).get("get", False)
-            if singular_get_path:
-                break
+    # single entity routes (downstream routes ignored) that have a GET
+    for path in spec_index.routes(resource_name, id_separator, "entity", "get"):
+        singular_get_path = paths.get(path, {}).get("get", False)
+        if singular_get_path:
+            break
     if not singular_get_path:
         raise MagellanParserException(
             f"Unable to find an associated path with resource `{resource_name}` given"
@@ -89,12 +92,8 @@ def get_response_body_example(
         .get("schema", {})
     )
 
-    # if response_body_schema is a reference via {"$ref": "path_to_schema"}, return the reference object's value
-    if response_body_schema.get("$ref", False):
-        response_body_schema = get_reference_value_from_spec(
-            openapi_schema, response_body_schema.get("$ref")
-        )
-    return response_body_schema
+    # resolve {"$ref": "path_to_schema"} references, including the ones nested in attributes
+    return spec_index.resolver.standalone(response_body_schema)
 
 
 def extract_relationships(
@@ -0,0 +1,76 @@
+""" LazyMapping definition file """
+from collections.abc import Mapping
+from threading import RLock
+from typing import Any, Callable, Dict, List
+
+
+class LazyMapping(Mapping):
+    """A read only mapping whose values are created the first time their key is accessed
+
+    Every key is known up front, so iterating, `len` and `in` never create a value.
+    Reading a value (including through `values()` or `items()`) runs its factory once,
+    later reads return the same object
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]] = None):
+        """Creates a LazyMapping
+
+        Args:
+            factories (Dict[str, Callable[[], Any]], optional): key => function creating its value.
+                Defaults to None.
+        """
+        self.__factories = dict(factories or {})
+        self.__values = {}
+        self.__lock = RLock()
+
+    def add_factory(self, key: str, factory: Callable[[], Any]) -> None:
+        """Adds (or replaces) a key, discarding a value already created for it
+
+        Args:
+            key (str): the key
+            factory (Callable[[], Any]): function creating the key's value
+        """
+        with self.__lock:
+            self.__factories[key] = factory
+            self.__values.pop(key, None)
+
+    def remove(self, key: str) -> None:
+        """Removes a key and its value
+
+        Args:
+            key (str): the key
+        """
+        with self.__lock:
+            self.__factories.pop(key, None)
+            self.__values.pop(key, None)
+
+    def is_materialized(self, key: str) -> bool:
+        """Checks if a key's value has been created"""
+        return key in self.__values
+
+    def materialized(self) -> List[str]:
+        """Returns the keys whose values have been created"""
+        return list(self.__values.keys())
+
+    def __getitem__(self, key):
+        try:
+            return self.__values[key]
+        except KeyError:
+            pass
+        with self.__lock:
+            if key not in self.__values:
+                factory = self.__factories[key]
+                self.__values[key] = factory()
+            return self.__values[key]
+
+    def __contains__(self, key):
+        return key in self.__factories
+
+    def __iter__(self):
+        return iter(list(self.__factories.keys()))
+
+    def __len__(self):
+        return len(self.__factories)
+
+    def __repr__(self):
+        return f"LazyMapping({list(self.__factories.keys())}, materialized={self.materialized()})"
@@ -5,7 +5,7 @@
 import re
 from warnings import warn
 import inflection
-from magellan_models.model_generator.helper_funcs import get_routes
+from magellan_models.model_generator.spec_index import SpecIndex, compile_route_regex
 from magellan_models.exceptions import MagellanParserWarning
 from magellan_models.config import MagellanConfig
 from .json_schema_attribute_extractor import (
@@ -93,7 +93,10 @@ def resource_can_make_a_model(
 
 
 def get_model_downstream_routes(
-    open_api_spec: dict, resource_name: str, id_separator: str
+    open_api_spec: dict,
+    resource_name: str,
+    id_separator: str,
+    spec_index: SpecIndex = None,
 ):
     """parses routes and returns a list of paths starting with /{resource_name}/{id}/
       for that resource that have an additional endpoint
@@ -106,6 +109,7 @@ def get_model_downstream_routes(
         id_separator {str} -- the Separator for ID in the openAPI specification file
             (ex: {id_} in GET api/labs/{id_})
         This id_separator value should be compilable into a regex for matching purposes.
+        spec_index {SpecIndex} -- an index of open_api_spec to reuse, built if None
     Returns:
         downstream_routes {list} -- a list of dict values indicating downstream route paths
         example of stripped an object: {
@@ -115,27 +119,17 @@ def get_model_downstream_routes(
             "schema": {#someSchmeaObjectHere}
         }
     """
-    paths = get_routes(open_api_spec)
-    singular_resource_regex = re.compile(
-        "/".join(["", resource_name, id_separator, "(.+)"])
-    )
+    if spec_index is None:
+        spec_index = SpecIndex(open_api_spec)
+    singular_resource_regex = compile_route_regex(resource_name, id_separator, "(.+)")
     downstream_routes = []
-    for path in paths:
+    for path in spec_index.routes(resource_name, id_separator, "downstream"):
         # Here we do match vs fullmatch because we WANT extra stuff at the end
         regex_match = singular_resource_regex.match(path)
-        # and open_api_spec.get('paths', {}).get(path, False): #.get('get', False):
         if regex_match:
-            for method in open_api_spec.get("paths", {}).get(path, {}).keys():
+            for method, operation in spec_index.operations(path).items():
                 # Last capture group which in this case is the (.*)
-                schema = (
-                    open_api_spec.get("paths", {})
-                    .get(path, {})
-                    .get(method, {})
-                    .get("requestBody", {})
-                    .get("content", {})
-                    .get("application/json", {})
-                    .get("schema", {})
-                )
+                schema = spec_index.request_schema(operation)
 
                 route_obj = {
                     "short_path": regex_match[regex_match.lastindex],
@@ -153,6 +147,7 @@ def get_path_req_schema(
     id_separator: str,
     method: str,
     path_type: str = "singular",
+    spec_index: SpecIndex = None,
 ) -> dict:
     """Gets the request body schema for a given entity's path_type and method
         ex: post /{resource} or patch /{resource}/{id}
@@ -164,18 +159,16 @@ def get_path_req_schema(
             (generally derived from this parsing instance's MagellanConfig)
         method (str): the REST method being used (OneOf: ["patch", "put", "post", "get", "delete"])
         path_type (str): Either "singular" or "many" where "many" means we ignore the id_separator
+        spec_index (SpecIndex, optional): an index of open_api_spec to reuse, built if None
     Returns:
         dict: Either {} if the schema isn't found, or the requestBody schema value
     """
-    paths = open_api_spec.get("paths", {})
-
-    # don't forget paths are prepended with "/"
-    if path_type == "singular":
-        entity_regex = re.compile("/".join(["", resource_name, id_separator]))
-    else:
-        entity_regex = re.compile("/".join(["", resource_name]))
+    if spec_index is None:
+        spec_index = SpecIndex(open_api_spec)
+    paths = spec_index.paths
 
-    possible_paths = list(filter(entity_regex.fullmatch, paths.keys()))
+    depth = "entity" if path_type == "singular" else "collection"
+    possible_paths = list(spec_index.routes(resource_name, id_separator, depth))
 
     if len(possible_paths) > 0:
         if len(possible_paths) > 1:
@@ -185,18 +178,15 @@ def get_path_req_schema(
             )
         single_entity_path_key = possible_paths.pop()
         single_entity_method = paths.get(single_entity_path_key, {}).get(method, {})
-        schema = (
-            single_entity_method.get("requestBody", {})
-            .get("content", {})
-            .get("application/json", {})
-            .get("schema", {})
-        )
-        return schema
+        return spec_index.request_schema(single_entity_method)
     return {}
 
 
 def get_model_representation(
-    spec: dict, model_name: str, configuration: MagellanConfig
+    spec: dict,
+    model_name: str,
+    configuration: MagellanConfig,
+    spec_index: SpecIndex = None,
 ) -> dict:
     """Generates a dict storing all information necessary to generate the API Model
 
@@ -204,9 +194,12 @@ def get_model_representation(
         spec {dict} -- Dict representation of the OpenAPI Specification JSON
         model_name {str} -- model name we're looking to process
         configuration {MagellanConfig} -- The Configuration instance associated with this execution
+        spec_index {SpecIndex} -- an index of spec to reuse, built if None
     """
+    if spec_index is None:
+        spec_index = SpecIndex(spec)
     response_body = get_response_body_example(
-        spec, model_name, configuration.id_separator
+        spec, model_name, configuration.id_separator, spec_index
     )
     representation = {
         "resource_name": model_name,
@@ -218,13 +211,13 @@ def get_model_representation(
             response_body, configuration.schema_relationships_path
         ),
         "downstream_routes": get_model_downstream_routes(
-            spec, model_name, configuration.id_separator
+            spec, model_name, configuration.id_separator, spec_index
         ),
         "patch_req_schema": get_path_req_schema(
-            spec, model_name, configuration.id_separator, "patch", "singular"
+            spec, model_name, configuration.id_separator, "patch", "singular", spec_index
         ),
         "post_req_schema": get_path_req_schema(
-            spec, model_name, configuration.id_separator, "post", "many"
+            spec, model_name, configuration.id_separator, "post", "many", spec_index
         ),
     }
     return representation
@@ -2,10 +2,10 @@
 import re
 from typing import Tuple, List
 from magellan_models.model_generator.model_parser import resource_can_make_a_model
-from magellan_models.model_generator.helper_funcs import get_routes, get_endpoints
+from magellan_models.model_generator.spec_index import SpecIndex
 
 
-def get_resource_mapping(open_api_spec: dict) -> dict:
+def get_resource_mapping(open_api_spec: dict, spec_index: SpecIndex = None) -> dict:
     """
     A resource is defined as a collection of endpoints that share the beginning of the route
         (ex "/pets", "/pets/{id}", "/pets/{id}/related_pets", "/pets/find_nearest")
@@ -14,32 +14,23 @@ def get_resource_mapping(open_api_spec: dict) -> dict:
     route entities are defined as objects with an 'action' key (GET PATCH POST etc),
     and 'route' key specifying the url
     along with a 'request_schema' key related to the requestBody schema
+
+    Pass a SpecIndex of open_api_spec as spec_index to reuse it, otherwise one is built
     """
-    routes = get_routes(open_api_spec)
-    endpoints = get_endpoints(open_api_spec)
+    if spec_index is None:
+        spec_index = SpecIndex(open_api_spec)
     resources = {}
-    for endpoint in endpoints:
+    for endpoint in spec_index.endpoints():
         endpoint_routes = []
-        for route in routes:
-            if route.startswith(endpoint):
-                actions = open_api_spec["paths"][route].keys()
-                for action in actions:
-                    # todo: refactor to move requestBody schema retrieval into a helper function.
-                    # There are 3 places where this code could be pulled from
-                    request_schema = (
-                        open_api_spec["paths"][route][action]
-                        .get("requestBody", {})
-                        .get("content", {})
-                        .get("application/json", {})
-                        .get("schema", {})
-                    )
-                    endpoint_routes.append(
-                        {
-                            "action": action,
-                            "route": route,
-                            "request_schema": request_schema,
-                        }
-                    )
+        for route in spec_index.paths_starting_with(endpoint):
+            for action, operation in spec_index.operations(route).items():
+                endpoint_routes.append(
+                    {
+                        "action": action,
+                        "route": route,
+                        "request_schema": spec_index.request_schema(operation),
+                    }
+                )
         resource = endpoint.split("/")[1]
         resources[resource] = {"base_route": endpoint, "routes": endpoint_routes}
     return resources
@@ -0,0 +1,169 @@
+""" RefResolver definition file """
+from copy import deepcopy
+from typing import Any, Iterator
+from urllib.parse import unquote
+from warnings import warn
+from magellan_models.exceptions import MagellanParserWarning
+
+
+class RefResolver:
+    """Resolves `$ref`s in a specification's schemas, including nested ones
+
+    Each JSON pointer ("#/components/schemas/Faction") is resolved once and the result is shared
+    by identity between every schema referencing it. A `$ref` met again while its own target is
+    still being resolved (a recursive schema, ex: a tree node whose children are tree nodes)
+    is a cycle: it's left as the original `{"$ref": ...}` object and a MagellanParserWarning
+    is emitted, so resolved schemas are always finite.
+    Only local references (starting with "#") are resolved, others are left untouched.
+
+    `resolve` shares objects with the specification, `standalone` returns copies
+    whose recursive `$ref`s point at definitions of their own, for schemas handed out
+    (to jsonschema for instance)
+    """
+
+    def __init__(self, spec: dict):
+        """Creates a resolver for a specification
+
+        Args:
+            spec (dict): the OpenAPI specification the pointers refer to
+        """
+        self.spec = spec
+        self.__resolved_pointers = {}
+        self.__resolved_objects = {}
+        self.__in_progress = set()
+        self.__cyclic_pointers = set()
+
+    def cyclic_pointers(self) -> set:
+        """Returns the pointers that were left unresolved because they're recursive"""
+        return set(self.__cyclic_pointers)
+
+    def lookup(self, pointer: str) -> Any:
+        """Returns the raw (unresolved) value a local JSON pointer points to
+
+        Args:
+            pointer (str): a pointer formatted as "#/foo/bar/baz"
+
+        Returns:
+            Any: the value, or {} (with a warning) if the pointer doesn't exist
+        """
+        value = self.spec
+        for token in pointer.lstrip("#").split("/"):
+            if token == "":
+                continue
+            token = unquote(token).replace("~1", "/").replace("~0", "~")
+            if isinstance(value, list) and token.isdigit() and int(token) < len(value):
+                value = value[int(token)]
+            elif isinstance(value, dict) and token in value:
+                value = value[token]
+            else:
+                warn(f"Unable to resolve $ref `{pointer}`", MagellanParserWarning)
+                return {}
+        return value
+
+    def resolve_pointer(self, pointer: str) -> Any:
+        """Returns the fully resolved value a local JSON pointer points to
+
+        Args:
+            pointer (str): a pointer formatted as "#/foo/bar/baz"
+
+        Returns:
+            Any: the resolved value, the same object every time for a given pointer
+        """
+        if pointer in self.__resolved_pointers:
+            return self.__resolved_pointers[pointer]
+        self.__in_progress.add(pointer)
+        try:
+            resolved = self.resolve(self.lookup(pointer))
+        finally:
+            self.__in_progress.discard(pointer)
+        self.__resolved_pointers[pointer] = resolved
+        return resolved
+
+    def resolve(self, schema: Any) -> Any:
+        """Returns schema with every local `$ref` (at any depth) replaced by its target.
+        Objects without any `$ref` inside are returned as is rather than copied
+
+        Args:
+            schema (Any): a schema, or any value within the specification
+
+        Returns:
+            Any: the resolved schema
+        """
+        if not isinstance(schema, (dict, list)):
+            return schema
+        if id(schema) in self.__resolved_objects:
+            return self.__resolved_objects[id(schema)][1]
+
+        if isinstance(schema, dict):
+            reference = schema.get("$ref")
+            if isinstance(reference, str) and reference.startswith("#"):
+                if reference in self.__in_progress:
+                    if reference not in self.__cyclic_pointers:
+                        self.__cyclic_pointers.add(reference)
+                        warn(
+                            f"$ref `{reference}` is recursive, it's left unresolved where it refers to itself",  # pylint: disable=line-too-long
+                            MagellanParserWarning,
+                        )
+                    return schema
+                return self.resolve_pointer(reference)
+            items = {key: self.resolve(value) for key, value in schema.items()}
+            changed = any(items[key] is not schema[key] for key in schema)
+            resolved = items if changed else schema
+        else:
+            elements = [self.resolve(value) for value in schema]
+            changed = any(new is not old for new, old in zip(elements, schema))
+            resolved = elements if changed else schema
+
+        # results inside a cycle depend on where resolution started, so they aren't memoized
+        if not self.__in_progress.intersection(self.__cyclic_pointers):
+            # keep a reference to schema so its id can't be reused while it's memoized
+            self.__resolved_objects[id(schema)] = (schema, resolved)
+        return resolved
+
+    def standalone(self, schema: Any) -> Any:
+        """Returns a resolved deep copy of schema, sharing nothing with the specification
+        or the other schemas. The recursive `$ref`s left by `resolve` are pointed at entries
+        of a "definitions" object added to the copy, so validators can still follow them
+        (a schema that isn't an object can't hold definitions, its recursive `$ref`s
+        are replaced by the `{}` schema)
+
+        Args:
+            schema (Any): a schema, or any value within the specification
+
+        Returns:
+            Any: the standalone schema
+        """
+        resolved = deepcopy(self.resolve(schema))
+        if not self.__cyclic_pointers:
+            return resolved
+        definitions = {}
+        pending = list(self.cyclic_references(resolved))
+        while pending:
+            reference = pending.pop()
+            pointer = reference["$ref"]
+            name = pointer.lstrip("#/")
+            if not isinstance(resolved, dict):
+                reference.clear()
+                continue
+            if name not in definitions:
+                definitions[name] = deepcopy(self.resolve_pointer(pointer))
+                pending.extend(self.cyclic_references(definitions[name]))
+            escaped_name = name.replace("~", "~0").replace("/", "~1")
+            reference["$ref"] = f"#/definitions/{escaped_name}"
+        if definitions:
+            resolved.setdefault("definitions", {}).update(definitions)
+        return resolved
+
+    def cyclic_references(self, schema: Any) -> Iterator[dict]:
+        """Yields the `{"$ref": ...}` objects within schema that point at a recursive pointer"""
+        if isinstance(schema, dict):
+            if schema.get("$ref") in self.__cyclic_pointers:
+                yield schema
+                return
+            values = schema.values()
+        elif isinstance(schema, list):
+            values = schema
+        else:
+            return
+        for value in values:
+            yield from self.cyclic_references(value)
@@ -0,0 +1,196 @@
+"""
+    Caching of compiled specifications (model representations and non-model routes)
+    so a spec that was already parsed doesn't need to be parsed again
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional, Tuple, List
+from warnings import warn
+from magellan_models.config import MagellanConfig
+from magellan_models.exceptions import MagellanParserWarning
+from .json_schema_attribute_extractor import attribute_string_to_type
+
+# Bump this whenever the shape of a model representation or route changes,
+# so cache files written by an older version are ignored instead of misread
+SPEC_CACHE_FORMAT_VERSION = 2
+
+# The MagellanConfig fields that change the output of parsing a spec
+SPEC_CACHE_CONFIG_FIELDS = (
+    "id_separator",
+    "schema_attributes_path",
+    "schema_relationships_path",
+    "allowed_resources",
+    "denied_resources",
+)
+
+# cache key => (model_representations, other_routes) for this process
+compiled_specs = {}
+
+# attribute types are python types in a representation, and their names in a cache file
+attribute_type_names = {
+    attribute_type.__name__: attribute_type
+    for attribute_type in attribute_string_to_type.values()
+}
+
+
+def encode_representation(representation: dict) -> dict:
+    """Converts a model representation into something json serializable"""
+    encoded = dict(representation)
+    encoded["attributes"] = {
+        name: getattr(attribute_type, "__name__", attribute_type)
+        for name, attribute_type in representation.get("attributes", {}).items()
+    }
+    return encoded
+
+
+def decode_representation(encoded: dict) -> dict:
+    """Reverses encode_representation"""
+    representation = dict(encoded)
+    representation["attributes"] = {
+        name: attribute_type_names.get(type_name, type_name)
+        for name, type_name in encoded.get("attributes", {}).items()
+    }
+    return representation
+
+
+def get_spec_cache_key(spec: dict, configuration: MagellanConfig) -> str:
+    """Hashes a specification together with the configuration fields used while parsing it
+
+    Args:
+        spec (dict): the OpenAPI specification
+        configuration (MagellanConfig): the configuration the spec is parsed with
+
+    Returns:
+        str: a sha256 hex digest identifying the compiled spec
+    """
+    digest = hashlib.sha256()
+    digest.update(str(SPEC_CACHE_FORMAT_VERSION).encode())
+    for field in SPEC_CACHE_CONFIG_FIELDS:
+        value = getattr(configuration, field, None)
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        digest.update(json.dumps(value, default=str).encode())
+    digest.update(
+        json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str).encode()
+    )
+    return digest.hexdigest()
+
+
+def get_spec_cache_path(cache_key: str, configuration: MagellanConfig) -> Optional[str]:
+    """Returns the cache file path for a cache key, or None if the disk cache is disabled"""
+    if not configuration.spec_cache_dir:
+        return None
+    return os.path.join(configuration.spec_cache_dir, f"magellan_spec_{cache_key}.json")
+
+
+def load_compiled_spec(
+    cache_key: str, configuration: MagellanConfig
+) -> Optional[Tuple[List[dict], List[dict]]]:
+    """Looks up a compiled spec in memory, then on disk
+
+    Args:
+        cache_key (str): the key from get_spec_cache_key
+        configuration (MagellanConfig): the configuration instance
+
+    Returns:
+        Optional[Tuple[List[dict], List[dict]]]: the model representations and non-model routes,
+            or None on a cache miss
+    """
+    if not configuration.cache_compiled_specs:
+        return None
+    if cache_key in compiled_specs:
+        return compiled_specs[cache_key]
+
+    path = get_spec_cache_path(cache_key, configuration)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path) as cache_file:
+            cached = json.load(cache_file)
+        if cached.get("version") != SPEC_CACHE_FORMAT_VERSION:
+            return None
+        compiled = (
+            [decode_representation(repres) for repres in cached["model_representations"]],
+            cached["other_routes"],
+        )
+    except (OSError, ValueError, KeyError, AttributeError) as err:
+        warn(
+            f"Ignoring unreadable compiled spec cache file {path}: {err}",
+            MagellanParserWarning,
+        )
+        return None
+    compiled_specs[cache_key] = compiled
+    return compiled
+
+
+def store_compiled_spec(
+    cache_key: str,
+    model_representations: List[dict],
+    other_routes: List[dict],
+    configuration: MagellanConfig,
+) -> None:
+    """Stores a compiled spec in memory, and on disk if a spec_cache_dir is configured.
+    The file is written to a temporary file and moved into place,
+    so concurrent processes never read a partially written cache
+
+    Args:
+        cache_key (str): the key from get_spec_cache_key
+        model_representations (List[dict]): the output of get_model_representation per resource
+        other_routes (List[dict]): the non-model routes
+        configuration (MagellanConfig): the configuration instance
+    """
+    if not configuration.cache_compiled_specs:
+        return
+    compiled_specs[cache_key] = (model_representations, other_routes)
+
+    path = get_spec_cache_path(cache_key, configuration)
+    if not path:
+        return
+    try:
+        os.makedirs(configuration.spec_cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=configuration.spec_cache_dir, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as cache_file:
+                json.dump(
+                    {
+                        "version": SPEC_CACHE_FORMAT_VERSION,
+                        "model_representations": [
+                            encode_representation(repres)
+                            for repres in model_representations
+                        ],
+                        "other_routes": other_routes,
+                    },
+                    cache_file,
+                    default=str,
+                )
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except (OSError, TypeError, ValueError) as err:
+        warn(
+            f"Unable to write compiled spec cache file {path}: {err}",
+            MagellanParserWarning,
+        )
+
+
+def clear_spec_cache(configuration: MagellanConfig = None) -> None:
+    """Clears the in-memory compiled spec cache,
+    and the cache files in configuration.spec_cache_dir if a configuration is given
+
+    Args:
+        configuration (MagellanConfig, optional): the configuration whose cache dir to clear.
+            Defaults to None.
+    """
+    compiled_specs.clear()
+    if configuration is None or not configuration.spec_cache_dir:
+        return
+    if not os.path.isdir(configuration.spec_cache_dir):
+        return
+    for file_name in os.listdir(configuration.spec_cache_dir):
+        if file_name.startswith("magellan_spec_") and file_name.endswith(".json"):
+            os.remove(os.path.join(configuration.spec_cache_dir, file_name))
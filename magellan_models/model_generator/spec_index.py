@@ -0,0 +1,156 @@
+"""
+    An index over a specification's paths, built in a single pass,
+    so the parser can look up the paths of a resource without rescanning every path
+"""
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from magellan_models.model_generator.ref_resolver import RefResolver
+
+
+@lru_cache(maxsize=4096)
+def compile_route_regex(*elements: str) -> re.Pattern:
+    """Compiles (and caches) the regex for a route made of the given elements
+
+    Args:
+        *elements (str): route elements, joined with "/" after a leading "/"
+
+    Returns:
+        re.Pattern: the compiled regex
+    """
+    return re.compile("/".join(("",) + elements))
+
+
+def get_request_schema(operation: dict) -> dict:
+    """Returns an operation's application/json requestBody schema, or {}"""
+    return (
+        operation.get("requestBody", {})
+        .get("content", {})
+        .get("application/json", {})
+        .get("schema", {})
+    )
+
+
+class SpecIndex:
+    """Groups a specification's paths by their first segment, by their depth relative to
+    the `{id}` separator and by method
+
+    ex: "/factions", "/factions/{id_}" and "/factions/{id_}/units" are all indexed under "factions",
+    respectively as its "collection", "entity" and "downstream" routes
+
+    The depth index depends on the id separator (a regex from the configuration), it's built
+    in a single pass over the paths the first time a separator is used
+
+    The index also holds the RefResolver shared by everything parsing the specification.
+    Every path keeps its position in the specification, so lookups return paths in
+    the order the specification declares them, the same order a scan of spec["paths"] would
+    """
+
+    def __init__(self, open_api_spec: dict):
+        """Indexes a specification
+
+        Args:
+            open_api_spec (dict): the OpenAPI specification
+        """
+        self.paths = open_api_spec.get("paths", {})
+        self.paths_by_segment: Dict[str, List[str]] = {}
+        self.paths_by_method: Dict[str, List[str]] = {}
+        for path, operations in self.paths.items():
+            segments = path.split("/", 2)
+            first_segment = segments[1] if len(segments) > 1 else ""
+            self.paths_by_segment.setdefault(first_segment, []).append(path)
+            for method in operations:
+                self.paths_by_method.setdefault(method, []).append(path)
+        # id separator => resource => (depth, method) => paths, see routes
+        self.route_indexes: Dict[str, Dict[str, Dict[Tuple[str, str], List[str]]]] = {}
+        self.positions = {path: position for position, path in enumerate(self.paths)}
+        self.sorted_segments = sorted(self.paths_by_segment)
+        self.resolver = RefResolver(open_api_spec)
+
+    def endpoints(self) -> List[str]:
+        """Returns each distinct "/{first segment}" in the order it first appears"""
+        return ["/" + segment for segment in self.paths_by_segment]
+
+    def paths_for_resource(self, resource_name: str) -> List[str]:
+        """Returns the paths whose first segment is resource_name"""
+        return self.paths_by_segment.get(resource_name, [])
+
+    def index_routes(self, id_separator: str) -> Dict[str, Dict[Tuple[str, str], List[str]]]:
+        """Builds the depth and method index of every path for an id separator.
+        Each path is only matched against its own resource's route regexes
+
+        Args:
+            id_separator (str): the id separator regex
+
+        Returns:
+            Dict[str, Dict[Tuple[str, str], List[str]]]: resource => (depth, method) => paths,
+                with None as the method for the paths of a depth whatever their methods
+        """
+        index = {}
+        for segment, paths in self.paths_by_segment.items():
+            regexes = (
+                ("collection", compile_route_regex(segment).fullmatch),
+                ("entity", compile_route_regex(segment, id_separator).fullmatch),
+                # match, not fullmatch: downstream routes continue after the separator
+                ("downstream", compile_route_regex(segment, id_separator, "(.+)").match),
+            )
+            routes = index[segment] = {}
+            for path in paths:
+                for depth, matches in regexes:
+                    if matches(path):
+                        routes.setdefault((depth, None), []).append(path)
+                        for method in self.paths[path]:
+                            routes.setdefault((depth, method), []).append(path)
+        return index
+
+    def routes(
+        self, resource_name: str, id_separator: str, depth: str, method: str = None
+    ) -> List[str]:
+        """Returns a resource's paths of a depth, in specification order
+
+        Args:
+            resource_name (str): the resource (first segment)
+            id_separator (str): the id separator regex
+            depth (str): "collection" (/resource), "entity" (/resource/{id})
+                or "downstream" (/resource/{id}/...)
+            method (str, optional): only return the paths with this method. Defaults to None.
+
+        Returns:
+            List[str]: the paths
+        """
+        index = self.route_indexes.get(id_separator)
+        if index is None:
+            index = self.route_indexes[id_separator] = self.index_routes(id_separator)
+        return index.get(resource_name, {}).get((depth, method), [])
+
+    def paths_starting_with(self, endpoint: str) -> List[str]:
+        """Returns the paths that start with endpoint, in specification order.
+        Like str.startswith, the endpoint "/unit" also matches "/units/{id_}"
+
+        Args:
+            endpoint (str): a "/{segment}" endpoint
+
+        Returns:
+            List[str]: the matching paths
+        """
+        prefix = endpoint[1:]
+        start = bisect_left(self.sorted_segments, prefix)
+        segments = []
+        for segment in self.sorted_segments[start:]:
+            if not segment.startswith(prefix):
+                break
+            segments.append(segment)
+        if len(segments) == 1:
+            return self.paths_by_segment[segments[0]]
+        paths = [path for segment in segments for path in self.paths_by_segment[segment]]
+        return sorted(paths, key=self.positions.__getitem__)
+
+    def operations(self, path: str) -> dict:
+        """Returns a path's method => operation object mapping"""
+        return self.paths.get(path, {})
+
+    def request_schema(self, operation: dict) -> dict:
+        """Returns a standalone copy of an operation's application/json requestBody schema
+        with its $refs resolved"""
+        return self.resolver.standalone(get_request_schema(operation))
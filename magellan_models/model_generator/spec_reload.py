@@ -0,0 +1,260 @@
+"""
+    Reloading the Models generated from a specification when the specification changes
+"""
+import os
+import threading
+import time
+from typing import Callable, Union
+from warnings import warn
+import inflection
+from magellan_models.config import MagellanConfig
+from magellan_models.exceptions import MagellanRuntimeException, MagellanRuntimeWarning
+from .generate_dynamic_model import generate_model
+from .generate_from_spec import compile_spec, generate_and_record_model, generate_functions
+from .lazy_mapping import LazyMapping
+from .spec_cache import get_spec_cache_key
+
+# serializes whole reloads (ex: a SpecWatcher and a manual reload_spec call)
+RELOAD_LOCK = threading.Lock()
+
+
+def get_related_model_names(representation: dict) -> set:
+    """Returns the class names a representation's relationship helpers could refer to"""
+    names = set()
+    for relationship in representation.get("relationships", {}):
+        names.add(inflection.camelize(inflection.singularize(relationship)))
+        names.add(inflection.camelize(relationship))
+    return names
+
+
+def apply_entries(mapping, entries: dict, removed: list, lazy: bool) -> None:
+    """Sets (or removes) entries of a generated mapping, hold configuration.reload_lock"""
+    for name, value in entries.items():
+        if lazy:
+            mapping.add_factory(name, value)
+        else:
+            mapping[name] = value
+    for name in removed:
+        if lazy:
+            mapping.remove(name)
+        else:
+            del mapping[name]
+
+
+def reload_spec(new_spec: dict, configuration: MagellanConfig) -> dict:
+    """Regenerates the Models whose representation changed in new_spec
+    and swaps them into the mappings returned when configuration was initialized
+
+    A Model is regenerated if its paths or schemas changed, or if a Model it has a relationship
+    to was added or removed (which changes its relationship helpers). Unchanged Models are kept
+    as is. The new Models and functions are generated first, then swapped into the mappings
+    while holding configuration.reload_lock, so code iterating the mappings under that lock
+    never sees a half applied reload. Code still using a previous class
+    (ex: a MagellanResponse being iterated) keeps working with it.
+
+    Args:
+        new_spec (dict): the new OpenAPI specification
+        configuration (MagellanConfig): a configuration returned by one of the initializers
+
+    Raises:
+        MagellanRuntimeException: Raises if configuration hasn't been used to generate Models
+
+    Returns:
+        dict: a report with the "added", "changed" and "removed" Models,
+            the number of "unchanged" Models, the "functions_added" and "functions_removed"
+            and the "seconds" the reload took
+    """
+    start = time.perf_counter()
+    models = configuration.generated_models
+    if models is None:
+        raise MagellanRuntimeException(
+            "reload_spec needs a configuration that was used to generate Models"
+        )
+    lazy = isinstance(models, LazyMapping)
+
+    with RELOAD_LOCK:
+        model_representations, other_routes = compile_spec(new_spec, configuration)
+        representations = {repres["class_name"]: repres for repres in model_representations}
+        model_names = list(representations.keys())
+
+        with configuration.reload_lock:
+            previous = dict(configuration.generated_representations)
+            current_names = list(models)
+            current_functions = list(configuration.generated_functions)
+            unmaterialized = (
+                {name for name in current_names if not models.is_materialized(name)}
+                if lazy
+                else set()
+            )
+
+        added = [name for name in model_names if name not in current_names]
+        removed = [name for name in current_names if name not in representations]
+        names_changed = set(added) | set(removed)
+
+        changed = []
+        # never generated, so nothing holds them: point their factories at the new spec quietly
+        quiet = []
+        for name, repres in representations.items():
+            if name in names_changed:
+                continue
+            if name in unmaterialized:
+                quiet.append(name)
+                continue
+            if previous.get(name) != repres or get_related_model_names(repres) & names_changed:
+                changed.append(name)
+
+        # build every new entry before touching the live mappings
+        new_models = {}
+        for name in added + changed + quiet:
+            repres = representations[name]
+            if lazy:
+                new_models[name] = lambda repres=repres: generate_and_record_model(
+                    repres, model_names, models, configuration
+                )
+            else:
+                new_models[name] = generate_model(repres, model_names, models, configuration)
+        new_functions = generate_functions(other_routes, configuration, lazy=False)
+        functions_added = [name for name in new_functions if name not in current_functions]
+        functions_removed = [name for name in current_functions if name not in new_functions]
+
+        with configuration.reload_lock:
+            apply_entries(models, new_models, removed, lazy)
+            if not lazy:
+                for name in added + changed:
+                    configuration.generated_representations[name] = representations[name]
+            for name in removed:
+                configuration.generated_representations.pop(name, None)
+            apply_entries(
+                configuration.generated_functions,
+                {
+                    name: (lambda function=function: function) if lazy else function
+                    for name, function in new_functions.items()
+                },
+                functions_removed,
+                lazy,
+            )
+
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": len(model_names) - len(added) - len(changed),
+        "functions_added": functions_added,
+        "functions_removed": functions_removed,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class SpecWatcher:
+    """Polls a specification source and calls reload_spec whenever the specification changes
+
+    The source can be a URL (fetched with the configuration's fetch settings, so an unchanged
+    specification costs a single If-None-Match request with a spec_download_dir),
+    a file path (only read when its modification time changes)
+    or a function returning the specification dict
+    """
+
+    def __init__(
+        self,
+        configuration: MagellanConfig,
+        source: Union[str, Callable[[], dict]],
+        interval: float = 60.0,
+        on_reload: Callable[[dict], None] = None,
+    ):
+        """Creates a SpecWatcher, call start() to poll in a background thread
+
+        Args:
+            configuration (MagellanConfig): a configuration returned by one of the initializers
+            source (Union[str, Callable[[], dict]]): a URL, file path or function
+            interval (float, optional): seconds between checks. Defaults to 60.0.
+            on_reload (Callable[[dict], None], optional): called with each reload report.
+                Defaults to None.
+        """
+        self.configuration = configuration
+        self.source = source
+        self.interval = interval
+        self.on_reload = on_reload
+        self.last_report = None
+        self.__spec_key = None
+        self.__modified_time = None
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def load(self) -> Union[dict, None]:
+        """Returns the source's specification, or None if it's known to be unchanged"""
+        # imported here as the initializers import the model generator
+        from magellan_models.initializers.spec_fetcher import (  # pylint: disable=import-outside-toplevel
+            fetch_spec,
+        )
+        from magellan_models.initializers.spec_loader import (  # pylint: disable=import-outside-toplevel
+            load_spec_content,
+            load_spec_file,
+        )
+
+        if callable(self.source):
+            return self.source()
+        if self.source.startswith(("http://", "https://")):
+            content = fetch_spec(self.source, self.configuration)
+            if self.configuration.initialization_timings.get("fetch_result") in (
+                "not_modified",
+                "cached",
+            ):
+                return None
+            return load_spec_content(content)
+        modified_time = os.stat(self.source).st_mtime
+        if modified_time == self.__modified_time:
+            return None
+        self.__modified_time = modified_time
+        return load_spec_file(self.source)
+
+    def check(self) -> Union[dict, None]:
+        """Checks the source once, reloading if the specification changed
+
+        Returns:
+            Union[dict, None]: the reload report, or None if nothing changed
+        """
+        spec = self.load()
+        if spec is None:
+            return None
+        spec_key = get_spec_cache_key(spec, self.configuration)
+        if spec_key == self.__spec_key:
+            return None
+        self.__spec_key = spec_key
+        report = reload_spec(spec, self.configuration)
+        self.last_report = report
+        if self.on_reload and any_changes(report):
+            self.on_reload(report)
+        return report
+
+    def run(self) -> None:
+        """Checks the source every interval seconds until stop() is called"""
+        while not self.__stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as err:  # pylint: disable=broad-except
+                warn(f"Unable to reload the specification: {err}", MagellanRuntimeWarning)
+
+    def start(self) -> "SpecWatcher":
+        """Starts polling in a daemon thread
+
+        Returns:
+            SpecWatcher: self
+        """
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.run, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops polling"""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+
+def any_changes(report: dict) -> bool:
+    """Checks if a reload report changed anything"""
+    return any(
+        report[key]
+        for key in ("added", "changed", "removed", "functions_added", "functions_removed")
+    )
@@ -17,6 +17,7 @@ REQUIRES_DEV = [
     "pytest-mock>=3.6.1",
 ]
 REQUIRES_DOCS = []
+REQUIRES_NUMPY = ["numpy>=1.16"]
 
 with open("README.md", "r") as fh:
     long_description = fh.read()
@@ -36,6 +37,7 @@ setup(
     extras_require={
         "dev": REQUIRES_DEV,
         "docs": REQUIRES_DOCS,
+        "numpy": REQUIRES_NUMPY,
     },
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -43,4 +45,10 @@ setup(
         "Operating System :: OS Independent",
     ],
     python_requires=">=3.6",
+    entry_points={
+        "console_scripts": [
+            "magellan-export=magellan_models.export:main",
+            "magellan-codegen=magellan_models.codegen:main",
+        ],
+    },
 )
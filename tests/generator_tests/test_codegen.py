@@ -0,0 +1,111 @@
+# pylint: skip-file
+import importlib
+import json
+import sys
+import pytest
+from tests.helper import get_testing_spec
+from magellan_models.codegen import main
+from magellan_models.config import MagellanConfig
+from magellan_models.exceptions import MagellanRuntimeException
+from magellan_models.initializers import initialize_with_spec
+
+ENDPOINT = "https://localhost:3000/api/v1"
+
+
+@pytest.fixture
+def generated_package(tmp_path):
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps(get_testing_spec()))
+    paths = main([str(spec_path), "-o", str(tmp_path / "static_models")])
+    assert len(paths) == 4
+    sys.path.insert(0, str(tmp_path))
+    try:
+        yield importlib.import_module("static_models")
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in list(sys.modules):
+            if name.startswith("static_models"):
+                del sys.modules[name]
+
+
+def make_config(**overrides):
+    config = MagellanConfig()
+    config.api_endpoint = ENDPOINT
+    config.print_on_init = False
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+def test_generated_models_match_runtime_models(generated_package):
+    static_models, static_funcs, _ = generated_package.initialize(make_config())
+    dynamic_models, dynamic_funcs, _ = initialize_with_spec(
+        get_testing_spec(), make_config()
+    )
+    assert static_models.keys() == dynamic_models.keys()
+    assert static_funcs.keys() == dynamic_funcs.keys()
+    for name, Dynamic in dynamic_models.items():
+        Static = static_models[name]
+        assert Static.resource_name() == Dynamic.resource_name()
+        assert Static.list_attributes() == Dynamic.list_attributes()
+        assert Static.list_methods() == Dynamic.list_methods()
+        assert Static.list_relationship_functions() == Dynamic.list_relationship_functions()
+        assert Static.list_downstream_functions() == Dynamic.list_downstream_functions()
+        assert Static.get_post_schema() == Dynamic.get_post_schema()
+        assert Static().representation == Dynamic().representation
+        assert Static.__relationship_template__ == Dynamic.__relationship_template__
+
+
+def test_generated_models_behave_like_runtime_models(generated_package, requests_mock):
+    models, _, _ = generated_package.initialize(make_config())
+    Faction, Unit = models["Faction"], models["Unit"]
+    requests_mock.get(
+        f"{ENDPOINT}/factions/1",
+        status_code=200,
+        json={
+            "data": {
+                "attributes": {"id": "1", "title": "The Hive"},
+                "relationships": {"units": {"data": [{"id": "u1", "type": "unit"}]}},
+            }
+        },
+    )
+    faction = Faction.find("1")
+    assert isinstance(faction, Faction)
+    assert faction.id == "1"
+    assert faction.title == "The Hive"
+    assert faction.description is None
+    faction.title = "The Swarm"
+    assert faction.representation["attributes"]["title"] == "The Swarm"
+    with pytest.raises(AttributeError):
+        faction.not_an_attribute = 1
+    assert not hasattr(faction, "__dict__")
+    assert isinstance(type(faction).__dict__["title"], property)
+
+    faction.add_unit("u2")
+    assert [unit["id"] for unit in faction.units_json()] == ["u1", "u2"]
+    faction.remove_unit("u1")
+    assert [unit["id"] for unit in faction.units_json()] == ["u2"]
+
+    unit = Unit()
+    unit.set_faction(faction)
+    assert unit.faction_json()["id"] == "1"
+    assert unit.faction().title == "The Hive"
+    faction_of_unit = unit.faction()
+    assert unit.faction() is faction_of_unit
+    assert unit.faction(refresh=True) is not faction_of_unit
+
+    requests_mock.get(f"{ENDPOINT}/factions/1/units", status_code=200, json={})
+    faction.downstream_get_units()
+    assert requests_mock.last_request.url == f"{ENDPOINT}/factions/1/units"
+
+
+def test_generated_models_respect_disabled_functions(generated_package):
+    models, _, _ = generated_package.initialize(make_config(disabled_functions=["find"]))
+    with pytest.raises(MagellanRuntimeException):
+        models["Faction"].find("1")
+    assert "find" in models["Faction"].list_methods()
+
+    # initializing again restores the functions disabled before
+    models, _, _ = generated_package.initialize(make_config())
+    assert "find" not in models["Faction"].list_methods()
+    assert models["Faction"].find.__name__ == "find"
@@ -0,0 +1,74 @@
+# pylint: skip-file
+from unittest.mock import patch
+from tests.helper import get_testing_spec
+from magellan_models.config import MagellanConfig
+from magellan_models.initializers import initialize_with_spec
+from magellan_models.model_generator.lazy_mapping import LazyMapping
+
+ENDPOINT = "https://localhost:3000/api/v1"
+
+
+def make_config(**overrides):
+    config = MagellanConfig()
+    config.api_endpoint = ENDPOINT
+    config.print_on_init = False
+    config.cache_compiled_specs = False
+    config.lazy_generation = True
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+def test_models_are_generated_on_first_access():
+    with patch(
+        "magellan_models.model_generator.generate_from_spec.get_model_representation"
+    ) as get_representation:
+        models, funcs, _ = initialize_with_spec(get_testing_spec(), make_config())
+        assert isinstance(models, LazyMapping)
+        assert set(models) == {"Faction", "Unit", "InsufficientModel"}
+        assert "Faction" in models
+        get_representation.assert_not_called()
+        assert models.materialized() == []
+
+
+def test_lazy_models_match_eager_models():
+    lazy_models, lazy_funcs, _ = initialize_with_spec(get_testing_spec(), make_config())
+    eager_models, eager_funcs, _ = initialize_with_spec(
+        get_testing_spec(), make_config(lazy_generation=False)
+    )
+    Faction = lazy_models["Faction"]
+    assert lazy_models["Faction"] is Faction
+    assert lazy_models.materialized() == ["Faction"]
+    assert Faction.list_methods() == eager_models["Faction"].list_methods()
+    assert set(lazy_funcs) == set(eager_funcs)
+    assert lazy_funcs.materialized() == []
+
+
+def test_relationship_helpers_resolve_lazily(requests_mock):
+    models, _, _ = initialize_with_spec(get_testing_spec(), make_config())
+    unit = models["Unit"]()
+    unit.set_faction_id("1")
+    assert "Faction" not in models.materialized()
+
+    requests_mock.get(
+        f"{ENDPOINT}/factions/1",
+        status_code=200,
+        json={"data": {"attributes": {"id": "1", "title": "The Hive"}}},
+    )
+    assert unit.faction().title == "The Hive"
+    assert "Faction" in models.materialized()
+
+
+def test_allow_and_deny_lists_limit_models():
+    models, _, _ = initialize_with_spec(
+        get_testing_spec(), make_config(allowed_resources=["factions", "Unit"])
+    )
+    assert set(models) == {"Faction", "Unit"}
+
+    models, _, _ = initialize_with_spec(
+        get_testing_spec(),
+        make_config(lazy_generation=False, denied_resources=["Unit"]),
+    )
+    assert "Unit" not in models
+    # helpers are only generated for relationships to Models that exist
+    assert "Faction" in models and "units" not in models["Faction"].list_methods()
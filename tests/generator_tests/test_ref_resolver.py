@@ -0,0 +1,105 @@
+# pylint: skip-file
+from copy import deepcopy
+import pytest
+from tests.helper import get_testing_spec
+from magellan_models.config import MagellanConfig
+from magellan_models.exceptions import MagellanParserWarning
+from magellan_models.model_generator.model_parser import get_model_representation
+from magellan_models.model_generator.ref_resolver import RefResolver
+
+
+def test_nested_refs_are_resolved_and_shared():
+    spec = {
+        "components": {
+            "Name": {"type": "string"},
+            "Pair": {
+                "type": "object",
+                "properties": {
+                    "first": {"$ref": "#/components/Name"},
+                    "second": {"$ref": "#/components/Name"},
+                },
+            },
+            "Plain": {"type": "object", "properties": {"a": {"type": "integer"}}},
+            "a/b": {"type": "boolean"},
+        }
+    }
+    resolver = RefResolver(spec)
+    pair = resolver.resolve({"$ref": "#/components/Pair"})
+    assert pair["properties"]["first"] == {"type": "string"}
+    assert pair["properties"]["first"] is pair["properties"]["second"]
+    assert resolver.resolve({"$ref": "#/components/Pair"}) is pair
+    # schemas without refs aren't copied
+    assert resolver.resolve(spec["components"]["Plain"]) is spec["components"]["Plain"]
+    assert resolver.resolve({"$ref": "#/components/a~1b"}) == {"type": "boolean"}
+    with pytest.warns(MagellanParserWarning):
+        assert resolver.resolve({"$ref": "#/components/Missing"}) == {}
+
+
+def test_recursive_refs_are_left_in_place():
+    spec = {
+        "components": {
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "children": {"type": "array", "items": {"$ref": "#/components/Node"}}
+                },
+            }
+        }
+    }
+    resolver = RefResolver(spec)
+    with pytest.warns(MagellanParserWarning):
+        node = resolver.resolve({"$ref": "#/components/Node"})
+    assert node["properties"]["children"]["items"] == {"$ref": "#/components/Node"}
+    assert resolver.cyclic_pointers() == {"#/components/Node"}
+
+
+def test_standalone_schemas_are_copies_with_resolvable_cycles():
+    import jsonschema
+
+    spec = {
+        "components": {
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "children": {"type": "array", "items": {"$ref": "#/components/Node"}},
+                },
+            },
+            "Plain": {"type": "object", "properties": {"a": {"type": "integer"}}},
+        }
+    }
+    resolver = RefResolver(spec)
+    with pytest.warns(MagellanParserWarning):
+        tree = resolver.standalone({"$ref": "#/components/Node"})
+    assert tree["properties"]["children"]["items"] == {"$ref": "#/definitions/components~1Node"}
+    jsonschema.validate({"name": "root", "children": [{"name": "leaf", "children": []}]}, tree)
+    with pytest.raises(jsonschema.ValidationError):
+        jsonschema.validate({"children": [{"children": [{"name": 1}]}]}, tree)
+
+    plain = resolver.standalone(spec["components"]["Plain"])
+    assert plain == spec["components"]["Plain"]
+    plain["properties"]["a"]["type"] = "string"
+    assert spec["components"]["Plain"]["properties"]["a"]["type"] == "integer"
+    assert resolver.standalone({"$ref": "#/components/Node"}) is not resolver.standalone(
+        {"$ref": "#/components/Node"}
+    )
+
+
+def test_model_representation_resolves_nested_attribute_and_request_refs():
+    spec = deepcopy(get_testing_spec())
+    components = spec["components"]
+    attributes = components["FactionSchema"]["properties"]["data"]["properties"][
+        "attributes"
+    ]["properties"]
+    components["Title"] = {"type": "string"}
+    components["Keywords"] = {"type": "array", "items": {"$ref": "#/components/Title"}}
+    attributes["title"] = {"$ref": "#/components/Title"}
+    attributes["keywords"] = {"$ref": "#/components/Keywords"}
+    spec["paths"]["/factions"]["post"]["requestBody"]["content"]["application/json"][
+        "schema"
+    ] = {"$ref": "#/components/FactionSchema"}
+
+    representation = get_model_representation(spec, "factions", MagellanConfig())
+    assert representation["attributes"]["title"] is str
+    assert representation["attributes"]["keywords"] is list
+    assert "$ref" not in str(representation["post_req_schema"])
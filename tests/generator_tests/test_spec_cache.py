@@ -0,0 +1,71 @@
+import os
+from copy import deepcopy
+import pytest
+from unittest.mock import patch
+from tests.helper import get_testing_spec
+from magellan_models.config import MagellanConfig
+from magellan_models.initializers import initialize_with_spec
+from magellan_models.exceptions import MagellanParserWarning
+from magellan_models.model_generator.spec_cache import (
+    clear_spec_cache,
+    get_spec_cache_key,
+)
+
+PARSER = "magellan_models.model_generator.generate_from_spec.get_resource_mapping"
+
+
+def make_config(tmp_path):
+    config = MagellanConfig()
+    config.print_on_init = False
+    config.spec_cache_dir = str(tmp_path)
+    return config
+
+
+def test_warm_start_rebuilds_models_from_cache_file(tmp_path):
+    config = make_config(tmp_path)
+    clear_spec_cache(config)
+    cold_models, cold_funcs, _ = initialize_with_spec(get_testing_spec(), config)
+    assert len(os.listdir(tmp_path)) == 1
+
+    # a new process only has the cache file
+    clear_spec_cache()
+    with patch(PARSER, side_effect=AssertionError("spec was parsed")):
+        warm_models, warm_funcs, _ = initialize_with_spec(get_testing_spec(), config)
+
+    assert warm_models.keys() == cold_models.keys()
+    assert warm_funcs.keys() == cold_funcs.keys()
+    for name, Model in cold_models.items():
+        assert warm_models[name].list_attributes() == Model.list_attributes()
+    clear_spec_cache(config)
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_key_depends_on_spec_and_parsing_config():
+    config = MagellanConfig()
+    spec = deepcopy(get_testing_spec())
+    key = get_spec_cache_key(spec, config)
+    config.jwt = "not a parsing field"
+    assert get_spec_cache_key(spec, config) == key
+    config.id_separator = "{id}"
+    assert get_spec_cache_key(spec, config) != key
+    spec["paths"]["/new_thing"] = {}
+    assert get_spec_cache_key(spec, MagellanConfig()) != key
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    config = make_config(tmp_path)
+    clear_spec_cache()
+    key = get_spec_cache_key(get_testing_spec(), config)
+    (tmp_path / f"magellan_spec_{key}.json").write_text("{not json")
+    with pytest.warns(MagellanParserWarning):
+        models, _, _ = initialize_with_spec(get_testing_spec(), config)
+    assert "Faction" in models
+    clear_spec_cache(config)
+
+
+def test_cache_can_be_disabled(tmp_path):
+    config = make_config(tmp_path)
+    config.cache_compiled_specs = False
+    clear_spec_cache()
+    initialize_with_spec(get_testing_spec(), config)
+    assert os.listdir(tmp_path) == []
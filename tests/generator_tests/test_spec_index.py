@@ -0,0 +1,79 @@
+# pylint: skip-file
+from tests.helper import get_testing_spec
+from magellan_models.model_generator.spec_index import SpecIndex
+from magellan_models.model_generator.openapi_parser import get_resource_mapping
+from magellan_models.model_generator.ref_resolver import RefResolver
+from benchmarks.bench_parser import make_spec
+
+
+def scan_resource_mapping(spec):
+    # the mapping as the parser used to build it, by scanning every route for every endpoint
+    resolver = RefResolver(spec)
+    resources = {}
+    for endpoint in {"/" + route.split("/")[1] for route in spec["paths"]}:
+        routes = []
+        for route in spec["paths"]:
+            if route.startswith(endpoint):
+                for action in spec["paths"][route]:
+                    schema = (
+                        spec["paths"][route][action]
+                        .get("requestBody", {})
+                        .get("content", {})
+                        .get("application/json", {})
+                        .get("schema", {})
+                    )
+                    routes.append(
+                        {
+                            "action": action,
+                            "route": route,
+                            "request_schema": resolver.resolve(schema),
+                        }
+                    )
+        resources[endpoint.split("/")[1]] = {"base_route": endpoint, "routes": routes}
+    return resources
+
+
+def test_index_groups_paths_by_first_segment():
+    index = SpecIndex(
+        {"paths": {"/units": {}, "/unit": {}, "/units/{id_}": {}, "/unit/{id_}/x": {}}}
+    )
+    assert index.endpoints() == ["/units", "/unit"]
+    assert index.paths_for_resource("unit") == ["/unit", "/unit/{id_}/x"]
+    # like str.startswith, in specification order
+    assert index.paths_starting_with("/unit") == [
+        "/units",
+        "/unit",
+        "/units/{id_}",
+        "/unit/{id_}/x",
+    ]
+    assert index.paths_starting_with("/missing") == []
+
+
+def test_indexed_resource_mapping_matches_scanning():
+    for spec in (get_testing_spec(), make_spec(60)):
+        assert get_resource_mapping(spec) == scan_resource_mapping(spec)
+
+
+def test_index_groups_paths_by_depth_and_method():
+    index = SpecIndex(
+        {
+            "paths": {
+                "/units": {"get": {}, "post": {}},
+                "/units/{id_}": {"get": {}, "patch": {}},
+                "/units/{id_}/weapons": {"get": {}},
+                "/units/{id_}/orders": {"post": {}},
+            }
+        }
+    )
+    assert index.routes("units", "{id_}", "collection") == ["/units"]
+    assert index.routes("units", "{id_}", "entity", "patch") == ["/units/{id_}"]
+    assert index.routes("units", "{id_}", "entity", "delete") == []
+    assert index.routes("units", "{id_}", "downstream") == [
+        "/units/{id_}/weapons",
+        "/units/{id_}/orders",
+    ]
+    assert index.routes("units", "{id_}", "downstream", "get") == ["/units/{id_}/weapons"]
+    assert index.paths_by_method["post"] == ["/units", "/units/{id_}/orders"]
+    # the depth index is built once per id separator
+    assert list(index.route_indexes) == ["{id_}"]
+    assert index.routes("units", "{other}", "entity") == []
@@ -0,0 +1,141 @@
+# pylint: skip-file
+import copy
+import threading
+import pytest
+from tests.helper import get_testing_spec
+from magellan_models.config import MagellanConfig
+from magellan_models.exceptions import MagellanRuntimeException
+from magellan_models.initializers import initialize_with_spec
+from magellan_models.model_generator.spec_reload import SpecWatcher
+
+ENDPOINT = "https://localhost:3000/api/v1"
+
+
+def make_config(**overrides):
+    config = MagellanConfig()
+    config.api_endpoint = ENDPOINT
+    config.print_on_init = False
+    config.cache_compiled_specs = False
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+def spec_with_faction_motto():
+    spec = copy.deepcopy(get_testing_spec())
+    attributes = spec["components"]["FactionSchema"]["properties"]["data"]["properties"][
+        "attributes"
+    ]
+    attributes["properties"]["motto"] = {"type": "string"}
+    return spec
+
+
+def test_only_changed_models_are_regenerated():
+    models, _, config = initialize_with_spec(get_testing_spec(), make_config())
+    old_faction, old_unit = models["Faction"], models["Unit"]
+
+    report = config.reload_spec(spec_with_faction_motto())
+    assert report["changed"] == ["Faction"]
+    assert report["added"] == [] and report["removed"] == []
+    assert report["unchanged"] == 2
+    assert models["Unit"] is old_unit
+    assert models["Faction"] is not old_faction
+    assert "motto" in models["Faction"].list_attributes()
+    assert "motto" not in old_faction.list_attributes()
+    # the previous class stays usable for code still holding it
+    faction = old_faction()
+    faction.title = "The Hive"
+    assert faction.title == "The Hive"
+
+    assert config.reload_spec(spec_with_faction_motto())["changed"] == []
+
+
+def test_added_and_removed_resources_and_functions():
+    models, funcs, config = initialize_with_spec(get_testing_spec(), make_config())
+    spec = copy.deepcopy(get_testing_spec())
+    del spec["paths"]["/insufficient_model"]
+    del spec["paths"]["/insufficient_model/{id_}"]
+    del spec["paths"]["/healthcheck"]
+
+    report = config.reload_spec(spec)
+    assert report["removed"] == ["InsufficientModel"]
+    assert "InsufficientModel" not in models
+    assert "get_from_healthcheck" in report["functions_removed"]
+    assert set(report["functions_removed"]) & set(funcs) == set()
+
+    report = config.reload_spec(get_testing_spec())
+    assert report["added"] == ["InsufficientModel"]
+    assert "InsufficientModel" in models
+
+
+def test_lazy_reload_only_swaps_factories():
+    models, _, config = initialize_with_spec(
+        get_testing_spec(), make_config(lazy_generation=True)
+    )
+    old_unit = models["Unit"]
+    report = config.reload_spec(spec_with_faction_motto())
+    assert report["changed"] == []
+    assert models.materialized() == ["Unit"]
+    assert models["Unit"] is old_unit
+    assert "motto" in models["Faction"].list_attributes()
+
+    report = config.reload_spec(get_testing_spec())
+    assert report["changed"] == ["Faction"]
+    assert "Faction" not in models.materialized()
+    assert "motto" not in models["Faction"].list_attributes()
+
+
+def test_reload_needs_generated_models():
+    with pytest.raises(MagellanRuntimeException):
+        make_config().reload_spec(get_testing_spec())
+
+
+def test_watcher_reloads_when_the_spec_changes():
+    models, _, config = initialize_with_spec(get_testing_spec(), make_config())
+    specs = [get_testing_spec(), get_testing_spec(), spec_with_faction_motto()]
+    reports = []
+    watcher = SpecWatcher(config, lambda: specs.pop(0), on_reload=reports.append)
+
+    assert watcher.check()["changed"] == []
+    assert watcher.check() is None
+    assert watcher.check()["changed"] == ["Faction"]
+    assert reports == [watcher.last_report]
+    assert "motto" in models["Faction"].list_attributes()
+
+
+def test_reload_swaps_models_in_under_the_reload_lock():
+    models, funcs, config = initialize_with_spec(get_testing_spec(), make_config())
+    old_faction = models["Faction"]
+    spec = spec_with_faction_motto()
+    del spec["paths"]["/insufficient_model"]
+    del spec["paths"]["/insufficient_model/{id_}"]
+    reports = []
+
+    with config.reload_lock:
+        names = list(models)
+        thread = threading.Thread(target=lambda: reports.append(config.reload_spec(spec)))
+        thread.start()
+        thread.join(0.5)
+        # the reload waits for the lock, the mappings are untouched meanwhile
+        assert thread.is_alive()
+        assert list(models) == names and models["Faction"] is old_faction
+    thread.join()
+
+    assert reports[0]["changed"] == ["Faction"]
+    assert reports[0]["removed"] == ["InsufficientModel"]
+    assert "InsufficientModel" not in models
+    assert "InsufficientModel" not in config.generated_representations
+    assert "motto" in models["Faction"].list_attributes()
+
+
+def test_concurrent_reloads_run_one_after_the_other():
+    models, _, config = initialize_with_spec(get_testing_spec(), make_config())
+    specs = [spec_with_faction_motto(), get_testing_spec()] * 3
+    threads = [threading.Thread(target=config.reload_spec, args=(spec,)) for spec in specs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(models) == sorted(config.generated_representations)
+    assert config.reload_spec(get_testing_spec())["changed"] in ([], ["Faction"])
+    assert config.reload_spec(get_testing_spec())["changed"] == []
@@ -0,0 +1,66 @@
+#pylint: skip-file
+import json
+import pytest
+import requests
+from tests.helper import get_testing_spec
+from magellan_models import MagellanConfig, initialize_with_endpoint
+from magellan_models.exceptions import MagellanParserException, MagellanRuntimeWarning
+from magellan_models.initializers.spec_fetcher import fetch_spec
+
+SPEC_URL = "https://localhost/api/v1/openapi.json"
+
+
+def make_config(tmp_path, **overrides):
+    config = MagellanConfig()
+    config.print_on_init = False
+    config.spec_download_dir = str(tmp_path)
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+def test_spec_is_revalidated_with_its_etag(requests_mock, tmp_path):
+    config = make_config(tmp_path, spec_fetch_timeout=5)
+    body = json.dumps(get_testing_spec()).encode()
+    requests_mock.get(SPEC_URL, status_code=200, content=body, headers={"ETag": '"v1"'})
+    assert fetch_spec(SPEC_URL, config) == body
+    assert config.initialization_timings["fetch_result"] == "network"
+    assert requests_mock.last_request.timeout == 5
+
+    requests_mock.get(SPEC_URL, status_code=304)
+    assert fetch_spec(SPEC_URL, config) == body
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+    assert config.initialization_timings["fetch_result"] == "not_modified"
+
+
+def test_stale_copy_is_used_when_revalidation_fails(requests_mock, tmp_path):
+    config = make_config(tmp_path)
+    requests_mock.get(SPEC_URL, status_code=200, json=get_testing_spec())
+    initialize_with_endpoint(SPEC_URL, config)
+
+    requests_mock.get(SPEC_URL, exc=requests.exceptions.ConnectTimeout)
+    with pytest.warns(MagellanRuntimeWarning):
+        models, _, _ = initialize_with_endpoint(SPEC_URL, config)
+    assert "Faction" in models
+    assert config.initialization_timings["fetch_result"] == "stale"
+
+    requests_mock.get(SPEC_URL, status_code=503)
+    with pytest.warns(MagellanRuntimeWarning):
+        fetch_spec(SPEC_URL, config)
+
+
+def test_fresh_copy_skips_the_request(requests_mock, tmp_path):
+    config = make_config(tmp_path, spec_download_max_age=60)
+    requests_mock.get(SPEC_URL, status_code=200, json=get_testing_spec())
+    fetch_spec(SPEC_URL, config)
+    fetch_spec(SPEC_URL, config)
+    assert requests_mock.call_count == 1
+    assert config.initialization_timings["fetch_result"] == "cached"
+
+
+def test_failure_without_a_copy_raises(requests_mock, tmp_path):
+    requests_mock.get(SPEC_URL, exc=requests.exceptions.ConnectionError)
+    with pytest.raises(MagellanParserException):
+        fetch_spec(SPEC_URL, make_config(tmp_path))
+    with pytest.raises(MagellanParserException):
+        fetch_spec(SPEC_URL, make_config(tmp_path, spec_download_dir=None))
@@ -0,0 +1,49 @@
+#pylint: skip-file
+import json
+import pytest
+import yaml
+from tests.helper import get_testing_spec
+from magellan_models import initialize_with_yaml_file, MagellanConfig
+from magellan_models.initializers import spec_loader
+from magellan_models.initializers.spec_loader import parse_spec, load_spec_file
+
+
+def test_json_documents_take_the_json_path():
+    spec, parser = parse_spec(json.dumps(get_testing_spec()).encode())
+    assert parser == "json"
+    assert spec == get_testing_spec()
+
+
+def test_yaml_documents_use_the_c_loader_when_available():
+    spec, parser = parse_spec("openapi: 3.0.0\npaths: {}\n")
+    assert spec == {"openapi": "3.0.0", "paths": {}}
+    expected = "CSafeLoader" if hasattr(yaml, "CSafeLoader") else "SafeLoader"
+    assert parser == expected
+
+    # flow style YAML that isn't JSON falls back to yaml
+    assert parse_spec("{openapi: 3.0.0}")[0] == {"openapi": "3.0.0"}
+
+
+def test_pure_python_loader_is_the_fallback(monkeypatch):
+    monkeypatch.setattr(spec_loader, "YAML_LOADER", yaml.SafeLoader)
+    assert parse_spec("a: 1")[1] == "SafeLoader"
+
+
+def test_unsafe_yaml_tags_are_rejected():
+    with pytest.raises(yaml.YAMLError):
+        parse_spec("!!python/object/apply:os.getcwd []")
+
+
+def test_initialization_timings_are_recorded():
+    config = MagellanConfig()
+    config.print_on_init = False
+    initialize_with_yaml_file("./tests/initializer_tests/swagger.yaml", config)
+    timings = config.initialization_timings
+    assert timings["load"] > 0 and timings["generate"] > 0
+    assert timings["parser"] in ("CSafeLoader", "SafeLoader")
+
+
+def test_json_files_load_through_yaml_initializer(tmp_path):
+    path = tmp_path / "openapi.json"
+    path.write_text(json.dumps(get_testing_spec()))
+    assert load_spec_file(str(path)) == get_testing_spec()
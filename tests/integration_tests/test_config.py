@@ -15,3 +15,11 @@ def test_meta_generator_default(requests_mock):
     )
     assert meta.get("meta") == {"hello": "world"}
     assert meta.get("links") == {}
+
+
+def test_total_count_hook_reads_the_configured_meta_keys():
+    conf = MagellanConfig()
+    assert conf.get_total_count_from_meta({"meta": {"total": 12}}) == 12
+    assert conf.get_total_count_from_meta({"meta": {}, "links": {}}) is None
+    conf.total_count_meta_keys = ["entity_count"]
+    assert conf.get_total_count_from_meta({"meta": {"entity_count": 20}}) == 20
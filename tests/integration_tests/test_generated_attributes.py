@@ -189,9 +189,8 @@ def test_relationships_helper_getter(generated_models, requests_mock):
         json={"data": []},
     )
 
-    fac.units()
-    assert requests_mock.called
     assert len(fac.units()) == 0
+    assert requests_mock.called
     elem_count = 0
     for elem in fac.units():
         elem_count += 1
@@ -349,3 +348,120 @@ def test_single_get_relationship_func(generated_models, requests_mock):
     assert requests_mock.called
     assert requests_mock.call_count == 1
     assert fac.id == "ABC"
+
+
+def test_relationship_helpers_are_memoized_until_the_relationship_changes(
+    generated_models, requests_mock
+):
+    Unit = generated_models["Unit"]
+    endpoint = Unit.configuration().api_endpoint
+    for faction_id in ("ABC", "DEF"):
+        requests_mock.get(
+            f"{endpoint}/factions/{faction_id}",
+            status_code=200,
+            json={"data": {"attributes": {"id": faction_id}}},
+        )
+    unit = Unit()
+    unit.set_faction_id("ABC")
+
+    fac = unit.faction()
+    assert unit.faction() is fac
+    assert requests_mock.call_count == 1
+    assert unit.faction(refresh=True) is not fac
+    assert requests_mock.call_count == 2
+
+    unit.set_faction_id("DEF")
+    assert unit.faction().id == "DEF"
+    assert requests_mock.call_count == 3
+
+    unit.invalidate_relationships()
+    assert unit.faction().id == "DEF"
+    assert requests_mock.call_count == 4
+
+
+def test_many_relationship_helper_is_memoized_per_kwargs(generated_models, requests_mock):
+    Faction = generated_models["Faction"]
+    requests_mock.get(
+        f"{Faction.configuration().api_endpoint}/units",
+        status_code=200,
+        json={"data": [{"attributes": {"id": "1"}}], "links": {}},
+    )
+    fac = Faction()
+    fac.add_unit("1")
+
+    units = fac.units()
+    assert [unit.id for unit in units] == ["1"]
+    assert [unit.id for unit in fac.units()] == ["1"]
+    assert fac.units()[0] is units[0]
+    assert requests_mock.call_count == 1
+    assert [unit.id for unit in fac.units(sort="id")] == ["1"]
+    assert requests_mock.call_count == 2
+
+    fac.add_unit("2")
+    assert fac.units()[0] is not units[0]
+    assert requests_mock.call_count == 3
+    fac.remove_unit("2")
+    fac.units()
+    assert requests_mock.call_count == 4
+
+
+def test_chaining_on_a_memoized_many_relationship_leaves_it_unchanged(
+    generated_models, requests_mock
+):
+    import json
+
+    Faction = generated_models["Faction"]
+
+    def units(request, context):
+        filters = json.loads(request.qs["filter"][0])[0]["and"]
+        titled = any(f["name"] == "title" for f in filters)
+        return {"data": [] if titled else [{"attributes": {"id": "1"}}], "links": {}}
+
+    requests_mock.get(f"{Faction.configuration().api_endpoint}/units", json=units)
+    fac = Faction()
+    fac.add_unit("1")
+
+    assert [unit.id for unit in fac.units()] == ["1"]
+    assert list(fac.units().where(title="zergling")) == []
+    assert requests_mock.call_count == 2
+    assert len(fac.units().limit(0)) == 0
+    assert [unit.id for unit in fac.units()] == ["1"]
+    assert requests_mock.call_count == 2
+
+
+def test_new_instances_get_independent_relationship_skeletons(generated_models):
+    Faction = generated_models["Faction"]
+    first, second = Faction(), Faction()
+    assert first.representation == {
+        "attributes": {},
+        "relationships": {"units": {"data": []}},
+    }
+    first.add_unit("1")
+    assert second.representation["relationships"]["units"] == {"data": []}
+
+
+def test_from_json_uses_the_payload_without_building_an_empty_instance(generated_models):
+    from unittest.mock import patch
+
+    Unit = generated_models["Unit"]
+    payload = {"data": {"attributes": {"id": "1", "title": "unit"}, "relationships": {}}}
+    with patch("inflection.pluralize") as pluralize:
+        unit = Unit.from_json(payload, loaded_attributes=["title"])
+        Unit()
+    pluralize.assert_not_called()
+    assert unit.representation is payload["data"]
+    assert unit.loaded_attributes() == {"title"}
+    assert unit.title == "unit"
+
+
+def test_attributes_are_properties_over_slots(generated_models):
+    Faction = generated_models["Faction"]
+    assert isinstance(Faction.__dict__["title"], property)
+    fac = Faction()
+    assert not hasattr(fac, "__dict__")
+    fac.title = "slotted"
+    assert fac.get_instance_attribute("title") == "slotted"
+    with pytest.raises(AttributeError):
+        fac.not_an_attribute = "value"
+    with pytest.raises(AttributeError, match="No such attribute"):
+        fac.not_an_attribute
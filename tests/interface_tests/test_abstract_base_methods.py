@@ -182,11 +182,12 @@ def test_query_call_parses_filters_properly(requests_mock):
     route = "http://localhost:80/api/v1/test_models?filter=%5B%7B%22name%22%3A+%22title%22%2C+%22op%22%3A+%22eq%22%2C+%22val%22%3A+%22testTitle%22%7D%5D"
 
     requests_mock.get(route, status_code=200, json={"data": []})
-    FakeModel.query(
+    response = FakeModel.query(
         parameters={
             "filter": json.dumps([{"name": "title", "op": "eq", "val": "testTitle"}])
         }
     )
+    assert len(response) == 0
     assert requests_mock.called
     assert requests_mock.call_count == 1
 
@@ -277,7 +278,7 @@ def test_where_with_args_calls_create_filters(requests_mock):
         return_value=json.dumps({"filter": {"title": "fauxTitle"}}),
     ) as mock_filter_func:
         requests_mock.get(base_route + options, status_code=200, json={"data": []})
-        FakeModel.where(title="fauxTitle")
+        len(FakeModel.where(title="fauxTitle"))
     mock_filter_func.assert_called()
     mock_filter_func.assert_called_with(title="fauxTitle")
     assert requests_mock.called
@@ -300,9 +301,10 @@ def test_where_iterates_through_response(requests_mock):
     )
 
     instances = FakeModel.where()
-    assert requests_mock.called
+    assert not requests_mock.called  # nothing is requested until results are needed
 
     assert len(instances) == 3
+    assert requests_mock.called
 
 
 def test_where_with_header_args_doesnt_put_them_in_the_filter(requests_mock):
@@ -315,7 +317,7 @@ def test_where_with_header_args_doesnt_put_them_in_the_filter(requests_mock):
     ) as mocked_filters:
         FakeModel.configuration().header_args_separator = "header"
         requests_mock.get(base_route, status_code=200, json={"data": []})
-        FakeModel.where(header="foobar")
+        len(FakeModel.where(header="foobar"))
 
     mocked_filters.assert_called()
     mocked_filters.assert_called_with()
@@ -330,7 +332,7 @@ def test_where_sends_args_to_filter_func(requests_mock):
         fakeConfig, "create_filters", return_value={"filter": json.dumps([{"and": []}])}
     ) as mocked_filters:
         requests_mock.get(base_route, status_code=200, json={"data": []})
-        FakeModel.where(name="foobar")
+        len(FakeModel.where(name="foobar"))
     mocked_filters.assert_called()
     mocked_filters.assert_called_with(name="foobar")
 
@@ -432,3 +434,19 @@ def test_patch_fails_if_errors_out(requests_mock):
     assert "400" in str(excinfo.value)
     assert requests_mock.called
     assert fake.title == "to patch"
+
+
+def test_find_with_fields_requests_sparse_fieldset(requests_mock):
+    route = "/".join(
+        [FakeModel.configuration().api_endpoint, FakeModel.resource_name(), "fake_id"]
+    )
+    requests_mock.get(
+        route + "?fields%5Btest_model%5D=title",
+        status_code=200,
+        json={"data": {"attributes": {"id": "fake_id", "title": "fakeTitle"}}},
+    )
+    instance = FakeModel.find("fake_id", fields=["title"])
+    assert requests_mock.called
+    assert instance.loaded_attributes() == {"title"}
+    assert instance.attribute_is_loaded("title")
+    assert not instance.attribute_is_loaded("description")
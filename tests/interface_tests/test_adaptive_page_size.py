@@ -0,0 +1,30 @@
+from magellan_models.interface.adaptive_page_size import AdaptivePageSize
+
+
+def test_page_size_scales_towards_the_target_time():
+    sizer = AdaptivePageSize(10, 1000, target_seconds=1.0)
+    assert sizer.size == 10
+    sizer.observe(10, 10, seconds=0.01, body_bytes=1000, has_next=True)
+    assert sizer.size == 20  # at most doubles per page
+    sizer.observe(20, 20, seconds=0.8, body_bytes=2000, has_next=True)
+    assert sizer.size == 25
+    sizer.observe(25, 25, seconds=5.0, body_bytes=2500, has_next=True)
+    assert sizer.size == 12  # at most halves per page
+    sizer.observe(12, 12, seconds=60.0, body_bytes=1200, has_next=True)
+    assert sizer.size == 10  # never under the minimum
+
+
+def test_page_size_respects_body_size_and_server_maximums():
+    sizer = AdaptivePageSize(10, 1000, target_seconds=1.0, max_page_bytes=50_000)
+    sizer.size = 400
+    sizer.observe(400, 400, seconds=0.1, body_bytes=400_000, has_next=True)
+    assert sizer.size == 50  # 1kB per record
+
+    sizer = AdaptivePageSize(10, 1000, target_seconds=1.0)
+    sizer.size = 400
+    sizer.observe(400, 250, seconds=0.1, body_bytes=1000, has_next=True)
+    assert sizer.ceiling == 250 and sizer.size == 250
+    assert not sizer.reject(250, 500)
+    assert sizer.reject(250, 400)
+    assert sizer.ceiling == 125 and sizer.size == 125
+    assert not sizer.reject(10, 400)
@@ -38,9 +38,9 @@ def test_const_mag_resp_gets_further_pages_to_hit_limit(
         url_path=route, Model=Faction, config=config, limit=15, raw_params={}
     )
 
+    assert len(mag_resp) == 10
     assert requests_mock.called
     assert requests_mock.call_count == 1  # Shouldn't hit second page until needed
-    assert len(mag_resp) == 10
 
     count = 0
     for elem in mag_resp:
@@ -79,9 +79,9 @@ def test_const_mag_resp_exceptions_on_where_and_limit(requests_mock, generated_m
         url_path=route, Model=Faction, config=config, limit=9, raw_params={}
     )
 
+    assert len(mag_resp) == 9
     assert requests_mock.called
     assert requests_mock.call_count == 1  # Shouldn't hit second page until needed
-    assert len(mag_resp) == 9
 
     with pytest.raises(MagellanRuntimeException):
         mag_resp.where(id=12)
@@ -115,8 +115,9 @@ def test_const_mag_resp_returns_when_next_page_is_none(requests_mock, generated_
         url_path=route, Model=Faction, config=config, limit=9, raw_params={}
     )
 
+    assert len(mag_resp) == 9
     assert requests_mock.called
     assert requests_mock.call_count == 1  # Shouldn't hit second page until needed
 
     assert mag_resp.next_url is None
-    assert mag_resp.process_next_page_of_results() is None
+    assert mag_resp.process_next_page_of_results() == []
@@ -0,0 +1,163 @@
+# pylint: skip-file
+import pytest
+from magellan_models.interface import LocalCollection, MagellanResponse
+
+
+def make_factions(Faction, count=10):
+    return [
+        Faction.from_json(
+            {
+                "data": {
+                    "attributes": {
+                        "id": str(i),
+                        "title": f"Faction {i}" if i % 2 else f"faction {i}",
+                        "description": None if i == 3 else "desc",
+                        "keywords": ["even" if i % 2 == 0 else "odd"],
+                    }
+                }
+            }
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters, expected_ids",
+    [
+        ({"id": "4"}, ["4"]),
+        ({"id": ["1", "2", "9"], "filtering_arguments": {"id": "in"}}, ["1", "2", "9"]),
+        ({"id": "5", "filtering_arguments": {"id": "gt"}}, ["6", "7", "8", "9"]),
+        ({"id": "2", "filtering_arguments": {"id": "le"}}, ["0", "1", "2"]),
+        ({"title": "Faction %", "filtering_arguments": {"title": "like"}}, ["1", "3", "5", "7", "9"]),
+        ({"title": "FACTION _", "filtering_arguments": {"title": "ilike"}}, [str(i) for i in range(10)]),
+        ({"description": None, "filtering_arguments": {"description": "is_"}}, ["3"]),
+        ({"description": "desc", "filtering_arguments": {"description": "ne"}}, ["3"]),
+        ({"keywords": "odd", "filtering_arguments": {"keywords": "any"}}, ["1", "3", "5", "7", "9"]),
+        ({"id": "1", "title": "Faction 1"}, ["1"]),
+    ],
+)
+def test_local_operations(generated_models, filters, expected_ids):
+    Faction = generated_models["Faction"]
+    collection = LocalCollection(Faction, make_factions(Faction), indexes=["id"])
+    assert [inst.id for inst in collection.where(**filters)] == expected_ids
+
+
+def test_local_where_sorts_and_limits(generated_models):
+    Faction = generated_models["Faction"]
+    collection = LocalCollection(Faction, make_factions(Faction))
+    results = collection.where(sort="-id", limit=3)
+    assert [inst.id for inst in results] == ["9", "8", "7"]
+    assert results.iteration_is_complete()
+
+
+def test_local_first_exists_and_one(generated_models):
+    from magellan_models.exceptions import MagellanRuntimeException
+
+    Faction = generated_models["Faction"]
+    collection = LocalCollection(Faction, make_factions(Faction), indexes=["id"])
+    assert collection.where(id="4").one().id == "4"
+    assert collection.where(sort="-id").first().id == "9"
+    assert collection.where(id="missing").first() is None
+    assert not collection.where(id="missing").exists()
+    assert collection.count() == 10
+    with pytest.raises(MagellanRuntimeException):
+        collection.one()
+
+
+def test_registered_collection_answers_where_and_find_by(
+    requests_mock, generated_models
+):
+    Faction = generated_models["Faction"]
+    Faction.use_local_collection(
+        LocalCollection(Faction, make_factions(Faction), indexes=["id", "title"])
+    )
+    try:
+        assert Faction.find_by_title("Faction 7").id == "7"
+        assert Faction.find_by_id("missing") is None
+        assert len(Faction.where(keywords="even", filtering_arguments={"keywords": "any"})) == 5
+        assert not requests_mock.called
+
+        # operations that can't be evaluated locally still go to the API
+        route = f"{Faction.configuration().api_endpoint}/{Faction.resource_name()}"
+        requests_mock.get(route, status_code=200, json={"data": []})
+        response = Faction.where(title="x", filtering_arguments={"title": "match"})
+        assert isinstance(response, MagellanResponse)
+        assert len(response) == 0
+        assert requests_mock.called
+    finally:
+        Faction.use_local_collection(None)
+
+
+def test_response_to_local_collection_evaluates_fully(requests_mock, generated_models):
+    Faction = generated_models["Faction"]
+    route = f"{Faction.configuration().api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route,
+        status_code=200,
+        json={"data": [{"attributes": {"id": "1"}}], "links": {"next": route + "?page2"}},
+    )
+    requests_mock.get(
+        route + "?page2", status_code=200, json={"data": [{"attributes": {"id": "2"}}]}
+    )
+    collection = Faction.where().to_local_collection(indexes=["id"])
+    assert len(collection) == 2
+    assert collection.indexed_attributes() == ["id"]
+    assert collection.where(id="2")[0].id == "2"
+
+
+def test_local_answers_keep_the_magellan_response_interface(
+    requests_mock, generated_models
+):
+    Faction = generated_models["Faction"]
+    collection = LocalCollection(Faction, make_factions(Faction), indexes=["id"])
+    Faction.use_local_collection(collection)
+    try:
+        response = Faction.where(sort=["-title", "id"], limit=3).only("title")
+        assert isinstance(response, MagellanResponse)
+        assert [inst.id for page in response.iter_pages() for inst in page] == ["8", "6", "4"]
+        assert response.count() == 3
+        ordered = Faction.where(id=["7", "2", "5"], filtering_arguments={"id": "in"})
+        assert [inst.id for inst in ordered.ordered_by_filter("id")] == ["7", "2", "5"]
+        assert not requests_mock.called
+
+        # what the collection can't honour goes to the API
+        route = f"{Faction.configuration().api_endpoint}/{Faction.resource_name()}"
+        requests_mock.get(route, status_code=200, json={"data": []})
+        assert len(Faction.where(id="12", filtering_arguments={"id": "in"})) == 0
+        assert len(Faction.where(sort="-not_an_attribute")) == 0
+        assert len(Faction.where(id="1").include("units")) == 0
+        assert requests_mock.call_count == 3
+    finally:
+        Faction.use_local_collection(None)
+
+
+def test_local_limit_applies_after_the_sort(generated_models):
+    Faction = generated_models["Faction"]
+    collection = LocalCollection(Faction, make_factions(Faction))
+    results = collection.where(keywords="even", filtering_arguments={"keywords": "any"}, sort=["-id"], limit=2)
+    assert [inst.id for inst in results] == ["8", "6"]
+
+
+def test_indexed_lookups_keep_the_sort_and_limit(generated_models):
+    Faction = generated_models["Faction"]
+    factions = [
+        Faction.from_json({"data": {"attributes": {"id": i, "title": f"t{i % 3}"}}})
+        for i in range(9)
+    ]
+    indexed = LocalCollection(Faction, factions, indexes=["id", "title"])
+    scanned = LocalCollection(Faction, factions)
+
+    queries = [
+        {"title": "t0", "sort": "-id"},
+        {"title": "t0", "sort": "-id", "limit": 2},
+        {"id": [1, 2, 4, 5], "filtering_arguments": {"id": "in"}, "sort": "-id"},
+        {"id": [1, 2, 4, 5], "filtering_arguments": {"id": "in"}, "sort": ["-id"], "limit": 3},
+    ]
+    for query in queries:
+        expected = [inst.id for inst in scanned.where(**dict(query))]
+        assert [inst.id for inst in indexed.where(**dict(query))] == expected
+    assert [inst.id for inst in indexed.where(title="t0", sort="-id", limit=2)] == [6, 3]
+    assert [
+        inst.id
+        for inst in indexed.where(id=[1, 2, 4, 5], filtering_arguments={"id": "in"}, sort="-id", limit=3)
+    ] == [5, 4, 2]
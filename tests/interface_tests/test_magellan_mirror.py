@@ -0,0 +1,110 @@
+# pylint: skip-file
+import json
+import pytest
+from magellan_models.exceptions import MagellanRuntimeException
+
+
+def faction_payload(i, units=()):
+    return {
+        "attributes": {
+            "id": f"{i:03}",
+            "title": f"Faction {i}",
+            "keywords": ["fake", str(i)],
+        },
+        "relationships": {
+            "units": {"data": [{"id": unit, "type": "unit"} for unit in units]}
+        },
+    }
+
+
+def test_mirror_loads_collection_and_serves_reads_locally(
+    requests_mock, generated_models, tmp_path
+):
+    Faction = generated_models["Faction"]
+    route = f"{Faction.configuration().api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route,
+        status_code=200,
+        json={"data": [faction_payload(i, units=[f"u{i}", "shared"]) for i in range(5)]},
+    )
+    mirror = Faction.mirror(str(tmp_path / "mirror.db"))
+    assert requests_mock.call_count == 1
+    assert len(mirror) == 5
+
+    instance = mirror.find("003")
+    assert instance.title == "Faction 3"
+    assert instance.keywords == ["fake", "3"]
+    assert mirror.find("missing") is None
+    assert [inst.id for inst in mirror.where(title=["Faction 1", "Faction 2"])] == [
+        "001",
+        "002",
+    ]
+    assert mirror.related_ids("002", "units") == ["u2", "shared"]
+    assert requests_mock.call_count == 1
+
+    with pytest.raises(MagellanRuntimeException):
+        mirror.where(price=10)
+
+
+def test_mirror_refresh_only_fetches_past_the_watermark(
+    requests_mock, generated_models, tmp_path
+):
+    Faction = generated_models["Faction"]
+    route = f"{Faction.configuration().api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route, status_code=200, json={"data": [faction_payload(i) for i in range(3)]}
+    )
+    mirror = Faction.mirror(str(tmp_path / "mirror.db"), watermark="id")
+    assert mirror.get_watermark_value() == "002"
+
+    requests_mock.get(
+        route,
+        status_code=200,
+        json={"data": [faction_payload(2), faction_payload(3)]},
+    )
+    assert mirror.refresh() == 2
+    filters = json.loads(requests_mock.last_request.qs["filter"][0])
+    assert filters == [{"and": [{"name": "id", "op": "ge", "val": "002"}]}]
+    assert len(mirror) == 4
+    assert mirror.get_watermark_value() == "003"
+
+    # reopening the database keeps the mirrored records and the watermark
+    mirror.close()
+    reopened = Faction.mirror(
+        str(tmp_path / "mirror.db"), watermark="id", refresh=False
+    )
+    assert len(reopened) == 4
+    assert reopened.get_watermark_value() == "003"
+
+
+def test_mirror_serves_reads_while_a_refresh_requests_pages(
+    requests_mock, generated_models, tmp_path
+):
+    import threading
+
+    Faction = generated_models["Faction"]
+    route = f"{Faction.configuration().api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route, status_code=200, json={"data": [faction_payload(i) for i in range(3)]}
+    )
+    mirror = Faction.mirror(str(tmp_path / "mirror.db"))
+    assert len(mirror) == 3
+
+    reads = []
+
+    def second_page(request, context):
+        # read from another thread while the refresh waits on the network
+        reader = threading.Thread(target=lambda: reads.append(len(mirror)))
+        reader.start()
+        reader.join(timeout=5)
+        return {"data": [faction_payload(5)], "links": {}}
+
+    requests_mock.get(
+        route,
+        status_code=200,
+        json={"data": [faction_payload(1), faction_payload(4)], "links": {"next": f"{route}/page2"}},
+    )
+    requests_mock.get(f"{route}/page2", json=second_page)
+    assert mirror.refresh(full=True) == 3
+    assert reads == [4]  # the first page is committed, stale records are still there
+    assert sorted(inst.id for inst in mirror) == ["001", "004", "005"]
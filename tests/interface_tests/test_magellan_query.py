@@ -0,0 +1,35 @@
+from magellan_models.interface import MagellanQuery
+import pytest
+
+
+def test_queries_are_immutable_and_chain_into_new_queries(generated_models):
+    Faction = generated_models.get("Faction")
+    query = MagellanQuery(Faction, "/factions", 10, {"title": "foo"})
+    narrowed = query.where(id=3, filtering_arguments={"id": "gt"}, limit=5)
+
+    assert query.kwargs == {"title": "foo"} and query.limit == 10
+    assert narrowed.limit == 5
+    assert narrowed.kwargs == {
+        "title": "foo",
+        "id": 3,
+        "filtering_arguments": {"id": "gt"},
+    }
+    with pytest.raises(AttributeError):
+        query.limit = 20
+    query.kwargs["title"] = "changed"
+    assert query.kwargs == {"title": "foo"}
+
+
+def test_equal_queries_hash_the_same(generated_models):
+    Faction = generated_models.get("Faction")
+    first = MagellanQuery(
+        Faction, "/factions", None, {"fields": {"faction": ["id"]}, "a": 1, "b": [1, 2]}
+    )
+    second = MagellanQuery(
+        Faction, "/factions", None, {"b": [1, 2], "a": 1, "fields": {"faction": ["id"]}}
+    )
+    assert first == second
+    assert len({first, second}) == 1
+    assert first != first.where(a=2)
+    assert first != first.with_limit(10)
+    assert first.same_request(first.with_limit(10))
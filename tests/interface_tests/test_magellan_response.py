@@ -1,3 +1,4 @@
+import json
 from magellan_models.interface import MagellanResponse
 from magellan_models.exceptions import MagellanRuntimeException
 import pytest
@@ -12,10 +13,11 @@ def test_magellan_response_initialization_calls_first_url(
     generated_params = "?filter=%5B%7B%22and%22%3A+%5B%5D%7D%5D&page%5Bsize%5D=10"
     requests_mock.get(route + generated_params, status_code=200, json={"data": []})
     mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config, limit=10)
+    assert not requests_mock.called  # nothing is requested until results are needed
+    assert len(mag_resp) == 0
     assert mag_resp.iteration_is_complete()
     assert requests_mock.called
     assert requests_mock.call_count == 1
-    assert len(mag_resp) == 0
 
 
 def test_mag_resp_iterates_properly(requests_mock, generated_models):
@@ -106,9 +108,9 @@ def test_mag_resp_gets_further_pages_to_hit_limit(requests_mock, generated_model
     )
     mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config, limit=15)
 
+    assert len(mag_resp) == 10
     assert requests_mock.called
     assert requests_mock.call_count == 1  # Shouldn't hit second page until needed
-    assert len(mag_resp) == 10
 
     mag_resp[12]  # Trigger second page call
     assert requests_mock.called
@@ -152,9 +154,9 @@ def test_mag_resp_stops_iterating_even_if_limitless_at_end(
         url_path=route, Model=Faction, config=config, limit=None
     )
 
+    assert len(mag_resp) == 10
     assert requests_mock.called
     assert requests_mock.call_count == 1  # Shouldn't hit second page until needed
-    assert len(mag_resp) == 10
 
     mag_resp[12]  # Trigger second page call
 
@@ -202,9 +204,9 @@ def test_mag_resp_process_next_pag_returns_new_entities(
         url_path=route, Model=Faction, config=config, limit=None
     )
 
+    assert len(mag_resp) == 10
     assert requests_mock.called
     assert requests_mock.call_count == 1  # Shouldn't hit second page until needed
-    assert len(mag_resp) == 10
 
     entities = mag_resp.process_next_page_of_results()  # -> shouldn't do much
     assert requests_mock.call_count == 2
@@ -301,10 +303,11 @@ def test_mag_resp_throws_runtime_error_on_failed_call(requests_mock, generated_m
 
     requests_mock.get(route + generated_params, status_code=500, json={})
 
+    mag_resp = MagellanResponse(
+        url_path=route, Model=Faction, config=config, limit=None
+    )
     with pytest.raises(MagellanRuntimeException):
-        mag_resp = MagellanResponse(
-            url_path=route, Model=Faction, config=config, limit=None
-        )
+        len(mag_resp)
     assert requests_mock.called
     assert requests_mock.call_count == 1
 
@@ -338,17 +341,18 @@ def test_chained_where_updates_kwargs(requests_mock, generated_models):
         url_path=route, Model=Faction, config=config, limit=None
     )
 
+    assert len(mag_resp) == 10
     assert requests_mock.call_count == 1
     assert mag_resp.kwargs == {}
 
     mag_resp.where(id=10, filtering_arguments={"id": "gt"})
     assert mag_resp.kwargs == {"id": 10, "filtering_arguments": {"id": "gt"}}
-    assert requests_mock.call_count == 2
+    assert requests_mock.call_count == 1  # the new query runs once results are needed
     assert mag_resp.get_meta_data().get("meta").get("entity_count") == 10
     assert len(mag_resp) == 10
 
 
-def test_chained_where_limit_nukes_internal_state(requests_mock, generated_models):
+def test_chained_where_limit_truncates_without_requesting(requests_mock, generated_models):
     Faction = generated_models.get("Faction")
     config = Faction.configuration()
     route = f"{config.api_endpoint}/{Faction.resource_name()}"
@@ -374,11 +378,11 @@ def test_chained_where_limit_nukes_internal_state(requests_mock, generated_model
         url_path=route, Model=Faction, config=config, limit=None
     )
 
-    assert requests_mock.call_count == 1
     assert len(mag_resp) == 10
+    assert requests_mock.call_count == 1
     mag_resp.where(limit=5)
-    assert requests_mock.call_count == 2
     assert len(mag_resp) == 5
+    assert requests_mock.call_count == 1
 
 
 def test_limit_truncates(requests_mock, generated_models):
@@ -407,14 +411,14 @@ def test_limit_truncates(requests_mock, generated_models):
         url_path=route, Model=Faction, config=config, limit=None
     )
 
-    assert requests_mock.call_count == 1
     assert len(mag_resp) == 10
+    assert requests_mock.call_count == 1
     mag_resp.limit(15)
     assert len(mag_resp) == 10  # Shouldn't truncate
-    assert requests_mock.call_count == 2  # destructive op means redoing a call
+    assert requests_mock.call_count == 1  # no next page, nothing left to request
 
     mag_resp.limit(5)
-    assert requests_mock.call_count == 2
+    assert requests_mock.call_count == 1
     assert len(mag_resp) == 5  # should truncate
 
 
@@ -519,3 +523,754 @@ def test_mag_resp_experimental_filter_simple(requests_mock, generated_models, mo
     mag_resp.where.assert_called_once_with(
         title="foo", filtering_arguments={"title": "eq"}
     )
+
+
+def test_only_requests_sparse_fieldset(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    default_generated_params = "?filter=%5B%7B%22and%22%3A+%5B%5D%7D%5D&"
+    sparse_params = "?fields%5Bfaction%5D=id%2Ctitle"
+    payload_entities = [
+        {"attributes": {"id": i + 1, "title": f"Fake Data {i}"}} for i in range(5)
+    ]
+    requests_mock.get(
+        route + default_generated_params, status_code=200, json={"data": []}
+    )
+    requests_mock.get(
+        route + sparse_params, status_code=200, json={"data": payload_entities}
+    )
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    mag_resp.only("id", "title")
+
+    assert mag_resp.kwargs["fields"] == {"faction": ["id", "title"]}
+    assert len(mag_resp) == 5
+    assert requests_mock.call_count == 1
+    assert mag_resp[0].loaded_attributes() == {"id", "title"}
+    assert mag_resp[0].title == "Fake Data 0"
+
+
+def test_reading_unloaded_attribute_raises_when_configured(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "unloaded_attribute_behavior", "exception")
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route + "?fields%5Bfaction%5D=id",
+        status_code=200,
+        json={"data": [{"attributes": {"id": "abc"}}]},
+    )
+    mag_resp = MagellanResponse(
+        url_path=route, Model=Faction, config=config, fields=["id"]
+    )
+    with pytest.raises(MagellanRuntimeException) as excinfo:
+        mag_resp[0].title
+    assert "title" in str(excinfo.value)
+
+    mag_resp[0].title = "set locally"
+    assert mag_resp[0].title == "set locally"
+
+
+def test_reading_unloaded_attribute_loads_full_record(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route + "?fields%5Bfaction%5D=id%2Ctitle",
+        status_code=200,
+        json={"data": [{"attributes": {"id": "abc", "title": "sparse"}}]},
+    )
+    requests_mock.get(
+        route + "/abc",
+        status_code=200,
+        json={
+            "data": {
+                "attributes": {
+                    "id": "abc",
+                    "title": "full",
+                    "description": "lazily loaded",
+                }
+            }
+        },
+    )
+    mag_resp = MagellanResponse(
+        url_path=route, Model=Faction, config=config, fields=["id", "title"]
+    )
+    instance = mag_resp[0]
+    assert instance.description == "lazily loaded"
+    assert instance.title == "sparse"  # loaded values aren't overwritten
+    assert instance.loaded_attributes() is None
+    assert requests_mock.call_count == 2
+
+
+def test_to_columns_streams_every_page(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    generated_params = "?filter=%5B%7B%22and%22%3A+%5B%5D%7D%5D&"
+
+    payload_entities = [
+        {"attributes": {"id": str(i), "title": f"Fake Data {i}", "keywords": [i]}}
+        for i in range(20)
+    ]
+    first_page = {
+        "data": payload_entities[0:10],
+        "links": {"next": route + generated_params + "page2"},
+    }
+    second_page = {"data": payload_entities[10:]}
+    requests_mock.get(route + generated_params, status_code=200, json=first_page)
+    requests_mock.get(
+        route + generated_params + "page2", status_code=200, json=second_page
+    )
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    columns = mag_resp.to_columns(["id", "title"])
+    assert columns["id"] == [str(i) for i in range(20)]
+    assert columns["title"][19] == "Fake Data 19"
+    assert requests_mock.call_count == 2
+
+
+def test_iter_columns_chunks_rows(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    generated_params = "?filter=%5B%7B%22and%22%3A+%5B%5D%7D%5D&"
+
+    payload_entities = [{"attributes": {"id": str(i)}} for i in range(10)]
+    requests_mock.get(
+        route + generated_params, status_code=200, json={"data": payload_entities}
+    )
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    chunks = list(mag_resp.iter_columns(chunk_size=4))
+    assert [len(chunk["id"]) for chunk in chunks] == [4, 4, 2]
+    assert set(chunks[0].keys()) == set(Faction.list_attributes().keys())
+
+
+def test_columns_respect_the_loaded_fieldset(requests_mock, generated_models, monkeypatch):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route + "?fields%5Bfaction%5D=id%2Ctitle",
+        status_code=200,
+        json={"data": [{"attributes": {"id": str(i), "title": f"t{i}"}} for i in range(3)]},
+    )
+    requests_mock.get(
+        f"{route}/0", json={"data": {"attributes": {"id": "0", "description": "full"}}}
+    )
+    mag_resp = MagellanResponse(
+        url_path=route, Model=Faction, config=config, fields=["id", "title"]
+    )
+    assert mag_resp.to_columns() == {"id": ["0", "1", "2"], "title": ["t0", "t1", "t2"]}
+    assert [list(chunk) for chunk in mag_resp.iter_columns()] == [["id", "title"]]
+
+    monkeypatch.setattr(config, "unloaded_attribute_behavior", "exception")
+    with pytest.raises(MagellanRuntimeException):
+        mag_resp.to_columns(["id", "description"])
+    monkeypatch.setattr(config, "unloaded_attribute_behavior", "load")
+    columns = mag_resp.limit(1).to_columns(["id", "description"])
+    assert columns == {"id": ["0"], "description": ["full"]}
+
+
+def _paged_faction_mocks(requests_mock, route, pages, page_size=10):
+    generated_params = "?filter=%5B%7B%22and%22%3A+%5B%5D%7D%5D&"
+    for page in range(pages):
+        body = {
+            "data": [
+                {"attributes": {"id": str(i), "title": f"Fake Data {i}", "keywords": [i]}}
+                for i in range(page * page_size, (page + 1) * page_size)
+            ]
+        }
+        if page + 1 < pages:
+            body["links"] = {"next": route + generated_params + f"page{page + 2}"}
+        suffix = f"page{page + 1}" if page else ""
+        requests_mock.get(route + generated_params + suffix, status_code=200, json=body)
+
+
+def test_iter_pages_without_retaining_releases_entities(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=3)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    page_ids = [
+        [elem.id for elem in page]
+        for page in mag_resp.iter_pages(retain=False, prefetch=True)
+    ]
+    assert page_ids[2] == [str(i) for i in range(20, 30)]
+    assert len(mag_resp) == 30
+    assert mag_resp.iteration_is_complete()
+    with pytest.raises(MagellanRuntimeException):
+        mag_resp[0]
+
+
+def test_export_ndjson_streams_pages(requests_mock, generated_models, tmp_path):
+    import json
+
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=3)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    progress = []
+
+    stats = mag_resp.export(
+        tmp_path / "factions.ndjson",
+        columns=["id", "title"],
+        progress_callback=progress.append,
+    )
+    lines = (tmp_path / "factions.ndjson").read_text().splitlines()
+    assert len(lines) == 30
+    assert json.loads(lines[29]) == {"id": "29", "title": "Fake Data 29"}
+    assert stats["rows"] == 30 and stats["pages"] == 3
+    assert [entry["rows"] for entry in progress] == [10, 20, 30]
+
+
+def test_export_csv_uses_list_attributes(requests_mock, generated_models, tmp_path):
+    import csv
+
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=2)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    mag_resp.export(tmp_path / "factions.csv", format="csv", prefetch=False)
+    with open(tmp_path / "factions.csv", newline="") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert len(rows) == 20
+    assert rows[3] == {
+        "id": "3",
+        "title": "Fake Data 3",
+        "description": "",
+        "keywords": "[3]",
+    }
+
+
+def test_export_rejects_unknown_formats(requests_mock, generated_models, tmp_path):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=1)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    with pytest.raises(MagellanRuntimeException):
+        mag_resp.export(tmp_path / "factions.xml", format="xml")
+
+
+def test_chained_calls_make_a_single_request(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(route, status_code=200, json={"data": []})
+    mag_resp = (
+        Faction.where(title="foo")
+        .where(id=3, filtering_arguments={"id": "gt"})
+        .only("id", "title")
+        .include("units")
+        .limit(5)
+    )
+    assert not requests_mock.called
+
+    assert len(mag_resp) == 0
+    assert requests_mock.call_count == 1
+    query = requests_mock.last_request.qs
+    assert query["include"] == ["units"]
+    assert query["fields[faction]"] == ["id,title"]
+    assert query["page[size]"] == ["5"]
+    assert mag_resp.query.kwargs["filtering_arguments"] == {"id": "gt"}
+
+
+def test_create_params_sends_params_args(generated_models):
+    config = generated_models.get("Faction").configuration()
+    params = config.create_params(sort=["-id", "title"], include="units")
+    assert params["sort"] == "-id,title"
+    assert params["include"] == "units"
+
+
+def test_raising_the_limit_continues_from_where_it_stopped(
+    requests_mock, generated_models
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=3)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config, limit=5)
+
+    assert [elem.id for elem in mag_resp] == [str(i) for i in range(5)]
+    assert requests_mock.call_count == 1
+
+    # the rest of the first page was kept, the second one is requested from next_url
+    mag_resp.limit(15)
+    assert [elem.id for elem in mag_resp] == [str(i) for i in range(15)]
+    assert requests_mock.call_count == 2
+    assert requests_mock.last_request.url.endswith("page2")
+
+    mag_resp.limit(3)
+    mag_resp.limit(None)
+    assert [elem.id for elem in mag_resp] == [str(i) for i in range(30)]
+    assert requests_mock.call_count == 3
+
+
+def test_count_reads_the_total_from_a_single_entity_page(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route,
+        status_code=200,
+        json={"data": [{"attributes": {"id": "1"}}], "meta": {"total": 1234}},
+    )
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    assert mag_resp.count() == 1234
+    assert requests_mock.call_count == 1
+    query = requests_mock.last_request.qs
+    assert query["page[size]"] == ["1"]
+    assert query["fields[faction]"] == ["id"]
+
+    assert mag_resp.limit(50).count() == 50
+    assert requests_mock.call_count == 1
+
+
+def test_count_streams_ids_without_a_total(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=3)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    assert mag_resp.count() == 30
+    assert mag_resp.loaded_count() == 0
+    assert requests_mock.call_count == 4
+
+    mag_resp.evaluate_fully()
+    assert mag_resp.count() == 30
+    assert requests_mock.call_count == 7
+
+
+def test_first_exists_and_one_request_a_single_small_page(
+    requests_mock, generated_models
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=2)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    assert mag_resp.exists()
+    assert requests_mock.last_request.qs["page[size]"] == ["1"]
+    assert requests_mock.last_request.qs["fields[faction]"] == ["id"]
+
+    assert mag_resp.first().title == "Fake Data 0"
+    assert requests_mock.last_request.qs["page[size]"] == ["1"]
+    assert "fields[faction]" not in requests_mock.last_request.qs
+
+    with pytest.raises(MagellanRuntimeException, match="found 2"):
+        mag_resp.one()
+    assert requests_mock.last_request.qs["page[size]"] == ["2"]
+    assert requests_mock.call_count == 3
+    assert mag_resp.loaded_count() == 0  # probes don't store anything
+
+
+def test_first_exists_and_one_use_loaded_results(requests_mock, generated_models):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route, status_code=200, json={"data": [{"attributes": {"id": "only"}}]}
+    )
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    assert len(mag_resp) == 1
+    assert mag_resp.first().id == "only"
+    assert mag_resp.exists()
+    assert mag_resp.one().id == "only"
+    assert requests_mock.call_count == 1
+
+    assert not mag_resp.limit(0).exists()
+    assert mag_resp.first() is None
+    assert requests_mock.call_count == 1
+
+
+def _cursor_pages(request, context):
+    # 30 records in pages of 10, following JSON:API's cursor pagination profile
+    after = int(request.qs.get("page[after]", ["-1"])[0])
+    records = [
+        {"attributes": {"id": i, "title": f"Fake Data {i}"}, "meta": {"page": {"cursor": str(i)}}}
+        for i in range(after + 1, min(after + 11, 30))
+    ]
+    return {"data": records, "links": {"next": "more" if records[-1]["attributes"]["id"] < 29 else None}}
+
+
+def test_cursor_pagination_requests_pages_after_the_last_cursor(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "pagination_mode", "cursor")
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(route, status_code=200, json=_cursor_pages)
+
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    assert [elem.id for elem in mag_resp] == list(range(30))
+    assert requests_mock.call_count == 3
+    assert requests_mock.request_history[2].qs["page[after]"] == ["19"]
+    assert "filter" in requests_mock.request_history[2].qs
+
+
+def _keyset_server(records):
+    """A requests_mock callback filtering, sorting and paging records (10 per page)"""
+    import json
+
+    operations = {
+        "eq": lambda a, b: a == b,
+        "lt": lambda a, b: a < b,
+        "gt": lambda a, b: a > b,
+    }
+
+    def matches(record, expression):
+        if "and" in expression:
+            return all(matches(record, sub) for sub in expression["and"])
+        if "or" in expression:
+            return any(matches(record, sub) for sub in expression["or"])
+        operation = operations[expression["op"]]
+        return operation(record[expression["name"]], expression["val"])
+
+    def callback(request, context):
+        filters = json.loads(request.qs["filter"][0]) if "filter" in request.qs else []
+        found = [r for r in records if all(matches(r, f) for f in filters)]
+        for key in reversed(request.qs["sort"][0].split(",")):
+            found.sort(key=lambda r: r[key.lstrip("-")], reverse=key.startswith("-"))
+        return {"data": [{"attributes": r} for r in found[:10]]}
+
+    return callback
+
+
+def test_keyset_pagination_filters_on_the_last_sort_key(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "pagination_mode", "keyset")
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    records = [{"id": i} for i in range(30)]
+    requests_mock.get(route, status_code=200, json=_keyset_server(records))
+
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config, sort="-id")
+    assert [elem.id for elem in mag_resp] == list(range(29, -1, -1))
+    assert requests_mock.call_count == 4  # the last page is empty
+    assert requests_mock.request_history[0].qs["sort"] == ["-id"]
+
+
+def test_keyset_pagination_keeps_the_query_filter_on_the_sort_key(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "pagination_mode", "keyset")
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    records = [{"id": i} for i in range(30)]
+    requests_mock.get(route, status_code=200, json=_keyset_server(records))
+
+    mag_resp = MagellanResponse(
+        url_path=route, Model=Faction, config=config, id=25, filtering_arguments={"id": "lt"}
+    )
+    assert [elem.id for elem in mag_resp] == list(range(25))
+    mag_resp = MagellanResponse(
+        url_path=route, Model=Faction, config=config, id=5, filtering_arguments={"id": "lt"}
+    )
+    assert [elem.id for elem in mag_resp] == list(range(5))
+
+
+def test_keyset_pagination_breaks_ties_on_a_non_unique_sort_key(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "pagination_mode", "keyset")
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    # 8 records share each title, so titles repeat across page boundaries
+    records = [{"id": i, "title": f"title {i % 4}"} for i in range(32)]
+    requests_mock.get(route, status_code=200, json=_keyset_server(records))
+
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config, sort="-title")
+    seen = [(elem.title, elem.id) for elem in mag_resp]
+    assert seen == sorted(((r["title"], r["id"]) for r in records), reverse=True)
+    assert requests_mock.request_history[0].qs["sort"] == ["-title,-id"]
+
+
+def test_checkpoint_resumes_a_prefetching_scan(requests_mock, generated_models, monkeypatch):
+    import json
+
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "pagination_mode", "cursor")
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(route, status_code=200, json=_cursor_pages)
+
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    seen = []
+    for page in mag_resp.iter_pages(retain=False, prefetch=True):
+        seen.extend(elem.id for elem in page)
+        checkpoint = json.loads(json.dumps(mag_resp.checkpoint()))
+        if len(seen) == 20:
+            break  # the third page was already prefetched
+    assert checkpoint["position"] == 20
+
+    resumed = MagellanResponse(url_path=route, Model=Faction, config=config)
+    resumed.resume(checkpoint)
+    seen.extend(elem.id for elem in resumed)
+    assert seen == list(range(30))
+
+    with pytest.raises(MagellanRuntimeException):
+        MagellanResponse(url_path=route, Model=Faction, config=config, limit=5).resume(
+            checkpoint
+        )
+
+
+def test_adaptive_page_size_grows_and_backs_off_rejected_sizes(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "pagination_mode", "cursor")
+    monkeypatch.setattr(config, "adaptive_page_size", True)
+    monkeypatch.setattr(config, "page_size_ceilings", {})
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+
+    def sized_pages(request, context):
+        size = int(request.qs["page[size]"][0])
+        if size > 50:
+            context.status_code = 400
+            return {"errors": [{"detail": "page[size] is at most 50"}]}
+        after = int(request.qs.get("page[after]", ["-1"])[0])
+        ids = range(after + 1, min(after + 1 + size, 200))
+        return {
+            "data": [
+                {"attributes": {"id": i}, "meta": {"page": {"cursor": str(i)}}} for i in ids
+            ],
+            "links": {"next": "more" if ids[-1] < 199 else None},
+        }
+
+    requests_mock.get(route, json=sized_pages)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    assert [elem.id for elem in mag_resp] == list(range(200))
+
+    sizes = [int(request.qs["page[size]"][0]) for request in requests_mock.request_history]
+    assert sizes[:4] == [10, 20, 40, 80]  # fast pages double in size, 80 is rejected
+    assert max(sizes[4:]) == 40
+    assert config.page_size_ceilings == {route: 40}
+
+
+def test_adaptive_page_size_keeps_the_server_size_with_links(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "pagination_mode", "links")
+    monkeypatch.setattr(config, "adaptive_page_size", True)
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    requests_mock.get(
+        route,
+        json={"data": [{"attributes": {"id": i}} for i in range(25)], "links": {"next": None}},
+    )
+
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+    assert len(list(mag_resp)) == 25
+    assert "page[size]" not in requests_mock.last_request.qs
+
+
+def test_random_access_requests_only_the_pages_holding_the_indexes(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "random_access_page_size", 10)
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+
+    def numbered_pages(request, context):
+        size = int(request.qs["page[size]"][0])
+        number = int(request.qs.get("page[number]", ["1"])[0])
+        ids = range((number - 1) * size, min(number * size, 95))
+        return {"data": [{"attributes": {"id": i}} for i in ids], "meta": {"total": 95}}
+
+    requests_mock.get(route, json=numbered_pages)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config)
+
+    assert mag_resp[57].id == 57
+    assert requests_mock.last_request.qs["page[number]"] == ["6"]
+    assert requests_mock.call_count == 1
+
+    assert [elem.id for elem in mag_resp[55:62]] == list(range(55, 62))
+    assert requests_mock.call_count == 2  # page 6 was already loaded
+
+    assert mag_resp[-1].id == 94  # count() then the last page
+    assert requests_mock.call_count == 4
+    with pytest.raises(IndexError):
+        mag_resp[95]
+    assert mag_resp.loaded_count() == 0  # skipped pages stay unloaded
+
+
+def test_slices_and_negative_indexes_without_random_access(
+    requests_mock, generated_models
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=3)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config, limit=25)
+
+    assert [elem.id for elem in mag_resp[8:12]] == ["8", "9", "10", "11"]
+    assert requests_mock.call_count == 2
+    assert [elem.id for elem in mag_resp[-2:]] == ["23", "24"]
+    assert [elem.id for elem in mag_resp[20:40:2]] == ["20", "22", "24"]
+    assert mag_resp[-25].id == "0"
+    with pytest.raises(IndexError):
+        mag_resp[-26]
+
+
+def test_window_keeps_the_last_pages_and_refetches_evicted_ones(
+    requests_mock, generated_models
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=5)
+    mag_resp = MagellanResponse(url_path=route, Model=Faction, config=config).window(2)
+
+    ids = [elem.id for page in mag_resp.iter_pages(prefetch=True) for elem in page]
+    assert ids == [str(i) for i in range(50)]
+    assert requests_mock.call_count == 5
+    assert mag_resp.loaded_count() == 50
+    assert len(mag_resp.__current_entities__) == 20  # pages 4 and 5
+
+    assert mag_resp[45].id == "45"
+    assert requests_mock.call_count == 5
+    assert mag_resp[3].id == "3" and mag_resp[7].id == "7"
+    assert requests_mock.call_count == 6  # the first page, once
+    assert mag_resp[15].id == "15"
+    assert requests_mock.last_request.url.endswith("page2")
+
+    mag_resp.window(2, refetch=False)
+    with pytest.raises(MagellanRuntimeException):
+        mag_resp[3]
+    with pytest.raises(MagellanRuntimeException):
+        MagellanResponse(url_path=route, Model=Faction, config=config).window(0)
+
+
+def test_only_refetching_windows_remember_every_page_request(
+    requests_mock, generated_models
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+    _paged_faction_mocks(requests_mock, route, pages=5)
+
+    scan = MagellanResponse(url_path=route, Model=Faction, config=config)
+    assert len([page for page in scan.iter_pages(retain=False)]) == 5
+    assert len(scan.__page_starts__) == len(scan.__page_requests__) == 1
+
+    scan = MagellanResponse(url_path=route, Model=Faction, config=config)
+    scan.window(2, refetch=False)
+    assert len(list(scan)) == 50
+    assert scan.__page_starts__ == [30, 40] and len(scan.__page_requests__) == 2
+    assert len(scan.__current_entities__) == 20
+
+    scan = MagellanResponse(url_path=route, Model=Faction, config=config).window(2)
+    assert len(list(scan)) == 50
+    assert len(scan.__page_requests__) == 5
+    scan.window(2, refetch=False)
+    assert len(scan.__page_requests__) == 2
+
+
+def test_the_in_filter_split_is_decided_once_per_query(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+
+    def numbered_pages(request, context):
+        page = int(request.qs.get("page", ["1"])[0])
+        return {
+            "data": [{"attributes": {"id": str(page)}}],
+            "links": {"next": f"{route}?page={page + 1}" if page < 20 else None},
+        }
+
+    requests_mock.get(route, json=numbered_pages)
+    create_params = config.create_params
+    calls = []
+
+    def counted_create_params(*args, **kwargs):
+        calls.append(1)
+        return create_params(*args, **kwargs)
+
+    monkeypatch.setattr(config, "create_params", counted_create_params)
+    mag_resp = Faction.where(id=[str(i) for i in range(50)], filtering_arguments={"id": "in"})
+    assert len(list(mag_resp)) == 20
+    assert requests_mock.call_count == 20
+    assert len(calls) == 2  # measuring the URL once, then the first page's params
+
+    mag_resp.where(title="foo")
+    calls.clear()
+    list(mag_resp)
+    assert len(calls) == 2
+
+
+def test_a_limit_caps_the_requests_of_each_chunk(requests_mock, generated_models, monkeypatch):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "max_url_bytes", 1000)
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+
+    def endless_pages(request, context):
+        page = int(request.qs.get("page", ["1"])[0])
+        return {
+            "data": [{"attributes": {"id": f"{id(request)}-{i}"}} for i in range(10)],
+            "links": {"next": f"{route}?page={page + 1}"},
+        }
+
+    requests_mock.get(route, json=endless_pages)
+    ids = [str(i) for i in range(1, 301)]
+    mag_resp = Faction.where(id=ids, filtering_arguments={"id": "in"}, limit=25)
+    chunks = len(mag_resp.in_filter_chunks()[1])
+    assert chunks > 1
+    assert len(list(mag_resp)) == 25
+    assert requests_mock.call_count == chunks * 3  # 25 entities per chunk are 3 pages
+
+
+def test_large_in_filters_are_split_into_concurrent_chunks(
+    requests_mock, generated_models, monkeypatch
+):
+    Faction = generated_models.get("Faction")
+    config = Faction.configuration()
+    monkeypatch.setattr(config, "max_url_bytes", 1000)
+    route = f"{config.api_endpoint}/{Faction.resource_name()}"
+
+    def matching_factions(request, context):
+        (in_filter,) = json.loads(request.qs["filter"][0])[0]["and"]
+        # every chunk also returns faction 0, the merged results only keep it once
+        ids = ["0"] + sorted(in_filter["val"], reverse=True)
+        return {"data": [{"attributes": {"id": i}} for i in ids], "links": {}}
+
+    requests_mock.get(route, json=matching_factions)
+    ids = [str(i) for i in range(1, 301)]
+    query = {"id": ids + ids[:10], "filtering_arguments": {"id": "in"}}
+    mag_resp = Faction.where(**query)
+
+    assert sorted(elem.id for elem in mag_resp) == sorted(["0"] + ids)
+    assert requests_mock.call_count > 1
+    assert all(len(request.url) <= 1000 for request in requests_mock.request_history)
+
+    ordered = Faction.where(**query).ordered_by_filter("id")
+    calls = requests_mock.call_count
+    assert ordered.count() == 301
+    assert ordered.first().id == "1"
+    assert [elem.id for elem in ordered] == ids + ["0"]
+    assert requests_mock.call_count - calls == calls  # the chunks, once
+
+    with pytest.raises(MagellanRuntimeException):
+        Faction.where(title="foo").ordered_by_filter("id")
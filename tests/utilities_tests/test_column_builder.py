@@ -0,0 +1,31 @@
+# pylint: skip-file
+from array import array
+from magellan_models.interface.column_builder import ColumnBuilder
+
+
+def test_numeric_columns_are_typed_arrays():
+    ints = ColumnBuilder("int")
+    floats = ColumnBuilder("float")
+    bools = ColumnBuilder("bool")
+    for i in range(3):
+        ints.append(i)
+        floats.append(i / 2)
+        bools.append(i % 2 == 0)
+    assert ints.finish(use_numpy=False) == array("q", [0, 1, 2])
+    assert floats.finish(use_numpy=False) == array("d", [0, 0.5, 1])
+    assert bools.finish(use_numpy=False) == array("b", [1, 0, 1])
+    assert len(ints) == 3
+
+
+def test_string_columns_are_lists():
+    strings = ColumnBuilder("str")
+    strings.append("foo")
+    assert strings.finish() == ["foo"]
+
+
+def test_typed_column_falls_back_to_list_on_missing_values():
+    ints = ColumnBuilder("int")
+    ints.append(1)
+    ints.append(None)
+    ints.append(2 ** 70)
+    assert ints.finish() == [1, None, 2 ** 70]
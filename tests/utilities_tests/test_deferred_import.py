@@ -0,0 +1,24 @@
+# pylint: skip-file
+import subprocess
+import sys
+from magellan_models.deferred_import import DEFERRED_MODULES, deferred_import
+
+
+def test_heavy_dependencies_are_not_imported_with_the_package():
+    script = (
+        "import sys, magellan_models; "
+        f"print([name for name in {DEFERRED_MODULES!r} if name in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_module_is_imported_on_first_attribute_access():
+    json_module = deferred_import("json")
+    assert json_module.loads("[]") == []
+    assert "DeferredModule json" in repr(json_module)
+    assert json_module.dumps({"a": 1}) == '{"a": 1}'
+    assert json_module.__load__() is sys.modules["json"]
+    assert json_module.__is_loaded__()
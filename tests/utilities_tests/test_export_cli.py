@@ -0,0 +1,34 @@
+# pylint: skip-file
+import json
+from tests.helper import get_testing_spec
+from magellan_models.export import main
+
+
+def test_export_cli_writes_query_results(requests_mock, tmp_path):
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps(get_testing_spec()))
+    output = tmp_path / "units.ndjson"
+    route = "https://localhost:3000/api/v1/units"
+    requests_mock.get(
+        route,
+        status_code=200,
+        json={"data": [{"attributes": {"id": "1", "title": "unit"}}]},
+    )
+
+    stats = main(
+        [
+            str(spec_path),
+            "Unit",
+            str(output),
+            "--api-endpoint",
+            "https://localhost:3000/api/v1",
+            "--where",
+            "title=unit",
+            "--columns",
+            "id,title",
+            "--quiet",
+        ]
+    )
+    assert stats["rows"] == 1
+    assert json.loads(output.read_text()) == {"id": "1", "title": "unit"}
+    assert "title" in requests_mock.last_request.qs["filter"][0]